@@ -0,0 +1,79 @@
+"""
+Нагрузочный тест поиска файлов настроек в архивах
+
+Сравнивает время генерации .env файла по каталогу с wheel-пакетами:
+    - распаковка архивов во временный каталог и обход каталога
+    - сканирование архивов без распаковки: первый запуск (построение индексов) и повторные запуски (индексы из кеша)
+
+Запуск: python benchmarks/bench_archives.py [--archives 20] [--members 2000] [--repeat 5]
+"""
+import sys
+from argparse import ArgumentParser
+from os import listdir, mkdir, path
+from shutil import rmtree
+from tempfile import TemporaryDirectory, mkdtemp
+from time import perf_counter
+from zipfile import ZIP_DEFLATED, ZipFile
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+from env_settings.archives import clear_archive_cache  # noqa: E402
+from env_settings.generator import generate_env_file  # noqa: E402
+
+
+def make_archives(directory: str, archives: int, members: int):
+    for i in range(archives):
+        with ZipFile(path.join(directory, f'lib{i}-1.0-py3-none-any.whl'), 'w', compression=ZIP_DEFLATED) as file:
+            for j in range(members):
+                file.writestr(f'lib{i}/module{j}.py', f'VALUE_{j} = {j}\n' * 20)
+            file.writestr(f'lib{i}/settings.py', ''.join(
+                f"# Param {j}\nLIB{i}_PARAM_{j} = get_str_env_param('LIB{i}_PARAM_{j}')\n" for j in range(50)))
+
+
+def _archives(directory: str) -> list:
+    return [path.join(directory, name) for name in listdir(directory) if name.endswith('.whl')]
+
+
+def extract_and_generate(directory: str, env_filename: str):
+    target = mkdtemp()
+    try:
+        for name in sorted(path.basename(name) for name in _archives(directory)):
+            with ZipFile(path.join(directory, name)) as file:
+                file.extractall(path.join(target, name))
+        generate_env_file(env_filename, modules_path=target)
+    finally:
+        rmtree(target)
+
+
+def measure(func, *args, repeat: int = 1) -> float:
+    start = perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--archives', type=int, default=20)
+    parser.add_argument('--members', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory, TemporaryDirectory() as output:
+        archives = path.join(directory, 'vendor')
+        mkdir(archives)
+        make_archives(archives, args.archives, args.members)
+        env_filename = path.join(output, '.env')
+
+        print(f'{args.archives} archives, {args.members} members each, milliseconds per run')
+        print(f'{"extract + walk":>24} {measure(extract_and_generate, archives, env_filename):>10.1f}')
+        clear_archive_cache()
+        cold = measure(generate_env_file, env_filename, 'settings.py', directory, None, None, None, False, True)
+        print(f'{"scan_archives, cold":>24} {cold:>10.1f}')
+        warm = measure(generate_env_file, env_filename, 'settings.py', directory, None, None, None, False, True,
+                       repeat=args.repeat)
+        print(f'{"scan_archives, cached":>24} {warm:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
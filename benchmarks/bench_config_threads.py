@@ -0,0 +1,68 @@
+"""
+Нагрузочный тест чтения конфигурации из нескольких потоков
+
+Каждый поток вызывает get_str_env_param в цикле, половина потоков работает внутри config.override().
+Выводит общее количество вызовов в секунду для разного числа потоков: при отсутствии конкуренции
+за блокировки на пути чтения, общая пропускная способность не снижается с ростом числа потоков
+(на сборке CPython без GIL - растёт)
+
+Запуск: python benchmarks/bench_config_threads.py [--seconds 1.0] [--threads 1,2,4,8]
+"""
+import sys
+from argparse import ArgumentParser
+from os import environ, path
+from threading import Barrier, Thread
+from time import perf_counter
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+from env_settings import get_str_env_param  # noqa: E402
+from env_settings.config import config  # noqa: E402
+
+
+def _worker(barrier: Barrier, seconds: float, scoped: bool, counts: list, index: int):
+    barrier.wait()
+    calls = 0
+    deadline = perf_counter() + seconds
+    if scoped:
+        with config.override(error_handling='ignore'):
+            while perf_counter() < deadline:
+                for _ in range(1000):
+                    get_str_env_param('BENCH_PARAM')
+                calls += 1000
+    else:
+        while perf_counter() < deadline:
+            for _ in range(1000):
+                get_str_env_param('BENCH_PARAM')
+            calls += 1000
+    counts[index] = calls
+
+
+def run(thread_count: int, seconds: float) -> float:
+    counts = [0] * thread_count
+    barrier = Barrier(thread_count)
+    threads = [Thread(target=_worker, args=(barrier, seconds, i % 2 == 1, counts, i)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / seconds
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=1.0)
+    parser.add_argument('--threads', default='1,2,4,8')
+    args = parser.parse_args()
+
+    environ['BENCH_PARAM'] = 'value'
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'Python {sys.version.split()[0]}, GIL {"enabled" if gil else "disabled"}')
+    print(f'{"threads":>8} {"calls/s":>14} {"per thread":>14}')
+    for thread_count in (int(x) for x in args.threads.split(',')):
+        total = run(thread_count, args.seconds)
+        print(f'{thread_count:>8} {total:>14,.0f} {total / thread_count:>14,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Нагрузочный тест определения параметров выполнением файлов настроек
+
+Сравнивает время определения параметров набора файлов настроек:
+    - поиск по шаблону env_generator_pattern
+    - выполнение файлов настроек в процессах-песочницах последовательно и параллельно
+
+Запуск: python benchmarks/bench_discovery.py [--files 32] [--params 50] [--workers 8]
+"""
+import sys
+from argparse import ArgumentParser
+from os import makedirs, path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+from env_settings.discovery import SettingsExecutor  # noqa: E402
+from env_settings.generator import generate_settings_files  # noqa: E402
+
+
+def measure(func, *args, **kwargs) -> tuple[float, int]:
+    start = perf_counter()
+    params = func(*args, **kwargs)
+    return (perf_counter() - start) * 1e3, len(params)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=32)
+    parser.add_argument('--params', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        for i in range(args.files):
+            module = path.join(directory, f'module_{i}')
+            makedirs(module)
+            with open(path.join(module, 'settings.py'), 'w', encoding='utf-8') as file:
+                file.write('from env_settings import get_int_env_param, get_str_env_param\n\n')
+                file.writelines(f"# Param {j}\nM{i}_PARAM_{j} = get_str_env_param('M{i}_PARAM_{j}')\n"
+                                for j in range(args.params))
+                file.write(f"PORTS = [get_int_env_param(f'M{i}_{{name}}_PORT', default=80) for name in ('A', 'B')]\n")
+
+        print(f'{args.files} files, {args.params} params each, milliseconds (params found)')
+        for title, executor in (('env_generator_pattern', None),
+                                ('execute, 1 worker', SettingsExecutor(max_workers=1)),
+                                (f'execute, {args.workers} workers', SettingsExecutor(max_workers=args.workers))):
+            elapsed, found = measure(generate_settings_files, (), modules_path=directory, executor=executor)
+            print(f'{title:>24} {elapsed:>10.1f} ({found})')
+
+
+if __name__ == '__main__':
+    main()
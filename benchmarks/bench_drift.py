@@ -0,0 +1,72 @@
+"""
+Нагрузочный тест поиска расхождений параметров и .env файлов
+
+Сравнивает время проверки набора .env файлов:
+    - dotenv_values для каждого файла и сравнение множеств имен
+    - find_env_drift в текущем процессе и в нескольких процессах
+
+Запуск: python benchmarks/bench_drift.py [--files 500] [--params 200] [--workers 4]
+"""
+import sys
+from argparse import ArgumentParser
+from os import path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from dotenv import dotenv_values
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+from env_settings.drift import find_env_drift  # noqa: E402
+from env_settings.generator import ParamIndex  # noqa: E402
+
+
+def dotenv_drift(files: list, modules_path: str) -> int:
+    declared = set(ParamIndex.from_settings(modules_path=modules_path))
+    drifted = 0
+    for filename in files:
+        values = dotenv_values(filename)
+        names = set(values)
+        empty = {name for name, value in values.items() if not (value and value.strip())}
+        drifted += bool(declared - names or names - declared or declared & empty)
+    return drifted
+
+
+def measure(func, *args, **kwargs) -> float:
+    start = perf_counter()
+    func(*args, **kwargs)
+    return (perf_counter() - start) * 1e3
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=500)
+    parser.add_argument('--params', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    random = Random(0)
+
+    with TemporaryDirectory() as directory:
+        names = [f'PARAM_{i}' for i in range(args.params)]
+        with open(path.join(directory, 'settings.py'), 'w', encoding='utf-8') as file:
+            file.writelines(f"# Param {name}\n{name} = get_str_env_param('{name}')\n" for name in names)
+        files = []
+        for i in range(args.files):
+            filename = path.join(directory, f'{i}.env')
+            with open(filename, 'w', encoding='utf-8') as file:
+                for name in names:
+                    if random.random() > 0.01:
+                        file.write(f'# {name}\n{name}={"" if random.random() < 0.01 else "value-" + name}\n')
+            files.append(filename)
+
+        print(f'{args.files} files, {args.params} params, milliseconds')
+        print(f'{"dotenv_values":>24} {measure(dotenv_drift, files, directory):>10.1f}')
+        print(f'{"find_env_drift, 1 worker":>24} '
+              f'{measure(find_env_drift, files, modules_path=directory, max_workers=1):>10.1f}')
+        print(f'{f"find_env_drift, {args.workers} workers":>24} '
+              f'{measure(find_env_drift, files, modules_path=directory, max_workers=args.workers):>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
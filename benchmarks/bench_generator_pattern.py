@@ -0,0 +1,66 @@
+"""
+Нагрузочный тест поиска параметров генератором .env файлов на неблагоприятных файлах настроек
+
+Для каждого файла корпуса (длинные серии пустых строк и комментариев, длинные строки, множество объявлений,
+незакрытые скобки) сравнивается время поиска шаблоном по умолчанию по всему содержимому и по фрагментам
+(env_settings.patterns.find_matches). Отдельно показывается экспоненциальный рост времени прежнего шаблона
+по умолчанию на серии пустых строк без объявления
+
+Запуск: python benchmarks/bench_generator_pattern.py [--lines 5000] [--legacy 8,10,12,14]
+"""
+import sys
+from argparse import ArgumentParser
+from os import path
+from re import MULTILINE, compile
+from time import perf_counter
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+from env_settings.config import config  # noqa: E402
+from env_settings.patterns import find_matches  # noqa: E402
+
+LEGACY_PATTERN = r'^(?:\s*(?:#.*)?\s*[\r\n]+)*\s*[A-Z0-9_-]+\s*=\s.*?param.*?\(.*?\).*$'
+
+
+def corpus(lines: int) -> dict[str, str]:
+    """Неблагоприятные файлы настроек примерно из *lines* строк"""
+    declaration = "TIMEOUT = get_int_env_param('TIMEOUT', default=30)\n"
+    return {
+        'blank lines': '\n' * lines + 'x\n',
+        'comment block': '# comment line\n' * lines + 'x = 1\n',
+        'indented blanks': '    \n' * lines + declaration,
+        'long line': 'A = ' + 'param(' * lines * 10 + '\n',
+        'declarations': ('# comment\n' + declaration) * (lines // 2),
+        'open bracket': 'DATA = dict(\n' + '    key=1,\n' * lines,
+    }
+
+
+def measure(func, *args) -> tuple[float, int]:
+    start = perf_counter()
+    count = sum(1 for _ in func(*args))
+    return perf_counter() - start, count
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--lines', type=int, default=5000)
+    parser.add_argument('--legacy', default='8,10,12,14')
+    args = parser.parse_args()
+
+    regex = config.env_generator_regex
+    print(f'{"file":>16} {"whole, s":>10} {"chunks, s":>10} {"matches":>8}')
+    for name, content in corpus(args.lines).items():
+        whole, count = measure(regex.finditer, content)
+        chunks, chunk_count = measure(find_matches, regex, content, name)
+        assert count == chunk_count, name
+        print(f'{name:>16} {whole:>10.4f} {chunks:>10.4f} {count:>8}')
+
+    print(f'\nlegacy default pattern, blank lines without declaration\n{"lines":>16} {"time, s":>10}')
+    legacy = compile(LEGACY_PATTERN, MULTILINE)
+    for lines in (int(x) for x in args.legacy.split(',')):
+        elapsed, _ = measure(legacy.finditer, '\n' * lines + 'x')
+        print(f'{lines:>16} {elapsed:>10.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Нагрузочный тест индексов принадлежности значений
+
+Для списка и каждого типа индекса (set, sorted, bloom) выводит время построения, потребление памяти
+(tracemalloc) и среднее время проверки вхождения для присутствующих и отсутствующих значений
+
+Запуск: python benchmarks/bench_membership.py [--values 1000000] [--lookups 100000]
+"""
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from os import path
+from random import Random
+from time import perf_counter
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+from env_settings.membership import membership_index  # noqa: E402
+
+
+def lookup_ns(index, values: list) -> float:
+    start = perf_counter()
+    for value in values:
+        value in index  # noqa: B015
+    return (perf_counter() - start) / len(values) * 1e9
+
+
+def make_values(count: int, seed: int = 0) -> list[str]:
+    random = Random(seed)
+    return [f'object-{random.getrandbits(48):012x}' for _ in range(count)]
+
+
+def build(backend: str, values: list):
+    return values if backend == 'list' else membership_index(values, backend)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--values', type=int, default=1_000_000)
+    parser.add_argument('--lookups', type=int, default=100_000)
+    args = parser.parse_args()
+
+    values = make_values(args.values)
+    hits = Random(1).choices(values, k=args.lookups)
+    present = set(values)
+    misses = [value for value in make_values(args.lookups, seed=2) if value not in present]
+    list_lookups = max(args.lookups // 1000, 10)
+
+    print(f'{args.values:,} values')
+    print(f'{"backend":>8} {"build, s":>10} {"memory, MB":>11} {"hit, ns":>12} {"miss, ns":>12}')
+    for backend in ('list', 'set', 'sorted', 'bloom'):
+        start = perf_counter()
+        index = build(backend, values)
+        build_time = perf_counter() - start
+
+        # Память индекса вместе со строками значений (исходный список освобождается после построения индекса)
+        del index
+        tracemalloc.start()
+        index = build(backend, make_values(args.values))
+        memory = tracemalloc.get_traced_memory()[0] / 2 ** 20
+        tracemalloc.stop()
+
+        count = list_lookups if backend == 'list' else args.lookups
+        hit, miss = lookup_ns(index, hits[:count]), lookup_ns(index, misses[:count])
+        print(f'{backend:>8} {build_time:>10.2f} {memory:>11.1f} {hit:>12,.0f} {miss:>12,.0f}')
+        del index
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Нагрузочный тест слияния .env файла
+
+Сравнивает время обновления заполненного .env файла после изменения файлов настроек:
+    - генерация шаблона, чтение значений dotenv_values и перезапись файла с заполненными значениями
+    - generate_env_file(merge=True) при добавлении параметра и без изменений (файл не записывается)
+
+Запуск: python benchmarks/bench_merge.py [--params 5000] [--repeat 20]
+"""
+import sys
+from argparse import ArgumentParser
+from os import path
+from tempfile import TemporaryDirectory
+from time import perf_counter, perf_counter_ns
+
+from dotenv import dotenv_values
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+from env_settings.generator import _format_env_value, generate_env_file, generate_settings_files  # noqa: E402
+
+
+def resync(env_filename: str, modules_path: str):
+    values = dotenv_values(env_filename)
+    params = generate_settings_files((), modules_path=modules_path)
+    with open(env_filename, mode='w', encoding='utf-8') as file:
+        file.write('\n'.join(_format_env_value(param)[:-1] + (values.get(param.name) or '') + '\n'
+                             for param in params))
+
+
+def measure(func, *args, repeat: int = 1, **kwargs) -> float:
+    start = perf_counter()
+    for _ in range(repeat):
+        func(*args, **kwargs)
+    return (perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--params', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        settings_filename = path.join(directory, 'settings.py')
+        env_filename = path.join(directory, '.env')
+        with open(settings_filename, 'w', encoding='utf-8') as file:
+            file.writelines(f"# Param {i}\nPARAM_{i} = get_str_env_param('PARAM_{i}')\n" for i in range(args.params))
+        with open(env_filename, 'w', encoding='utf-8') as file:
+            file.writelines(f'# Param {i}\nPARAM_{i}=value-{i}\n\n' for i in range(args.params))
+
+        print(f'{args.params} params, milliseconds per update')
+        print(f'{"dotenv_values + rewrite":>24} {measure(resync, env_filename, directory, repeat=args.repeat):>10.1f}')
+
+        def add_param_and_merge():
+            with open(settings_filename, 'a', encoding='utf-8') as file:
+                file.write(f"NEW_{perf_counter_ns()} = get_str_env_param('NEW')\n")
+            generate_env_file(env_filename, modules_path=directory, merge=True)
+
+        changed = measure(add_param_and_merge, repeat=args.repeat)
+        print(f'{"merge, new param":>24} {changed:>10.1f}')
+        unchanged = measure(generate_env_file, env_filename, modules_path=directory, merge=True, repeat=args.repeat)
+        print(f'{"merge, unchanged":>24} {unchanged:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Нагрузочный тест изоляции тестов плагином pytest
+
+Сравнивает время на один тест:
+    - установки и восстановления переменных окружения: pytest.MonkeyPatch.setenv/undo и EnvSnapshot
+    - перезагрузки модуля настроек: importlib.reload и reload_settings
+
+Запуск: python benchmarks/bench_pytest_plugin.py [--params 100] [--repeat 200]
+"""
+import sys
+from argparse import ArgumentParser
+from importlib import import_module, reload
+from os import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import pytest
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+from env_settings.pytest_plugin import EnvSnapshot, reload_settings, set_env_params  # noqa: E402
+
+
+def measure(func, repeat: int) -> float:
+    start = perf_counter()
+    for _ in range(repeat):
+        func()
+    return (perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--params', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    params = {f'BENCH_PARAM_{i}': str(i) for i in range(args.params)}
+
+    def monkeypatch_env():
+        monkeypatch = pytest.MonkeyPatch()
+        for name, value in params.items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.undo()
+
+    def snapshot_env():
+        snapshot = EnvSnapshot()
+        set_env_params(params)
+        snapshot.restore()
+
+    with TemporaryDirectory() as directory:
+        with open(path.join(directory, 'bench_settings.py'), 'w', encoding='utf-8') as file:
+            file.write('from env_settings import get_int_env_param, get_str_env_param\n')
+            for name in params:
+                file.write(f"{name} = get_str_env_param('{name}')\n{name}_INT = get_int_env_param('{name}')\n")
+        sys.path.insert(0, directory)
+        module = import_module('bench_settings')
+        set_env_params(params)
+
+        print(f'{args.params} params, microseconds per test')
+        print(f'{"monkeypatch.setenv + undo":>28} {measure(monkeypatch_env, args.repeat):>10.1f}')
+        print(f'{"EnvSnapshot + restore":>28} {measure(snapshot_env, args.repeat):>10.1f}')
+        print(f'{"importlib.reload":>28} {measure(lambda: reload(module), args.repeat):>10.1f}')
+        print(f'{"reload_settings":>28} {measure(lambda: reload_settings(module), args.repeat):>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Нагрузочный тест проверки флага постепенного включения
+
+Сравнивает время проверки ключа:
+    - разбор переменной окружения и хеширование sha256 при каждой проверке (типичная обертка)
+    - RolloutFlag.enabled для строкового ключа и ключа bytes
+
+Запуск: python benchmarks/bench_rollout.py [--keys 1000000]
+"""
+import sys
+from argparse import ArgumentParser
+from hashlib import sha256
+from os import environ, path
+from time import perf_counter
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+from env_settings.rollout import get_rollout_env_param  # noqa: E402
+
+
+def reparse_enabled(key: str) -> bool:
+    percent = float(environ.get('BENCH_FEATURE', '0%').split(',')[0].rstrip('%'))
+    bucket = int.from_bytes(sha256(f'BENCH_FEATURE:{key}'.encode()).digest()[:4], 'big')
+    return bucket < percent * (1 << 32) / 100
+
+
+def measure(func, keys: list) -> float:
+    start = perf_counter()
+    for key in keys:
+        func(key)
+    return (perf_counter() - start) / len(keys) * 1e9
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--keys', type=int, default=1_000_000)
+    args = parser.parse_args()
+    environ['BENCH_FEATURE'] = '25%,tenant-1'
+    keys = [f'user-{i}' for i in range(args.keys)]
+    byte_keys = [key.encode() for key in keys]
+    flag = get_rollout_env_param('BENCH_FEATURE')
+
+    print(f'{args.keys:,} keys, nanoseconds per check')
+    print(f'{"reparse + sha256":>22} {measure(reparse_enabled, keys[:args.keys // 10]):>8.0f}')
+    print(f'{"RolloutFlag, str":>22} {measure(flag.enabled, keys):>8.0f}')
+    print(f'{"RolloutFlag, bytes":>22} {measure(flag.enabled, byte_keys):>8.0f}')
+
+
+if __name__ == '__main__':
+    main()
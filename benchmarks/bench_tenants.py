@@ -0,0 +1,70 @@
+"""
+Нагрузочный тест хранилища настроек арендаторов
+
+Сравнивает среднее время получения типизированного значения арендатора (запрос к случайному арендатору):
+    - разбор файла арендатора при каждом запросе (dotenv_values + int)
+    - TenantStore с проверкой файла при каждом обращении (revalidate_interval=0)
+    - TenantStore с проверкой файла раз в секунду (по умолчанию)
+    - TenantStore с кешем меньше количества арендаторов (вытеснение)
+
+Запуск: python benchmarks/bench_tenants.py [--tenants 2000] [--params 50] [--requests 20000]
+"""
+import sys
+from argparse import ArgumentParser
+from functools import partial
+from os import path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from dotenv import dotenv_values
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+from env_settings.tenants import TenantStore  # noqa: E402
+
+
+def lookup(store: TenantStore, tenant: str) -> int:
+    return store.get(tenant).get_int('TIMEOUT')
+
+
+def measure(func, tenants: list) -> float:
+    start = perf_counter()
+    for tenant in tenants:
+        func(tenant)
+    return (perf_counter() - start) / len(tenants) * 1e6
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--tenants', type=int, default=2000)
+    parser.add_argument('--params', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        names = [f'tenant-{i}' for i in range(args.tenants)]
+        for name in names:
+            with open(path.join(directory, f'{name}.env'), 'w', encoding='utf-8') as file:
+                file.write(f'TIMEOUT={len(name)}\n')
+                for i in range(args.params):
+                    file.write(f'PARAM_{i}=value-{i}\n')
+        requests = Random(0).choices(names, k=args.requests)
+
+        def reparse(tenant: str) -> int:
+            return int(dotenv_values(path.join(directory, f'{tenant}.env'))['TIMEOUT'])
+
+        stores = {
+            'TenantStore, stat': TenantStore(directory, max_tenants=args.tenants, revalidate_interval=0),
+            'TenantStore, 1s': TenantStore(directory, max_tenants=args.tenants),
+            'TenantStore, 1/2 cached': TenantStore(directory, max_tenants=args.tenants // 2),
+        }
+        print(f'{args.tenants} tenants, {args.params} params, microseconds per request')
+        print(f'{"reparse per request":>26} {measure(reparse, requests[:args.requests // 10]):>10.1f}')
+        for title, store in stores.items():
+            measure(partial(lookup, store), names)
+            print(f'{title:>26} {measure(partial(lookup, store), requests):>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Нагрузочный тест ограничения частоты сообщений
+
+Процедура получения значения с ошибкой преобразования (обработчик logging) и логгированием значений
+вызывается в цикле, как в обработчике запросов. Сравнивает время вызова и количество записей в logger
+без ограничения и с log_interval
+
+Запуск: python benchmarks/bench_throttle.py [--calls 100000] [--params 10]
+"""
+import logging
+import sys
+from argparse import ArgumentParser
+from os import environ, path
+from time import perf_counter
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+from env_settings import configure, get_int_env_param  # noqa: E402
+
+
+class CountingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord):
+        self.format(record)
+        self.count += 1
+
+
+def run(names: list, calls: int) -> float:
+    start = perf_counter()
+    for i in range(calls):
+        get_int_env_param(names[i % len(names)])
+    return (perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=100_000)
+    parser.add_argument('--params', type=int, default=10)
+    args = parser.parse_args()
+
+    names = [f'BENCH_THROTTLE_{i}' for i in range(args.params)]
+    environ.update({name: 'not-a-number' for name in names})
+    handler = CountingHandler()
+    logger = logging.getLogger('bench_throttle')
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+    print(f'{args.calls:,} calls, {args.params} params')
+    print(f'{"log_interval":>14} {"us per call":>12} {"records":>10}')
+    for interval in (0, 60):
+        configure(error_handling='logging', do_value_logging=True, logger='bench_throttle', log_interval=interval)
+        handler.count = 0
+        elapsed = run(names, args.calls)
+        print(f'{interval:>14} {elapsed:>12.2f} {handler.count:>10,}')
+
+
+if __name__ == '__main__':
+    main()
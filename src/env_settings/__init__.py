@@ -1,13 +1,41 @@
+from .codegen import generate_settings_module, SettingsModuleWriter
 from .config import config as settings_config
-from .generator import generate_env_file
+from .converters import register_converter
+from .discovery import SettingsExecutor
+from .drift import find_env_drift, DriftReport
+from .filesystem import check_paths, path_cache
+from .generator import (generate_env_file, generate_settings_files, ConfigMapWriter, EnvFileWriter, JsonSchemaWriter,
+                        MarkdownWriter, ParamIndex)
+from .interpolation import InterpolationError, Interpolator
+from .membership import BloomIndex, get_values_index, membership_index, SetIndex, SortedIndex
+from .namespace import EnvIndex, get_env_namespace
+from .patterns import check_pattern, PatternError
+from .remote import RemoteSource
+from .rollout import get_rollout_env_param, RolloutFlag
+from .shared import attach_values, share_values, SharedValues
+from .tenants import TenantSettings, TenantStore
+from .throttle import flush_suppressed
+from .usage import find_env_usage, EnvUsageReport
+from .uri import get_connect_uris, get_multi_host_connect_uri, get_uri_env_param, parse_connect_uri
 from .utils import (get_str_env_param, get_int_env_param, get_float_env_param, get_bool_env_param, get_file_env_param,
-                    get_filedir_env_param, get_value_from_string, get_values_from_file, get_values,
-                    endless_param_iterator, param_iterator, load_env_params)
+                    get_filedir_env_param, get_converted_env_param, get_value_from_string, get_values_from_file,
+                    get_values, endless_param_iterator, param_iterator, load_env_params, partition_values,
+                    get_values_partition, get_values_partition_from_file)
 
-__all__ = ['configure', 'reset_config', 'generate_env_file', 'get_str_env_param', 'get_int_env_param',
-           'get_float_env_param', 'get_bool_env_param', 'get_file_env_param', 'get_filedir_env_param',
-           'get_value_from_string', 'get_values_from_file', 'get_values', 'endless_param_iterator', 'param_iterator',
-           'load_env_params']
+__all__ = ['configure', 'reset_config', 'override_config', 'generate_env_file', 'get_str_env_param',
+           'get_int_env_param', 'get_float_env_param', 'get_bool_env_param', 'get_file_env_param',
+           'get_filedir_env_param', 'get_value_from_string', 'get_values_from_file', 'get_values',
+           'endless_param_iterator', 'param_iterator', 'load_env_params', 'check_paths', 'path_cache',
+           'get_converted_env_param', 'register_converter', 'get_connect_uris', 'get_multi_host_connect_uri',
+           'get_uri_env_param', 'parse_connect_uri', 'generate_settings_files', 'ConfigMapWriter', 'EnvFileWriter',
+           'JsonSchemaWriter', 'MarkdownWriter', 'ParamIndex', 'find_env_usage', 'EnvUsageReport',
+           'share_values', 'attach_values', 'SharedValues', 'partition_values', 'get_values_partition',
+           'get_values_partition_from_file', 'generate_settings_module', 'SettingsModuleWriter',
+           'RemoteSource', 'EnvIndex', 'get_env_namespace', 'check_pattern', 'PatternError',
+           'Interpolator', 'InterpolationError', 'membership_index', 'get_values_index', 'SetIndex', 'SortedIndex',
+           'BloomIndex', 'TenantStore', 'TenantSettings',
+           'flush_suppressed', 'find_env_drift', 'DriftReport',
+           'get_rollout_env_param', 'RolloutFlag', 'SettingsExecutor']
 
 
 def configure(**kwargs):
@@ -33,3 +61,17 @@ def configure(**kwargs):
 def reset_config():
     """Сброс конфигурации к значениям по умолчанию"""
     settings_config.reset()
+
+
+def override_config(**kwargs):
+    """
+    Переопределение параметров модуля в текущем контексте (поток, задача asyncio)
+
+    :example:
+    with override_config(error_handling='ignore'):
+        TIMEOUT = get_int_env_param('TIMEOUT')
+
+    :param kwargs: Параметры конфигурации
+    :return: Контекстный менеджер
+    """
+    return settings_config.override(**kwargs)
@@ -0,0 +1,155 @@
+"""
+Чтение файлов настроек из zip-архивов, wheel-пакетов и установленных дистрибутивов без распаковки
+
+Индекс архива (имена, смещения и способы сжатия элементов) строится чтением центрального каталога один раз
+и кешируется по имени файла, времени изменения и размеру архива. Элемент читается по смещению
+локального заголовка из индекса и распаковывается и декодируется потоково блоками, без повторного чтения
+центрального каталога
+"""
+from codecs import getincrementaldecoder
+from importlib.metadata import distribution
+from io import IncrementalNewlineDecoder, TextIOWrapper
+from os import SEEK_CUR, path, stat
+from struct import unpack
+from threading import Lock
+from typing import Iterable, Iterator, NamedTuple
+from zipfile import ZIP_DEFLATED, ZIP_STORED, BadZipFile, ZipFile
+from zlib import crc32, decompressobj
+
+# Расширения файлов, которые сканируются как zip-архивы
+ARCHIVE_SUFFIXES = ('.zip', '.whl', '.pyz', '.egg')
+
+_LOCAL_HEADER_SIZE = 30
+_READ_CHUNK_SIZE = 1 << 16
+
+
+class ArchiveMember(NamedTuple):
+    """Элемент zip-архива"""
+    archive: str  # Путь к архиву
+    name: str  # Имя элемента в архиве
+    offset: int  # Смещение локального заголовка элемента
+    compress_type: int  # Способ сжатия
+    compress_size: int  # Размер сжатых данных
+    crc: int  # Контрольная сумма распакованных данных
+
+    def __str__(self):
+        return f'{self.archive}/{self.name}'
+
+
+# Путь к архиву -> ((время изменения, размер), элементы архива)
+_index_cache: dict[str, tuple[tuple[int, int], tuple[ArchiveMember, ...]]] = {}
+_index_lock = Lock()
+
+
+def is_archive(filename: str) -> bool:
+    """Проверяет расширение файла по ARCHIVE_SUFFIXES"""
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def archive_members(archive: str) -> tuple[ArchiveMember, ...]:
+    """
+    Возвращает элементы zip-архива (без каталогов)
+
+    Индекс архива кешируется и перестраивается только при изменении времени изменения или размера архива
+
+    :param archive: str: Путь к архиву
+    :return: tuple[ArchiveMember, ...]: Элементы архива (пустой кортеж, если файл не является zip-архивом)
+    """
+    file_stat = stat(archive)
+    signature = (file_stat.st_mtime_ns, file_stat.st_size)
+    cached = _index_cache.get(archive)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    try:
+        with ZipFile(archive) as zip_file:
+            members = tuple(ArchiveMember(archive, info.filename, info.header_offset, info.compress_type,
+                                          info.compress_size, info.CRC)
+                            for info in zip_file.infolist() if not info.is_dir())
+    except BadZipFile:
+        members = ()
+    with _index_lock:
+        _index_cache[archive] = (signature, members)
+    return members
+
+
+def clear_archive_cache():
+    """Очищает кеш индексов архивов"""
+    with _index_lock:
+        _index_cache.clear()
+
+
+def _iter_member_data(member: ArchiveMember) -> Iterator[bytes]:
+    """Читает и распаковывает данные элемента блоками по смещению его локального заголовка"""
+    with open(member.archive, 'rb') as file:
+        file.seek(member.offset)
+        header = file.read(_LOCAL_HEADER_SIZE)
+        if len(header) != _LOCAL_HEADER_SIZE or header[:4] != b'PK\x03\x04':
+            raise BadZipFile(f'Некорректный локальный заголовок элемента {member}')
+        name_length, extra_length = unpack('<HH', header[26:30])
+        file.seek(name_length + extra_length, SEEK_CUR)
+        decompressor = decompressobj(-15) if member.compress_type == ZIP_DEFLATED else None
+        remaining = member.compress_size
+        while remaining > 0:
+            chunk = file.read(min(remaining, _READ_CHUNK_SIZE))
+            if not chunk:
+                raise BadZipFile(f'Неожиданный конец данных элемента {member}')
+            remaining -= len(chunk)
+            yield decompressor.decompress(chunk) if decompressor else chunk
+        if decompressor:
+            yield decompressor.flush()
+
+
+def read_member(member: ArchiveMember, encoding: str = 'utf-8') -> str:
+    """
+    Читает текст элемента архива
+
+    Элементы без сжатия и со сжатием deflate распаковываются и декодируются потоково блоками по индексу,
+    остальные способы сжатия - zipfile. Переводы строк приводятся к '\\n', как при чтении файла в текстовом режиме
+
+    :param member: ArchiveMember: Элемент архива
+    :param encoding: str, default='utf-8': Кодировка
+    :return: str: Текст элемента
+    :raises BadZipFile: Архив изменен или поврежден (несовпадение контрольной суммы)
+    """
+    if member.compress_type not in (ZIP_STORED, ZIP_DEFLATED):
+        with ZipFile(member.archive) as zip_file, TextIOWrapper(zip_file.open(member.name), encoding=encoding) as file:
+            return file.read()
+    decoder = IncrementalNewlineDecoder(getincrementaldecoder(encoding)(), translate=True)
+    checksum, parts = 0, []
+    for chunk in _iter_member_data(member):
+        checksum = crc32(chunk, checksum)
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b'', final=True))
+    if checksum != member.crc:
+        raise BadZipFile(f'Несовпадение контрольной суммы элемента {member}')
+    return ''.join(parts)
+
+
+def find_archive_settings(archive: str, settings_filename: str = 'settings.py') -> Iterator[ArchiveMember]:
+    """
+    Находит файлы настроек в zip-архиве
+
+    :param archive: str: Путь к архиву
+    :param settings_filename: str, default='settings.py': Имя файла настроек
+    :return: Iterator[ArchiveMember]: Элементы архива с именем *settings_filename*
+    """
+    for member in archive_members(archive):
+        if member.name.rsplit('/', 1)[-1] == settings_filename:
+            yield member
+
+
+def find_distribution_settings(distributions: Iterable[str], settings_filename: str = 'settings.py') -> Iterator[str]:
+    """
+    Находит файлы настроек установленных дистрибутивов по списку файлов дистрибутива (importlib.metadata)
+
+    :param distributions: Iterable[str]: Имена дистрибутивов
+    :param settings_filename: str, default='settings.py': Имя файла настроек
+    :return: Iterator[str]: Пути к файлам настроек
+    :raises PackageNotFoundError: Дистрибутив не установлен
+    """
+    for name in distributions:
+        for file in distribution(name).files or ():
+            if file.name == settings_filename:
+                located = str(file.locate())
+                if path.isfile(located):
+                    yield located
@@ -0,0 +1,141 @@
+"""
+Командная строка модуля
+
+Запуск: python -m env_settings <команда> [параметры]
+    generate - генерация .env файла по файлам настроек (с параметром --watch - с отслеживанием изменений)
+    usage - поиск неиспользуемых и необъявленных параметров окружения
+    codegen - генерация типизированного модуля настроек
+    drift - поиск расхождений объявленных параметров и .env файлов
+"""
+from argparse import ArgumentParser, Namespace
+from typing import Optional, Sequence
+
+from .codegen import generate_settings_module
+from .discovery import SettingsExecutor
+from .drift import find_env_drift
+from .generator import generate_env_file
+from .usage import find_env_usage
+from .watch import SettingsWatcher
+
+
+def _add_settings_arguments(parser: ArgumentParser):
+    """Добавляет параметры поиска файлов настроек (общие для команд генератора)"""
+    parser.add_argument('--settings-filename', default='settings.py',
+                        help='имя файла настроек для поиска (по умолчанию: settings.py)')
+    parser.add_argument('--modules-path', default='.', help='корневая директория для поиска (по умолчанию: .)')
+    parser.add_argument('--sub-modules-path', help='специфическая поддиректория для поиска модулей (например, modules)')
+    parser.add_argument('--include-sub-modules', nargs='+', metavar='MODULE',
+                        help='имена подмодулей для включения в поиск')
+    parser.add_argument('--exclude-params', nargs='+', metavar='PARAM', help='имена параметров для исключения')
+
+
+def _settings_kwargs(args: Namespace) -> dict:
+    """Параметры поиска файлов настроек для функций генератора"""
+    return dict(settings_filename=args.settings_filename, modules_path=args.modules_path,
+                sub_modules_path=args.sub_modules_path,
+                include_sub_modules=tuple(args.include_sub_modules) if args.include_sub_modules else None,
+                exclude_params=tuple(args.exclude_params) if args.exclude_params else None)
+
+
+def _generate(args: Namespace) -> int:
+    executor = SettingsExecutor(timeout=args.timeout, max_workers=args.workers) if args.execute else None
+    kwargs = dict(_settings_kwargs(args), deduplicate=args.deduplicate, merge=args.merge,
+                  comment_removed=args.comment_removed, scan_archives=args.archives,
+                  distributions=args.distributions, executor=executor)
+    if not args.watch:
+        generate_env_file(args.new_env_filename, **kwargs)
+        return 0
+
+    try:
+        SettingsWatcher(args.new_env_filename, **kwargs).run(interval=args.interval, use_inotify=not args.poll)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _usage(args: Namespace) -> int:
+    report = find_env_usage(**_settings_kwargs(args), code_path=args.code_path, max_workers=args.workers)
+    if report:
+        print(report.format())
+    return 1 if report else 0
+
+
+def _drift(args: Namespace) -> int:
+    report = find_env_drift(args.env_files, **_settings_kwargs(args), check_environ=args.environ,
+                            max_workers=args.workers)
+    if report:
+        print(report.format())
+    return 1 if report else 0
+
+
+def _codegen(args: Namespace) -> int:
+    generate_settings_module(args.new_module_filename, **_settings_kwargs(args), class_name=args.class_name,
+                             function_name=args.function_name)
+    return 0
+
+
+def create_parser() -> ArgumentParser:
+    """Создает разборщик параметров командной строки"""
+    parser = ArgumentParser(prog='python -m env_settings', description='env-settings: работа с настройками')
+    commands = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    generate = commands.add_parser('generate', help='генерация .env файла по файлам настроек')
+    generate.add_argument('new_env_filename', help='имя генерируемого .env файла (например, .env.template)')
+    _add_settings_arguments(generate)
+    generate.add_argument('--deduplicate', action='store_true',
+                          help='записывать параметр, объявленный в нескольких файлах настроек, один раз')
+    generate.add_argument('--archives', action='store_true',
+                          help='искать файлы настроек в zip-архивах и wheel-пакетах без распаковки')
+    generate.add_argument('--distributions', nargs='+', metavar='DIST',
+                          help='имена установленных дистрибутивов для поиска файлов настроек')
+    generate.add_argument('--merge', action='store_true',
+                          help='обновить существующий .env файл с сохранением заполненных значений')
+    generate.add_argument('--comment-removed', action='store_true',
+                          help='при обновлении закомментировать параметры, отсутствующие в файлах настроек')
+    generate.add_argument('--execute', action='store_true',
+                          help='определять параметры выполнением файлов настроек в отдельных процессах')
+    generate.add_argument('--timeout', type=float, default=10.0,
+                          help='ограничение времени выполнения файла настроек в секундах (по умолчанию: 10.0)')
+    generate.add_argument('--workers', type=int, help='количество одновременно выполняемых файлов настроек')
+    generate.add_argument('--watch', action='store_true',
+                          help='отслеживать изменения файлов настроек и перегенерировать .env файл')
+    generate.add_argument('--interval', type=float, default=1.0,
+                          help='интервал опроса при отслеживании изменений в секундах (по умолчанию: 1.0)')
+    generate.add_argument('--poll', action='store_true', help='использовать опрос вместо inotify')
+    generate.set_defaults(handler=_generate)
+
+    usage = commands.add_parser('usage', help='поиск неиспользуемых и необъявленных параметров окружения '
+                                              '(код завершения 1, если они найдены)')
+    _add_settings_arguments(usage)
+    usage.add_argument('--code-path', help='корневая директория сканируемого кода (по умолчанию: --modules-path)')
+    usage.add_argument('--workers', type=int, help='количество процессов сканирования')
+    usage.set_defaults(handler=_usage)
+
+    drift = commands.add_parser('drift', help='поиск отсутствующих, лишних и пустых параметров в .env файлах '
+                                              '(код завершения 1, если они найдены)')
+    drift.add_argument('env_files', nargs='*', metavar='ENV_FILE', help='проверяемые .env файлы')
+    _add_settings_arguments(drift)
+    drift.add_argument('--environ', action='store_true', help='проверять переменные окружения процесса')
+    drift.add_argument('--workers', type=int, help='количество процессов чтения .env файлов')
+    drift.set_defaults(handler=_drift)
+
+    codegen = commands.add_parser('codegen', help='генерация типизированного модуля настроек')
+    codegen.add_argument('new_module_filename', help='имя генерируемого модуля (например, app_settings.py)')
+    _add_settings_arguments(codegen)
+    codegen.add_argument('--class-name', default='Settings', help='имя класса настроек (по умолчанию: Settings)')
+    codegen.add_argument('--function-name', default='load_settings',
+                         help='имя функции загрузки (по умолчанию: load_settings)')
+    codegen.set_defaults(handler=_codegen)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Точка входа командной строки
+
+    :param argv: Sequence[str], optional: Параметры командной строки (по умолчанию sys.argv)
+    :return: int: Код завершения
+    """
+    args = create_parser().parse_args(argv)
+    return args.handler(args)
@@ -0,0 +1,309 @@
+"""
+Генерация типизированного модуля настроек
+
+По тем же файлам настроек, что и генератор .env файлов, статически (без выполнения кода) формируется модуль Python
+с неизменяемым классом настроек (__slots__) и одной функцией загрузки. Функция загрузки читает переменные окружения
+и выполняет преобразования и проверки, специализированные для каждого параметра на этапе генерации:
+без разбора kwargs, выбора процедуры получения значения и повторной компиляции преобразователей при каждом вызове
+"""
+import ast
+from typing import Any, Optional, Sequence
+
+from .generator import (_DEFAULT_GETTER_ARGS, _GETTER_ARGS, SettingsParam, SettingsWriter, _deduplicate_params,
+                        generate_settings_files)
+
+# Процедуры получения значения, для которых формируется специализированный код
+_SPECIALIZED_GETTERS = ('get_str_env_param', 'get_int_env_param', 'get_float_env_param', 'get_bool_env_param',
+                        'get_converted_env_param')
+# Процедуры, вызов которых переносится в модуль без изменений (все аргументы должны быть литералами)
+_RUNTIME_GETTERS = ('get_str_env_param', 'get_int_env_param', 'get_float_env_param', 'get_bool_env_param',
+                    'get_converted_env_param', 'get_file_env_param', 'get_filedir_env_param', 'get_uri_env_param',
+                    'get_value_from_string', 'get_values_from_file', 'get_values', 'get_connect_uri',
+                    'get_connect_uris', 'get_multi_host_connect_uri', 'parse_connect_uri', 'get_rollout_env_param')
+_LOG_KWARGS = ('log_text', 'do_obfuscate_log_text')
+_TYPES = {'get_str_env_param': 'Optional[str]', 'get_int_env_param': 'Optional[int]',
+          'get_float_env_param': 'Optional[float]', 'get_bool_env_param': 'bool'}
+_CONVERTER_TYPES = {'str': 'Optional[str]', 'int': 'Optional[int]', 'float': 'Optional[float]',
+                    'duration': 'Optional[float]', 'bytes': 'Optional[int]', 'url': 'Optional[str]',
+                    'enum': 'Optional[str]'}
+
+_HEADER = '''"""
+Настройки приложения
+
+Сгенерировано env_settings по файлам настроек, не редактируйте вручную:
+{sources}
+"""
+from os import environ as _os_environ
+from typing import Any, Mapping, Optional
+
+from {package}.config import config as _config
+from {package}.converters import ConversionError as _ConversionError, compile_converter as _compile_converter
+from {package}.throttle import emit_throttled as _emit
+from {package}.utils import _env_param_error as _error, get_obfuscate_value as _obfuscate
+'''
+
+_TRUE_VALUES = "_TRUE_VALUES = frozenset(('true', 'yes', 't', 'y', '1'))"
+
+
+def _node_name(node: ast.AST) -> str:
+    """Имя вызываемой функции (для name и module.name)"""
+    return node.attr if isinstance(node, ast.Attribute) else getattr(node, 'id', '')
+
+
+def _is_static(node: ast.AST) -> bool:
+    """Проверяет, что выражение состоит только из литералов и вызовов процедур env_settings"""
+    if isinstance(node, ast.Call):
+        return (_node_name(node.func) in _RUNTIME_GETTERS and all(_is_static(arg) for arg in node.args)
+                and all(keyword.arg and _is_static(keyword.value) for keyword in node.keywords))
+    try:
+        ast.literal_eval(node)
+        return True
+    except ValueError:
+        return False
+
+
+def _call_arguments(call: ast.Call) -> Optional[dict[str, Any]]:
+    """
+    Вычисляет аргументы вызова процедуры получения значения
+
+    :param call: ast.Call: Вызов процедуры
+    :return: dict[str, Any] or None: Аргументы по именам параметров (None, если аргументы не являются литералами)
+    """
+    names = ('name',) + _GETTER_ARGS.get(_node_name(call.func), _DEFAULT_GETTER_ARGS)
+    if len(call.args) > len(names) or any(keyword.arg is None for keyword in call.keywords):
+        return None
+    try:
+        result = {name: ast.literal_eval(arg) for name, arg in zip(names, call.args)}
+        result.update((keyword.arg, ast.literal_eval(keyword.value)) for keyword in call.keywords)
+    except ValueError:
+        return None
+    allowed = set(names) | set(_LOG_KWARGS)
+    return result if isinstance(result.get('name'), str) and allowed.issuperset(result) else None
+
+
+class _Declaration:
+    """Объявление параметра, подготовленное для генерации кода"""
+
+    def __init__(self, param: SettingsParam, node: ast.AST):
+        self.param = param
+        self.node = node
+        self.arguments = (_call_arguments(node) if isinstance(node, ast.Call)
+                          and _node_name(node.func) in _SPECIALIZED_GETTERS else None)
+        if self.arguments is None and not _is_static(node):
+            raise ValueError(f'{param.source}:{param.line}: объявление параметра {param.name} содержит выражения, '
+                             f'которые невозможно вычислить статически')
+
+    @property
+    def getter(self) -> str:
+        return _node_name(self.node.func) if isinstance(self.node, ast.Call) else ''
+
+    @property
+    def annotation(self) -> str:
+        if self.arguments is None:
+            return 'Any'
+        if self.getter == 'get_converted_env_param':
+            default = self.arguments.get('default')
+            annotation = _CONVERTER_TYPES.get(self.arguments['converter'], 'Any')
+            return annotation if default is None or isinstance(default, str) else 'Any'
+        return _TYPES[self.getter]
+
+
+def _find_declarations(params: Sequence[SettingsParam]) -> list[_Declaration]:
+    """
+    Находит выражения объявлений параметров в файлах настроек (каждый файл разбирается один раз)
+
+    :param params: Sequence[SettingsParam]: Параметры настроек
+    :return: list[_Declaration]: Объявления параметров
+    """
+    assignments: dict[str, dict[tuple[str, int], ast.AST]] = {}
+    result = []
+    for param in params:
+        nodes = assignments.get(param.source)
+        if nodes is None:
+            with open(param.source, mode='r', encoding='utf-8') as file:
+                tree = ast.parse(file.read(), param.source)
+            nodes = assignments[param.source] = {
+                (target.id, node.lineno): node.value for node in tree.body if isinstance(node, ast.Assign)
+                for target in node.targets if isinstance(target, ast.Name)}
+        node = nodes.get((param.name, param.line))
+        if node is None:
+            node = next((value for (name, _), value in nodes.items() if name == param.name), None)
+        if node is None:
+            raise ValueError(f'{param.source}:{param.line}: не найдено объявление параметра {param.name}')
+        result.append(_Declaration(param, node))
+    return result
+
+
+def _format_read(name: str, arguments: dict[str, Any], default: Any) -> list[str]:
+    """Формирует код чтения строкового значения переменной окружения с записью в logger"""
+    env_name = arguments['name']
+    default_arg = f', {str(default)!r}' if default else ''
+    rows = [f'    {name} = _environ.get({env_name!r}{default_arg})']
+
+    log_value = repr(arguments['log_text']) if 'log_text' in arguments else name
+    if arguments.get('do_obfuscate_log_text'):
+        log_value = f'_obfuscate({log_value})'
+    rows.append(f"    if _log:\n"
+                f"        _emit(_messages['log_value'].format({env_name!r}, {log_value}, ''), _logger.debug)")
+    rows.append(f'    {name} = ({name}.strip() or None) if {name} else None')
+    return rows
+
+
+def _format_required(name: str, env_name: str) -> str:
+    return f"    if {name} is None:\n        _error(_messages['err_required'].format({env_name!r}, '', ''))"
+
+
+def _format_specialized(declaration: _Declaration) -> tuple[list[str], list[str]]:
+    """
+    Формирует код получения значения параметра
+
+    :param declaration: _Declaration: Объявление параметра
+    :return: tuple[list[str], list[str]]: Строки функции загрузки и строки уровня модуля
+    """
+    name, getter, arguments = declaration.param.name, declaration.getter, declaration.arguments
+    env_name, required, default = arguments['name'], arguments.get('required', False), arguments.get('default')
+    module_rows = []
+
+    if getter == 'get_converted_env_param':
+        is_str_default = isinstance(default, str)
+        rows = _format_read(name, arguments, default if is_str_default else None)
+        if required and default is None:
+            rows.append(_format_required(name, env_name))
+        converter = f'_CONVERT_{name}'
+        choices = tuple(arguments['choices']) if arguments.get('choices') else None
+        module_rows.append(f"{converter} = _compile_converter({arguments['converter']!r}, "
+                           f"{arguments.get('min_value')!r}, {arguments.get('max_value')!r}, {choices!r}, "
+                           f"{arguments.get('pattern')!r})")
+        if not is_str_default and default is not None:
+            rows.append(f'    if {name} is None:\n        {name} = {default!r}')
+        rows.append(f'    if {name} is not None:')
+        rows.append(f'        try:\n            {name} = {converter}({name})\n'
+                    f'        except _ConversionError as e:\n'
+                    f'            _error(_messages[e.message_key].format({env_name!r}, {name}, e.detail))\n'
+                    f'            {name} = None')
+        return rows, module_rows
+
+    rows = _format_read(name, arguments, default)
+    if required:
+        rows.append(_format_required(name, env_name))
+    if getter == 'get_bool_env_param':
+        rows.append(f'    {name} = {name} is not None and {name}.lower() in _TRUE_VALUES')
+    elif getter in ('get_int_env_param', 'get_float_env_param'):
+        convert, message_key = ((f'int({name})', 'err_integer') if getter == 'get_int_env_param'
+                                else (f"float({name}.replace(',', '.'))", 'err_float'))
+        rows.append(f'    if {name} is not None:\n        try:\n            {name} = {convert}\n'
+                    f'        except ValueError as e:\n'
+                    f"            _error(_messages[{message_key!r}].format({env_name!r}, {name}, str(e)))\n"
+                    f'            {name} = None')
+    return rows, module_rows
+
+
+def format_settings_module(params: Sequence[SettingsParam], class_name: str = 'Settings',
+                           function_name: str = 'load_settings', package: str = 'env_settings') -> str:
+    """
+    Формирует исходный код модуля настроек
+
+    Для процедур get_str/int/float/bool/converted_env_param с литеральными аргументами формируется
+    специализированный код, вызовы остальных процедур env_settings (get_values, get_file_env_param и т.д.)
+    переносятся в функцию загрузки без изменений (они читают значения из os.environ, а не из аргумента функции
+    загрузки).
+    Параметр, объявленный в нескольких файлах настроек, включается один раз (используется первое объявление)
+
+    :param params: Sequence[SettingsParam]: Параметры настроек
+    :param class_name: str, default='Settings': Имя класса настроек
+    :param function_name: str, default='load_settings': Имя функции загрузки
+    :param package: str, default='env_settings': Имя пакета env_settings для импорта в сформированном модуле
+    :return: str: Исходный код модуля
+    """
+    declarations = _find_declarations(_deduplicate_params(params))
+    sources = dict.fromkeys(declaration.param.source for declaration in declarations)
+    runtime_names = sorted({_node_name(node.func) for declaration in declarations if declaration.arguments is None
+                            for node in ast.walk(declaration.node) if isinstance(node, ast.Call)})
+
+    header = _HEADER.format(sources='\n'.join(sources) or '-', package=package)
+    if runtime_names:
+        header += f"from {package} import {', '.join(runtime_names)}\n"
+    module_rows, load_rows = [_TRUE_VALUES], []
+    for declaration in declarations:
+        load_rows.append(f'    # {declaration.param.name}: {declaration.param.source}:{declaration.param.line}')
+        if declaration.arguments is None:
+            load_rows.append(f'    {declaration.param.name} = {ast.unparse(declaration.node)}')
+            continue
+        rows, converters = _format_specialized(declaration)
+        load_rows.extend(rows)
+        module_rows.extend(converters)
+
+    names = [declaration.param.name for declaration in declarations]
+    slots = repr(tuple(names))
+    init_args = ''.join(f',\n                 {declaration.param.name}: {declaration.annotation}'
+                        for declaration in declarations)
+    annotations = ''.join(f'    {declaration.param.name}: {declaration.annotation}\n' for declaration in declarations)
+    assignments = ''.join(f'        _set(self, {name!r}, {name})\n' for name in names) or '        pass\n'
+
+    return (f'{header}\n{chr(10).join(module_rows)}\n\n\n'
+            f'class {class_name}:\n'
+            f'    """Настройки приложения (неизменяемые)"""\n'
+            f'    __slots__ = {slots}\n\n'
+            f'{annotations}{chr(10) if annotations else ""}'
+            f'    def __init__(self{init_args}):\n'
+            f'        _set = object.__setattr__\n'
+            f'{assignments}\n'
+            f'    def __setattr__(self, name: str, value: Any):\n'
+            f"        raise AttributeError(f'{{type(self).__name__}} is frozen')\n\n"
+            f'    def __delattr__(self, name: str):\n'
+            f"        raise AttributeError(f'{{type(self).__name__}} is frozen')\n\n\n"
+            f'def {function_name}(_environ: Mapping[str, str] = _os_environ) -> {class_name}:\n'
+            f'    """Загружает настройки из переменных окружения *_environ*"""\n'
+            f'    _messages = _config.messages\n'
+            f'    _logger = _config.logger\n'
+            f'    _log = _config.do_value_logging\n\n'
+            f'{chr(10).join(load_rows)}{chr(10) * 2 if load_rows else ""}'
+            f'    return {class_name}({", ".join(names)})\n')
+
+
+class SettingsModuleWriter(SettingsWriter):
+    """Типизированный модуль Python: неизменяемый класс настроек и функция загрузки"""
+
+    def __init__(self, filename: str, class_name: str = 'Settings', function_name: str = 'load_settings',
+                 package: str = 'env_settings'):
+        """
+        :param filename: str: Имя формируемого файла
+        :param class_name: str, default='Settings': Имя класса настроек
+        :param function_name: str, default='load_settings': Имя функции загрузки
+        :param package: str, default='env_settings': Имя пакета env_settings для импорта в сформированном модуле
+        """
+        super().__init__(filename)
+        self.class_name = class_name
+        self.function_name = function_name
+        self.package = package
+
+    def format(self, params: Sequence[SettingsParam]) -> str:
+        return format_settings_module(params, self.class_name, self.function_name, self.package)
+
+
+def generate_settings_module(new_module_filename: str, settings_filename: str = 'settings.py',
+                             modules_path: str = '.', sub_modules_path: Optional[str] = None,
+                             include_sub_modules: Optional[tuple[str]] = None,
+                             exclude_params: Optional[tuple[str]] = None, class_name: str = 'Settings',
+                             function_name: str = 'load_settings'):
+    """
+    Генерирует типизированный модуль настроек по файлам настроек в указанных директориях
+
+    Параметры поиска файлов настроек соответствуют :func:`env_settings.generator.generate_env_file`
+
+    :example:
+    generate_settings_module('src/app_settings.py', modules_path='src')
+    # использование: from app_settings import load_settings; SETTINGS = load_settings()
+
+    :param new_module_filename: str: Имя генерируемого модуля (например, 'app_settings.py')
+    :param settings_filename: str, default='settings.py': Имя файла настроек для поиска
+    :param modules_path: str, default='.': Корневая директория для поиска
+    :param sub_modules_path: str, optional: Специфическая поддиректория для поиска модулей (например, 'modules')
+    :param include_sub_modules: tuple[str], optional: Кортеж имен подмодулей для включения в поиск
+    :param exclude_params: tuple[str], optional: Кортеж имен параметров для исключения из результата
+    :param class_name: str, default='Settings': Имя класса настроек
+    :param function_name: str, default='load_settings': Имя функции загрузки
+    """
+    generate_settings_files((SettingsModuleWriter(new_module_filename, class_name, function_name),),
+                            settings_filename, modules_path, sub_modules_path, include_sub_modules, exclude_params,
+                            deduplicate=True)
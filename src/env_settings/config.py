@@ -1,12 +1,18 @@
 """
 Конфигурация поведения обработчиков для работы с настройками
 """
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
-from typing import Union
+from threading import Lock
+from re import Pattern
+from typing import Iterator, NamedTuple, Sequence, Union
 from typing import Optional
 
 from logging import Logger, getLogger
 
+from .patterns import compile_pattern
+
 
 class ErrorHandling(Enum):
     """Перечисление методов обработки ошибок"""
@@ -35,68 +41,227 @@ class ErrorHandling(Enum):
         return self.value
 
 
-class _Config:
-    def __init__(self):
-        _msg_prefix = 'settings:'
-        _err_msg_prefix = f'{_msg_prefix} Ошибка загрузки настроек! Параметр'
-        # Параметры по умолчанию
-        self._messages = {
+class _ConfigState(NamedTuple):
+    """Неизменяемый снимок параметров конфигурации"""
+    messages: dict  # Сообщения
+    error_handling: ErrorHandling  # Метод обработки ошибок
+    logger_name: Optional[str]  # Наименование логгера
+    logger: Logger  # Логгер
+    do_value_logging: bool  # Признак логгирования значений
+    env_generator_pattern: str  # Шаблон поиска параметров генератором .env файлов
+    sources: tuple = ()  # Дополнительные источники значений (объекты с методом get(name))
+    env_generator_regex: Optional[Pattern] = None  # Скомпилированный шаблон env_generator_pattern
+    env_generator_timeout: Optional[float] = 10.0  # Бюджет времени разбора одного файла генератором (секунды)
+    interpolate: bool = False  # Признак подстановки значений ${VAR} процедурами получения значений
+    log_interval: Optional[float] = None  # Интервал вывода повторяющихся сообщений (секунды, None - без ограничения)
+
+
+def _default_state() -> _ConfigState:
+    """Формирует снимок конфигурации по умолчанию"""
+    _msg_prefix = 'settings:'
+    _err_msg_prefix = f'{_msg_prefix} Ошибка загрузки настроек! Параметр'
+    pattern = (r'^(?:[^\S\r\n]*(?:#[^\r\n]*)?\r?\n)*[^\S\r\n]*[A-Z0-9_-]+[^\S\r\n]*=[^\S\r\n]'
+               r'(?:(?!param)[^\r\n])*param[^(\r\n]*\([^)\r\n]*\)[^\r\n]*$')
+    return _ConfigState(
+        messages={
             'log_value': f'{_msg_prefix} {"{}={}"}',
+            'log_suppressed': f'{"{0}"} (повторов подавлено: {"{1}"} за {"{2}"} с)',
             'err_required': f'{_err_msg_prefix} {"{}"} должен быть задан!',
             'err_integer': f'{_err_msg_prefix} {"{}={}"}. Должен быть числом!',
             'err_float': f'{_err_msg_prefix} {"{}={}"}. Должен быть дробным числом (с разделителем точка: 0.0)!',
             'err_file': f'{_err_msg_prefix} {"{}={}"}. Не найден указанный файл!',
-            'err_directory': f'{_err_msg_prefix} {"{}={}"}. Невозможно создать директорию! {"{}"}'
-        }
-        self._error_handling = ErrorHandling.RAISE
-        self._logger = None
-        self._do_value_logging = False
-        self._env_generator_pattern = r'^(?:\s*(?:#.*)?\s*[\r\n]+)*\s*[A-Z0-9_-]+\s*=\s.*?param.*?\(.*?\).*$'
+            'err_directory': f'{_err_msg_prefix} {"{}={}"}. Невозможно создать директорию! {"{}"}',
+            'err_convert': f'{_err_msg_prefix} {"{}={}"}. Невозможно преобразовать значение! {"{}"}',
+            'err_duration': f'{_err_msg_prefix} {"{}={}"}. Должен быть длительностью (например: 30s, 5m, 1h30m)!',
+            'err_bytes': f'{_err_msg_prefix} {"{}={}"}. Должен быть размером (например: 512MB, 1GiB)!',
+            'err_json': f'{_err_msg_prefix} {"{}={}"}. Должен быть JSON! {"{}"}',
+            'err_url': f'{_err_msg_prefix} {"{}={}"}. Должен быть URL (scheme://host)!',
+            'err_choices': f'{_err_msg_prefix} {"{}={}"}. Допустимые значения: {"{}"}!',
+            'err_min': f'{_err_msg_prefix} {"{}={}"}. Значение меньше минимального {"{}"}!',
+            'err_max': f'{_err_msg_prefix} {"{}={}"}. Значение больше максимального {"{}"}!',
+            'err_pattern': f'{_err_msg_prefix} {"{}={}"}. Не соответствует шаблону {"{}"}!',
+            'err_uri': f'{_err_msg_prefix} {"{0}"}. Некорректный URI подключения! {"{2}"}',
+            'err_rollout': f'{_err_msg_prefix} {"{}={}"}. Должен быть процентом включения '
+                           f'(например: 25%, 25%,tenant-1)! {"{}"}',
+            'err_interpolation': f'{_err_msg_prefix} {"{0}"}. Невозможно подставить значения! {"{2}"}',
+            'warn_conflict': f'{_msg_prefix} Конфликт объявлений параметра {"{0}"}! {"{2}"}',
+            'warn_remote': f'{_msg_prefix} Ошибка загрузки значений из источника {"{0}"}! {"{2}"}',
+            'warn_discovery': f'{_msg_prefix} Ошибка выполнения файла настроек {"{0}"}! {"{2}"}'
+        },
+        error_handling=ErrorHandling.RAISE,
+        logger_name=None,
+        logger=getLogger(None),
+        do_value_logging=False,
+        env_generator_pattern=pattern,
+        env_generator_regex=compile_pattern(pattern)
+    )
+
+
+class _Config:
+    """
+    Конфигурация модуля
+
+    Параметры хранятся в неизменяемом снимке :class:`_ConfigState`. Чтение выполняется без блокировок:
+    сначала проверяется снимок текущего контекста (см. :meth:`override`), затем глобальный снимок.
+    Изменение создаёт новый снимок и атомарно заменяет ссылку на него
+    """
+
+    def __init__(self):
+        self._state = _default_state()
+        self._context_state: ContextVar[Optional[_ConfigState]] = ContextVar('env_settings_config', default=None)
+        self._write_lock = Lock()
+
+    @property
+    def state(self) -> _ConfigState:
+        """Снимок конфигурации, действующий в текущем контексте"""
+        return self._context_state.get() or self._state
 
     @property
     def messages(self):
-        return self._messages
+        return self.state.messages
 
     @property
     def error_handling(self):
-        return self._error_handling
+        return self.state.error_handling
 
     @property
     def logger(self) -> Union[type[Logger], Logger]:
-        return getLogger(self._logger)
+        return self.state.logger
 
     @property
     def do_value_logging(self):
-        return self._do_value_logging
+        return self.state.do_value_logging
 
     @property
     def env_generator_pattern(self):
-        return self._env_generator_pattern
+        return self.state.env_generator_pattern
 
-    def configure(self, messages: Optional[dict] = None,
-                  error_handling: Optional[Union[str, ErrorHandling]] = None, logger: Optional[str] = None,
-                  do_value_logging: Optional[bool] = None, env_generator_pattern: Optional[str] = None):
-        """Обновление параметров конфигурации"""
+    @property
+    def sources(self) -> tuple:
+        return self.state.sources
+
+    @property
+    def interpolate(self) -> bool:
+        return self.state.interpolate
+
+    @property
+    def log_interval(self) -> Optional[float]:
+        return self.state.log_interval
+
+    @property
+    def env_generator_regex(self) -> Pattern:
+        return self.state.env_generator_regex or compile_pattern(self.state.env_generator_pattern)
+
+    @property
+    def env_generator_timeout(self) -> Optional[float]:
+        return self.state.env_generator_timeout
+
+    @staticmethod
+    def _updated_state(state: _ConfigState, messages: Optional[dict] = None,
+                       error_handling: Optional[Union[str, ErrorHandling]] = None, logger: Optional[str] = None,
+                       do_value_logging: Optional[bool] = None,
+                       env_generator_pattern: Optional[str] = None,
+                       sources: Optional[Sequence] = None,
+                       env_generator_timeout: Optional[float] = None,
+                       interpolate: Optional[bool] = None,
+                       log_interval: Optional[float] = None) -> _ConfigState:
+        """Формирует новый снимок конфигурации на основе *state* и переданных параметров"""
+        changes = {}
         if messages:
             if not isinstance(messages, dict):
                 raise TypeError('messages должен быть словарем')
-            self._messages.update(messages)
+            changes['messages'] = {**state.messages, **messages}
 
         if error_handling:
-            self._error_handling = ErrorHandling.from_value(error_handling)
+            changes['error_handling'] = ErrorHandling.from_value(error_handling)
 
         if logger:
-            self._logger = logger
+            changes['logger_name'] = logger
+            changes['logger'] = getLogger(logger)
 
-        if do_value_logging:
-            self._do_value_logging = do_value_logging
+        if do_value_logging is not None:
+            changes['do_value_logging'] = bool(do_value_logging)
 
         if env_generator_pattern:
-            self._env_generator_pattern = env_generator_pattern
+            changes['env_generator_regex'] = compile_pattern(env_generator_pattern)
+            changes['env_generator_pattern'] = env_generator_pattern
+
+        if sources is not None:
+            changes['sources'] = tuple(sources)
+
+        if env_generator_timeout is not None:
+            changes['env_generator_timeout'] = env_generator_timeout if env_generator_timeout > 0 else None
+
+        if interpolate is not None:
+            changes['interpolate'] = bool(interpolate)
+
+        if log_interval is not None:
+            changes['log_interval'] = log_interval if log_interval > 0 else None
+
+        return state._replace(**changes) if changes else state
+
+    def _set_state(self, state: _ConfigState):
+        """Устанавливает снимок конфигурации текущего контекста, либо глобальный снимок"""
+        if self._context_state.get() is not None:
+            self._context_state.set(state)
+        else:
+            self._state = state
+
+    def configure(self, messages: Optional[dict] = None,
+                  error_handling: Optional[Union[str, ErrorHandling]] = None, logger: Optional[str] = None,
+                  do_value_logging: Optional[bool] = None, env_generator_pattern: Optional[str] = None,
+                  sources: Optional[Sequence] = None, env_generator_timeout: Optional[float] = None,
+                  interpolate: Optional[bool] = None, log_interval: Optional[float] = None):
+        """
+        Обновление параметров конфигурации
+
+        Внутри :meth:`override` изменения действуют только в текущем контексте
+        """
+        with self._write_lock:
+            self._set_state(self._updated_state(self.state, messages, error_handling, logger, do_value_logging,
+                                                env_generator_pattern, sources, env_generator_timeout, interpolate,
+                                                log_interval))
 
     def reset(self):
         """Сброс настроек к значениям по умолчанию"""
-        self.__init__()
+        with self._write_lock:
+            self._set_state(_default_state())
+
+    def snapshot(self) -> _ConfigState:
+        """
+        Возвращает глобальный снимок конфигурации для последующего восстановления (см. :meth:`restore`)
+
+        Снимок неизменяем, поэтому сохранение не требует копирования
+        """
+        return self._state
+
+    def restore(self, state: _ConfigState):
+        """
+        Восстанавливает глобальный снимок конфигурации, полученный :meth:`snapshot`
+
+        :param state: _ConfigState: Снимок конфигурации
+        """
+        with self._write_lock:
+            self._state = state
+
+    @contextmanager
+    def override(self, **kwargs) -> Iterator['_Config']:
+        """
+        Переопределение параметров конфигурации в текущем контексте (поток, задача asyncio)
+
+        Изменения не видны другим потокам и задачам и отменяются при выходе из блока
+
+        :example:
+        with config.override(error_handling='ignore'):
+            TIMEOUT = get_int_env_param('TIMEOUT')
+
+        :param kwargs: Параметры конфигурации, см. :meth:`configure`
+        """
+        token = self._context_state.set(self._updated_state(self.state, **kwargs))
+        try:
+            yield self
+        finally:
+            self._context_state.reset(token)
 
 
 # Экземпляр синглтона для глобального доступа
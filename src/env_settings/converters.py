@@ -0,0 +1,222 @@
+"""
+Реестр преобразователей значений настроек
+
+Содержит преобразователи строковых значений переменных окружения (длительности, размеры, JSON, URL, перечисления)
+и компиляцию преобразователя вместе с ограничениями (min/max, choices, pattern) в переиспользуемый конвейер
+"""
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from json import JSONDecodeError, loads
+from re import IGNORECASE, Pattern, compile
+from typing import Any, Callable, NamedTuple, Optional, Union
+from urllib.parse import urlsplit
+
+
+class ConversionError(ValueError):
+    """Ошибка преобразования значения, содержит ключ сообщения из *config.messages*"""
+
+    def __init__(self, message_key: str, detail: str = ''):
+        super().__init__(message_key, detail)
+        self.message_key = message_key
+        self.detail = detail
+
+
+class _Converter(NamedTuple):
+    """Зарегистрированный преобразователь"""
+    func: Callable[[str], Any]  # Функция преобразования строки
+    message_key: str  # Ключ сообщения об ошибке в config.messages
+
+
+_DURATION_NUMBER = r'(\d+(?:\.\d*)?|\.\d+)'
+_DURATION_PART = compile(rf'\s*{_DURATION_NUMBER}\s*(ms|s|m|h|d|w)\s*', IGNORECASE)
+_DURATION_VALUE = compile(rf'(?:\s*{_DURATION_NUMBER}\s*(?:ms|s|m|h|d|w)\s*)+|\s*{_DURATION_NUMBER}\s*', IGNORECASE)
+_DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+_BYTES_VALUE = compile(r'^\s*(\d+(?:\.\d*)?|\.\d+)\s*([kmgtp]?i?)b?\s*$', IGNORECASE)
+_BYTES_UNITS = {'': 1, 'k': 10 ** 3, 'm': 10 ** 6, 'g': 10 ** 9, 't': 10 ** 12, 'p': 10 ** 15,
+                'ki': 2 ** 10, 'mi': 2 ** 20, 'gi': 2 ** 30, 'ti': 2 ** 40, 'pi': 2 ** 50}
+
+
+def _to_duration(value: str) -> float:
+    """
+    Преобразует длительность в секунды
+
+    Поддерживаются единицы ms, s, m, h, d, w и их сочетания (например: 30s, 1.5h, 1h30m).
+    Значение без единицы (только одно число) считается секундами
+
+    :param value: str: Строковое значение
+    :return: float: Длительность в секундах
+    """
+    match = _DURATION_VALUE.fullmatch(value)
+    if not match:
+        raise ValueError(value)
+    if match.group(2) is not None:
+        return float(match.group(2))
+    return sum(float(number) * _DURATION_UNITS[unit.lower()] for number, unit in _DURATION_PART.findall(value))
+
+
+def _to_bytes(value: str) -> int:
+    """
+    Преобразует размер в байты
+
+    Поддерживаются десятичные (KB, MB, GB, TB, PB) и двоичные (KiB, MiB, GiB, TiB, PiB) единицы.
+    Значение без единицы считается байтами
+
+    :param value: str: Строковое значение
+    :return: int: Размер в байтах
+    """
+    match = _BYTES_VALUE.match(value)
+    if not match:
+        raise ValueError(value)
+    number, unit = match.groups()
+    unit = unit.lower()
+    if unit == 'i':
+        raise ValueError(value)
+    return int(Decimal(number) * _BYTES_UNITS[unit])
+
+
+def _to_json(value: str) -> Any:
+    """
+    Преобразует JSON строку в объект Python
+
+    :param value: str: Строковое значение
+    :return: Any: Объект Python
+    """
+    try:
+        return loads(value)
+    except JSONDecodeError as e:
+        raise ConversionError('err_json', str(e)) from None
+
+
+def _to_url(value: str) -> str:
+    """
+    Проверяет, что значение является URL со схемой и адресом
+
+    :param value: str: Строковое значение
+    :return: str: URL
+    """
+    parts = urlsplit(value)
+    if not parts.scheme or not parts.netloc:
+        raise ValueError(value)
+    return value
+
+
+def _to_float(value: str) -> float:
+    """Преобразует значение в float, допуская запятую в качестве разделителя"""
+    return float(value.replace(',', '.'))
+
+
+_converters: dict[str, _Converter] = {
+    'str': _Converter(str, 'err_convert'),
+    'int': _Converter(int, 'err_integer'),
+    'float': _Converter(_to_float, 'err_float'),
+    'duration': _Converter(_to_duration, 'err_duration'),
+    'bytes': _Converter(_to_bytes, 'err_bytes'),
+    'json': _Converter(_to_json, 'err_json'),
+    'url': _Converter(_to_url, 'err_url'),
+    'enum': _Converter(str, 'err_choices'),
+}
+
+
+def register_converter(name: str, func: Callable[[str], Any], message_key: str = 'err_convert'):
+    """
+    Регистрирует преобразователь значений
+
+    Функция преобразования получает строковое значение и должна вызвать *ValueError* при невозможности преобразования
+
+    :param name: str: Наименование преобразователя
+    :param func: Callable[[str], Any]: Функция преобразования
+    :param message_key: str, default='err_convert': Ключ сообщения об ошибке в *config.messages*
+    """
+    _converters[name] = _Converter(func, message_key)
+    compile_converter.cache_clear()
+
+
+def _enum_converter(enum_class: type[Enum]) -> _Converter:
+    """
+    Создает преобразователь для перечисления, поиск выполняется по значению, затем по имени элемента
+
+    :param enum_class: type[Enum]: Класс перечисления
+    :return: _Converter: Преобразователь
+    """
+    by_value = {str(item.value): item for item in enum_class}
+    by_name = {item.name.lower(): item for item in enum_class}
+    allowed = ', '.join(by_value)
+
+    def convert(value: str) -> Enum:
+        item = by_value.get(value)
+        if item is None:
+            item = by_name.get(value.lower())
+        if item is None:
+            raise ConversionError('err_choices', allowed)
+        return item
+
+    return _Converter(convert, 'err_choices')
+
+
+@lru_cache(maxsize=None)
+def compile_converter(converter: Union[str, type[Enum], Callable[[str], Any]], min_value: Any = None,
+                      max_value: Any = None, choices: Optional[tuple] = None,
+                      pattern: Optional[Union[str, Pattern]] = None) -> Callable[[str], Any]:
+    """
+    Компилирует преобразователь и ограничения в конвейер
+
+    Результат кешируется: регулярные выражения и наборы допустимых значений создаются один раз
+    для каждого сочетания аргументов.
+    Конвейер вызывает :class:`ConversionError` с ключом сообщения из *config.messages*.
+    Значение не строкового типа (например, значение по умолчанию) не преобразуется и проверяется только ограничениями
+
+    :param converter: str, Enum or Callable: Наименование зарегистрированного преобразователя, класс перечисления \
+    или функция преобразования
+    :param min_value: optional: Минимальное допустимое значение
+    :param max_value: optional: Максимальное допустимое значение
+    :param choices: tuple, optional: Допустимые значения (после преобразования)
+    :param pattern: str or Pattern, optional: Регулярное выражение для проверки исходной строки
+    :return: Callable[[Any], Any]: Конвейер преобразования
+    """
+    if isinstance(converter, str):
+        try:
+            func, message_key = _converters[converter]
+        except KeyError:
+            raise ValueError(f'Неизвестный преобразователь: {converter}') from None
+    elif isinstance(converter, type) and issubclass(converter, Enum):
+        func, message_key = _enum_converter(converter)
+    else:
+        func, message_key = converter, 'err_convert'
+
+    if converter == 'enum' and not choices:
+        raise ValueError('Для преобразователя enum необходимо указать choices')
+
+    full_match = compile(pattern).fullmatch if isinstance(pattern, str) else pattern.fullmatch if pattern else None
+    allowed = frozenset(choices) if choices else None
+    allowed_text = ', '.join(str(choice) for choice in choices) if choices else ''
+    pattern_text = pattern if isinstance(pattern, str) else pattern.pattern if pattern else ''
+
+    def pipeline(value: Any) -> Any:
+        if isinstance(value, str):
+            if full_match is not None and full_match(value) is None:
+                raise ConversionError('err_pattern', pattern_text)
+            try:
+                result = func(value)
+            except ConversionError:
+                raise
+            except (ValueError, TypeError) as e:
+                raise ConversionError(message_key, str(e)) from None
+        else:
+            result = value
+        try:
+            if allowed is not None and result not in allowed:
+                raise ConversionError('err_choices', allowed_text)
+        except TypeError:
+            raise ConversionError('err_choices', allowed_text) from None
+        try:
+            if min_value is not None and result < min_value:
+                raise ConversionError('err_min', str(min_value))
+            if max_value is not None and result > max_value:
+                raise ConversionError('err_max', str(max_value))
+        except TypeError as e:
+            raise ConversionError(message_key, str(e)) from None
+        return result
+
+    return pipeline
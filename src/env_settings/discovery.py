@@ -0,0 +1,261 @@
+"""
+Определение параметров выполнением файлов настроек
+
+Каждый файл настроек выполняется в отдельном процессе интерпретатора с минимальным окружением
+и ограничением времени. Процедуры получения значений (get_*_env_param) и os.environ подменяются
+записывающими обертками, поэтому определяются параметры, имена которых формируются динамически
+или читаются во вспомогательных функциях, и не определяются объявления, которые не выполняются.
+Файлы выполняются параллельно, результат передается генератору .env файлов в виде :class:`SettingsParam`
+"""
+import ast
+import json
+import os
+import runpy
+import sys
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from inspect import signature
+from os import path
+from re import compile
+from subprocess import DEVNULL, PIPE, TimeoutExpired, run
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from .archives import ArchiveMember
+from .config import config
+from .generator import SettingsParam, _get_settings_params
+
+# Переменные окружения, передаваемые процессу выполнения файла настроек
+SANDBOX_ENVIRON = ('PATH', 'SYSTEMROOT', 'LANG', 'TMPDIR', 'TEMP', 'TMP')
+
+_GETTER_NAME = compile(r'get_\w*env_param')
+_BOOTSTRAP = ('import sys; sys.path.insert(0, sys.argv[1]); '
+              '__import__(sys.argv[2] + ".discovery", fromlist=["_"])._execute_settings(*sys.argv[2:])')
+_PACKAGE = __package__ or 'env_settings'
+_PACKAGE_ROOT = path.abspath(path.join(path.dirname(__file__), *(['..'] * len(_PACKAGE.split('.')))))
+
+
+class _Recorder:
+    """Записывает чтения переменных окружения при выполнении файла настроек"""
+
+    def __init__(self, settings_file: str):
+        """
+        :param settings_file: str: Полный путь к выполняемому файлу настроек
+        """
+        self.settings_file = settings_file
+        self.reads: list[list] = []  # [имя, процедура, repr значения по умолчанию, обязательность, строка]
+        self._names: set[str] = set()
+        self._depth = 0
+
+    def record(self, name: Any, getter: str, default: Any = None, required: bool = False):
+        """Записывает первое чтение переменной *name* вне других процедур получения значений"""
+        if self._depth or not isinstance(name, str) or name in self._names:
+            return
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_code.co_filename != self.settings_file:
+            frame = frame.f_back
+        self._names.add(name)
+        self.reads.append([name, getter, repr(default), bool(required), frame.f_lineno if frame else 0])
+
+    def call(self, getter: Callable, *args, **kwargs):
+        """Вызывает процедуру получения значения, вложенные чтения не записываются"""
+        self._depth += 1
+        try:
+            return getter(*args, **kwargs)
+        finally:
+            self._depth -= 1
+
+    def wrap(self, getter: Callable) -> Callable:
+        """Оборачивает процедуру получения значения get_*_env_param"""
+        getter_signature = signature(getter)
+
+        @wraps(getter)
+        def wrapper(*args, **kwargs):
+            try:
+                arguments = getter_signature.bind(*args, **kwargs).arguments
+            except TypeError:
+                arguments = {}
+            self.record(arguments.get('name'), getter.__name__, arguments.get('default'),
+                        arguments.get('required', False))
+            return self.call(getter, *args, **kwargs)
+
+        return wrapper
+
+
+class _RecordingEnviron(MutableMapping):
+    """Замена os.environ, записывающая чтения переменных окружения"""
+
+    def __init__(self, recorder: _Recorder, values: MutableMapping):
+        self._recorder = recorder
+        self._values = values
+
+    def __getitem__(self, name):
+        self._recorder.record(name, 'environ', required=True)
+        return self._recorder.call(self._values.__getitem__, name)
+
+    def get(self, name, default=None):
+        self._recorder.record(name, 'getenv', default)
+        return self._recorder.call(self._values.get, name, default)
+
+    def __contains__(self, name):
+        self._recorder.record(name, 'environ')
+        return name in self._values
+
+    def __setitem__(self, name, value):
+        self._values[name] = value
+
+    def __delitem__(self, name):
+        del self._values[name]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def copy(self) -> dict:
+        return dict(self._values)
+
+
+def _execute_settings(package: str, settings_file: str, modules_path: str):
+    """
+    Выполняет файл настроек в процессе-песочнице и выводит записанные чтения в stdout в формате JSON
+
+    Вывод выполняемого файла в stdout подавляется, ошибки обработчика ошибок не вызываются
+    """
+    output = os.fdopen(os.dup(1), mode='w', encoding='utf-8')
+    os.dup2(os.open(os.devnull, os.O_WRONLY), 1)
+    settings_file = path.abspath(settings_file)
+    sys.path[:0] = [path.dirname(settings_file), path.abspath(modules_path)]
+
+    recorder = _Recorder(settings_file)
+    wrapped: dict[int, Callable] = {}
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not (module_name == package or module_name.startswith(package + '.')):
+            continue
+        for name, value in list(vars(module).items()):
+            if callable(value) and _GETTER_NAME.fullmatch(name):
+                if id(value) not in wrapped:
+                    wrapped[id(value)] = recorder.wrap(value)
+                setattr(module, name, wrapped[id(value)])
+        # файлы настроек импортируют процедуры из env_settings
+        sys.modules.setdefault('env_settings' + module_name[len(package):], module)
+    os.environ = _RecordingEnviron(recorder, os.environ)  # noqa: B003 - процесс не запускает подпроцессы
+    config.configure(error_handling='ignore')
+
+    error = None
+    try:
+        runpy.run_path(settings_file, run_name='__settings__')
+    except (Exception, SystemExit) as e:
+        error = f'{type(e).__name__}: {e}'
+    json.dump({'reads': recorder.reads, 'error': error}, output)
+    output.flush()
+
+
+def _comment(lines: list[str], line: int) -> str:
+    """Возвращает строки комментария над строкой *line* (нумерация с 1)"""
+    start = line - 1
+    while start > 0 and lines[start - 1].lstrip().startswith('#'):
+        start -= 1
+    return '\n'.join(lines[start:line - 1])
+
+
+def _default(value: str) -> Any:
+    """Восстанавливает значение по умолчанию по repr, для прочих значений возвращает None"""
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return None
+
+
+class SettingsExecutor:
+    """
+    Определение параметров выполнением файлов настроек в параллельных процессах-песочницах
+
+    :example:
+    generate_env_file('.env.template', modules_path='src', executor=SettingsExecutor(timeout=5.0))
+    """
+
+    def __init__(self, timeout: float = 10.0, max_workers: Optional[int] = None,
+                 environ_values: Optional[Mapping[str, str]] = None, fallback: bool = True):
+        """
+        :param timeout: float, default=10.0: Ограничение времени выполнения одного файла настроек (секунды)
+        :param max_workers: int, optional: Количество одновременно выполняемых файлов (по умолчанию - по числу CPU)
+        :param environ_values: Mapping[str, str], optional: Переменные окружения процесса выполнения \
+        в дополнение к :data:`SANDBOX_ENVIRON`
+        :param fallback: bool, default=True: Определять параметры по шаблону *config.env_generator_pattern*, \
+        если файл не удалось выполнить (превышено время, процесс завершился без результата)
+        """
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.environ = {name: os.environ[name] for name in SANDBOX_ENVIRON if name in os.environ}
+        self.environ.update(environ_values or {})
+        self.fallback = fallback
+
+    def execute(self, settings_file: str, modules_path: str = '.') -> tuple[list, Optional[str]]:
+        """
+        Выполняет файл настроек в отдельном процессе
+
+        :param settings_file: str: Файл настроек
+        :param modules_path: str, default='.': Корневая директория модулей (добавляется в sys.path)
+        :return: tuple[list, str or None]: Записанные чтения и текст ошибки выполнения
+        :raises TimeoutExpired: Превышено время выполнения (процесс завершается)
+        :raises ValueError: Процесс завершился без результата
+        """
+        process = run([sys.executable, '-I', '-B', '-c', _BOOTSTRAP, _PACKAGE_ROOT, _PACKAGE, settings_file,
+                       modules_path], stdin=DEVNULL, stdout=PIPE, stderr=PIPE, env=self.environ,
+                      cwd=path.dirname(path.abspath(settings_file)), timeout=self.timeout)
+        try:
+            result = json.loads(process.stdout)
+        except ValueError:
+            stderr = process.stderr.decode('utf-8', 'replace').strip().splitlines()
+            raise ValueError(stderr[-1] if stderr else f'код завершения {process.returncode}') from None
+        return result['reads'], result['error']
+
+    def settings_params(self, settings_file, modules_path: str = '.',
+                        exclude_params: Optional[tuple[str]] = None) -> tuple[SettingsParam, ...]:
+        """
+        Определяет параметры файла настроек выполнением, об ошибках выполнения сообщает в logger
+
+        Элементы архивов не выполняются, их параметры определяются по шаблону *config.env_generator_pattern*
+
+        :param settings_file: str or ArchiveMember: Файл настроек
+        :param modules_path: str, default='.': Корневая директория модулей
+        :param exclude_params: tuple[str], optional: Кортеж имен параметров для исключения из результата
+        :return: tuple[SettingsParam]: Параметры в порядке первого чтения
+        """
+        if isinstance(settings_file, ArchiveMember):
+            return _get_settings_params(settings_file, exclude_params)
+        try:
+            reads, error = self.execute(settings_file, modules_path)
+        except (TimeoutExpired, ValueError, OSError) as e:
+            message = f'превышено время выполнения {self.timeout:g} с' if isinstance(e, TimeoutExpired) else str(e)
+            config.logger.warning(config.messages['warn_discovery'].format(settings_file, '', message))
+            return _get_settings_params(settings_file, exclude_params) if self.fallback else ()
+        if error:
+            config.logger.warning(config.messages['warn_discovery'].format(settings_file, '', error))
+
+        with open(settings_file, mode='r', encoding='utf-8', errors='replace') as file:
+            lines = file.read().splitlines()
+        return tuple(SettingsParam(name, _comment(lines, line), str(settings_file), line, getter, _default(default),
+                                   required)
+                     for name, getter, default, required, line in reads
+                     if not (exclude_params and name in exclude_params))
+
+    def params(self, settings_files: Iterable, modules_path: str = '.',
+               exclude_params: Optional[tuple[str]] = None) -> list[SettingsParam]:
+        """
+        Определяет параметры файлов настроек, файлы выполняются параллельно
+
+        :param settings_files: Iterable[str or ArchiveMember]: Файлы настроек
+        :param modules_path: str, default='.': Корневая директория модулей
+        :param exclude_params: tuple[str], optional: Кортеж имен параметров для исключения из результата
+        :return: list[SettingsParam]: Параметры в порядке файлов
+        """
+        settings_files = list(settings_files)
+        result = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for params in executor.map(lambda name: self.settings_params(name, modules_path, exclude_params),
+                                       settings_files):
+                result.extend(params)
+        return result
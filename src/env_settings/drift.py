@@ -0,0 +1,154 @@
+"""
+Поиск расхождений объявленных параметров и .env файлов
+
+Объявленные параметры определяются один раз по файлам настроек (тем же обходом, что и генератор .env файлов),
+.env файлы читаются построчно параллельно в нескольких процессах. Для каждого файла (и, при необходимости,
+для переменных окружения процесса) определяются отсутствующие, лишние и пустые параметры
+"""
+from concurrent.futures import ProcessPoolExecutor
+from os import environ
+from re import compile
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from .generator import ParamIndex
+
+# Источник значений - переменные окружения процесса
+ENVIRON_SOURCE = 'os.environ'
+
+_ASSIGNMENT = compile(r'[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_.-]*)[ \t]*(?:=(.*?))?[ \t]*\r?\n?')
+_INLINE_COMMENT = compile(r'\s+#.*$')
+_CHUNK_SIZE = 16
+
+
+class EnvDrift(NamedTuple):
+    """Расхождения одного источника значений с объявленными параметрами"""
+    source: str  # .env файл или ENVIRON_SOURCE
+    missing: tuple[str, ...]  # Объявленные параметры, отсутствующие в источнике
+    extra: tuple[str, ...]  # Параметры источника, не объявленные в файлах настроек (не определяются для os.environ)
+    empty: tuple[str, ...]  # Объявленные параметры с пустым значением
+
+    def __bool__(self):
+        return bool(self.missing or self.extra or self.empty)
+
+    def format(self) -> str:
+        """Формирует строку отчета: источник и непустые группы расхождений"""
+        groups = (('missing', self.missing), ('extra', self.extra), ('empty', self.empty))
+        return f'{self.source}: ' + '; '.join(f'{title} {", ".join(names)}' for title, names in groups if names)
+
+
+class DriftReport(NamedTuple):
+    """Результат поиска расхождений"""
+    drifts: tuple[EnvDrift, ...]  # Расхождения по источникам в порядке передачи источников
+
+    def __bool__(self):
+        return any(self.drifts)
+
+    def format(self) -> str:
+        """Формирует текстовый отчет, по одной строке на источник с расхождениями"""
+        return '\n'.join(drift.format() for drift in self.drifts if drift)
+
+
+def _value_lines(lines: Iterator[str], value: str) -> str:
+    """Дочитывает значение в кавычках, продолжающееся на следующих строках, возвращает значение без кавычек"""
+    quote = value[0]
+    value = value[1:]
+    while True:
+        position = 0
+        while True:
+            position = value.find(quote, position)
+            if position < 0 or quote == "'" or value[position - 1:position] != '\\':
+                break
+            position += 1
+        if position >= 0:
+            return value[:position]
+        line = next(lines, None)
+        if line is None:
+            return value
+        value += line
+
+
+def _scan_env_file(filename: str) -> tuple[str, Optional[dict[str, bool]]]:
+    """
+    Читает .env файл построчно и определяет заданные в нем параметры
+
+    :param filename: str: Имя .env файла
+    :return: tuple[str, dict[str, bool] or None]: Имя файла и признак пустого значения по имени параметра \
+    (None, если файл недоступен)
+    """
+    params: dict[str, bool] = {}
+    try:
+        with open(filename, mode='r', encoding='utf-8', errors='replace') as file:
+            lines = iter(file)
+            for line in lines:
+                stripped = line.lstrip()
+                if not stripped or stripped.startswith('#'):
+                    continue
+                match = _ASSIGNMENT.fullmatch(line)
+                if match is None:
+                    continue
+                value = match.group(2)
+                if value and value.lstrip()[:1] in ('"', "'"):
+                    value = _value_lines(lines, value.lstrip())
+                elif value:
+                    value = _INLINE_COMMENT.sub('', value)
+                params[match.group(1)] = not (value and value.strip())
+    except OSError:
+        return filename, None
+    return filename, params
+
+
+def _compare(source: str, params: Optional[dict[str, bool]], declared: dict[str, None],
+             exclude_params: frozenset, check_extra: bool = True) -> EnvDrift:
+    """Сравнивает параметры источника с объявленными параметрами"""
+    params = params or {}
+    missing = tuple(name for name in declared if name not in params)
+    empty = tuple(name for name in declared if params.get(name))
+    extra = tuple(name for name in params if name not in declared and name not in exclude_params) \
+        if check_extra else ()
+    return EnvDrift(source, missing, extra, empty)
+
+
+def find_env_drift(env_files: Iterable[str] = (), settings_filename: str = 'settings.py', modules_path: str = '.',
+                   sub_modules_path: Optional[str] = None, include_sub_modules: Optional[tuple[str]] = None,
+                   exclude_params: Optional[tuple[str]] = None, check_environ: bool = False,
+                   max_workers: Optional[int] = None) -> DriftReport:
+    """
+    Находит расхождения объявленных параметров с .env файлами и переменными окружения
+
+    1. Строит индекс параметров по файлам настроек (параметры поиска соответствуют :func:`generate_env_file`)
+    2. Параллельно читает .env файлы *env_files* построчно (значения не загружаются в окружение)
+    3. Для каждого файла определяет отсутствующие, лишние и пустые параметры. Недоступный файл считается пустым
+    4. При *check_environ* = *True* определяет отсутствующие и пустые параметры в os.environ
+
+    :example:
+    report = find_env_drift(glob('deploy/*/.env'), modules_path='src', check_environ=True)
+    if report:
+        print(report.format())
+
+    :param env_files: Iterable[str]: Имена .env файлов
+    :param settings_filename: str, default='settings.py': Имя файла настроек для поиска
+    :param modules_path: str, default='.': Корневая директория для поиска файлов настроек
+    :param sub_modules_path: str, optional: Специфическая поддиректория для поиска модулей (например, 'modules')
+    :param include_sub_modules: tuple[str], optional: Кортеж имен подмодулей для включения в поиск
+    :param exclude_params: tuple[str], optional: Кортеж имен параметров для исключения из проверки
+    :param check_environ: bool, default=False: Проверять переменные окружения процесса
+    :param max_workers: int, optional: Количество процессов (1 - чтение в текущем процессе)
+    :return: DriftReport: Расхождения по источникам
+    """
+    index = ParamIndex.from_settings(settings_filename, modules_path, sub_modules_path, include_sub_modules,
+                                     exclude_params)
+    declared = dict.fromkeys(index)
+    excluded = frozenset(exclude_params or ())
+    env_files = list(env_files)
+
+    if max_workers == 1 or len(env_files) <= _CHUNK_SIZE:
+        results = list(map(_scan_env_file, env_files))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_scan_env_file, env_files, chunksize=_CHUNK_SIZE))
+
+    drifts = [_compare(filename, params, declared, excluded) for filename, params in results]
+    if check_environ:
+        params = {name: not environ[name].strip() for name in declared if name in environ}
+        drifts.append(_compare(ENVIRON_SOURCE, params, declared, excluded, check_extra=False))
+    return DriftReport(tuple(drifts))
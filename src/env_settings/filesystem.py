@@ -0,0 +1,142 @@
+"""
+Проверка путей файловой системы для параметров настроек
+
+Содержит функции для проверки существования файлов и каталогов одним вызовом stat,
+кеширования результатов в пределах загрузки настроек и параллельной проверки наборов путей
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from os import makedirs, stat, stat_result
+from stat import S_ISDIR, S_ISREG
+from typing import Iterable, Iterator, Optional
+
+# Кеш результатов stat текущей загрузки настроек (None - кеширование выключено)
+_stat_cache: ContextVar[Optional[dict]] = ContextVar('_stat_cache', default=None)
+
+
+def _stat(name: str) -> Optional[stat_result]:
+    """
+    Выполняет один системный вызов stat для пути
+
+    :param name: str: Путь к файлу или каталогу
+    :return: stat_result or None: Результат stat или None, если путь не существует или недоступен
+    """
+    try:
+        return stat(name)
+    except (OSError, ValueError):
+        return None
+
+
+def stat_path(name: Optional[str]) -> Optional[stat_result]:
+    """
+    Возвращает результат stat для пути
+
+    Внутри :func:`path_cache` результат запоминается, повторные проверки того же пути не обращаются к диску
+
+    :param name: str, optional: Путь к файлу или каталогу
+    :return: stat_result or None: Результат stat или None, если путь не задан или не существует
+    """
+    if not name:
+        return None
+
+    cache = _stat_cache.get()
+    if cache is None:
+        return _stat(name)
+    if name not in cache:
+        cache[name] = _stat(name)
+    return cache[name]
+
+
+def is_file(name: Optional[str]) -> bool:
+    """
+    Проверяет, что путь существует и является файлом (один вызов stat)
+
+    :param name: str, optional: Путь к файлу
+    :return: bool: True, если файл существует
+    """
+    result = stat_path(name)
+    return result is not None and S_ISREG(result.st_mode)
+
+
+def is_dir(name: Optional[str]) -> bool:
+    """
+    Проверяет, что путь существует и является каталогом (один вызов stat)
+
+    :param name: str, optional: Путь к каталогу
+    :return: bool: True, если каталог существует
+    """
+    result = stat_path(name)
+    return result is not None and S_ISDIR(result.st_mode)
+
+
+def create_directory(name: str):
+    """
+    Создает файловый каталог, если он не существует
+
+    Создание безопасно при одновременном запуске нескольких процессов: каталог, созданный
+    конкурентом между проверкой и созданием, ошибкой не считается
+
+    :param name: str: Имя файлового каталога
+    """
+    if stat_path(name) is not None:
+        return
+
+    makedirs(name, exist_ok=True)
+
+    cache = _stat_cache.get()
+    if cache is not None:
+        cache.pop(name, None)
+
+
+def check_paths(names: Iterable[Optional[str]], max_workers: Optional[int] = None) -> dict[str, Optional[stat_result]]:
+    """
+    Проверяет набор путей параллельно, выполняя по одному stat на каждый уникальный путь
+
+    Полезно для сетевых файловых систем, где каждый stat занимает миллисекунды.
+    Внутри :func:`path_cache` результаты сохраняются в кеш и используются процедурами get_*_env_param
+
+    :param names: Iterable[str]: Набор путей (пустые значения пропускаются)
+    :param max_workers: int, optional: Количество потоков (по умолчанию определяется ThreadPoolExecutor)
+    :return: dict[str, stat_result or None]: Результаты stat по каждому уникальному пути
+    """
+    cache = _stat_cache.get()
+    unique_names = list(dict.fromkeys(name for name in names if name))
+    pending = [name for name in unique_names if cache is None or name not in cache]
+
+    if len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            checked = dict(zip(pending, executor.map(_stat, pending)))
+    else:
+        checked = {name: _stat(name) for name in pending}
+
+    if cache is not None:
+        cache.update(checked)
+        return {name: cache[name] for name in unique_names}
+    return checked
+
+
+@contextmanager
+def path_cache() -> Iterator[dict]:
+    """
+    Включает кеширование результатов stat на время загрузки настроек
+
+    Вложенные вызовы используют кеш внешнего вызова
+
+    :example:
+    with path_cache():
+        LOG_DIR = get_filedir_env_param('LOG_DIR')
+        LOG_FILE = get_file_env_param('LOG_FILE', file_mast_exist=False)
+
+    :return: dict: Кеш результатов stat
+    """
+    cache = _stat_cache.get()
+    if cache is not None:
+        yield cache
+        return
+
+    token = _stat_cache.set({})
+    try:
+        yield _stat_cache.get()
+    finally:
+        _stat_cache.reset(token)
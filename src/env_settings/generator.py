@@ -2,15 +2,132 @@
 Генерация .env файла по файлам настроек
 
 Содержит функции для автоматического создания .env-файла
-на основе анализа файлов настроек
+на основе анализа файлов настроек, индекс параметров для поиска дублей и конфликтов объявлений,
+а также писатели для формирования за один обход директорий нескольких файлов:
+шаблона .env, JSON Schema, Kubernetes ConfigMap и таблицы Markdown
 """
+import ast
+from abc import ABC, abstractmethod
+from json import dumps
 from os import path, walk
 from pathlib import Path
-from re import MULTILINE
 from re import compile
-from typing import Optional
+from typing import Any, Iterable, Iterator, NamedTuple, Optional, Sequence, Union
 
+from .archives import ArchiveMember, find_archive_settings, find_distribution_settings, is_archive, read_member
 from .config import config
+from .patterns import find_matches
+
+# Тип значения параметра JSON Schema по имени процедуры получения значения
+_GETTER_TYPES = {'get_int_env_param': 'integer', 'get_float_env_param': 'number', 'get_bool_env_param': 'boolean'}
+_GETTER_PATTERN = compile(r'(\w*param\w*)\s*\(')
+# Позиционные аргументы процедур получения значения после имени параметра
+_GETTER_ARGS = {'get_converted_env_param': ('converter', 'required', 'default', 'min_value', 'max_value', 'choices',
+                                            'pattern')}
+_DEFAULT_GETTER_ARGS = ('required', 'default')
+
+
+class SettingsParam(NamedTuple):
+    """Параметр, объявленный в файле настроек"""
+    name: str  # Наименование параметра
+    comment: str  # Строки комментария над объявлением
+    source: str  # Файл настроек
+    line: int  # Номер строки объявления
+    getter: Optional[str] = None  # Процедура получения значения (например, get_int_env_param)
+    default: Any = None  # Значение по умолчанию (None, если не указано или не является литералом)
+    required: bool = False  # Обязательность параметра
+
+    @property
+    def description(self) -> str:
+        """Текст комментария без символов #"""
+        return '\n'.join(row.strip().lstrip('#').strip() for row in self.comment.splitlines() if row.strip())
+
+    @property
+    def value_type(self) -> str:
+        """Тип значения в терминах JSON Schema"""
+        return _GETTER_TYPES.get(self.getter, 'string')
+
+
+def _parse_declaration(declaration: str) -> tuple[Optional[str], Any, bool]:
+    """
+    Определяет процедуру получения значения, значение по умолчанию и обязательность по строке объявления
+
+    :param declaration: str: Строка объявления параметра (например, "DB_PORT = get_int_env_param('DB_PORT', default=1)")
+    :return: tuple: Процедура получения значения, значение по умолчанию, обязательность
+    """
+    try:
+        tree = ast.parse(declaration.strip())
+    except SyntaxError:
+        match = _GETTER_PATTERN.search(declaration)
+        return (match.group(1) if match else None), None, False
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            func = node.func
+            getter = func.attr if isinstance(func, ast.Attribute) else getattr(func, 'id', '')
+            if 'param' not in getter:
+                continue
+            arguments = dict(zip(_GETTER_ARGS.get(getter, _DEFAULT_GETTER_ARGS), node.args[1:]))
+            arguments.update((keyword.arg, keyword.value) for keyword in node.keywords)
+            return getter, _literal(arguments.get('default')), bool(_literal(arguments.get('required')))
+    return None, None, False
+
+
+def _literal(node: Optional[ast.AST]) -> Any:
+    """Вычисляет литерал выражения, для прочих выражений возвращает None"""
+    if node is None:
+        return None
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+
+def _get_settings_params(settings_file, exclude_params: Optional[tuple[str]] = None) -> tuple[SettingsParam]:
+    """
+    Извлекает параметры переменных окружения из файла настроек.
+
+    Анализирует Python-файл настроек, находит все объявления переменных,
+    соответствующие заданному шаблону *config.env_generator_pattern*.
+    Шаблон применяется по фрагментам файла с ограничением времени *config.env_generator_timeout*
+    (см. :func:`env_settings.patterns.find_matches`).
+    Для каждого совпадения определяет имя параметра, комментарий, номер строки,
+    процедуру получения значения, значение по умолчанию и обязательность
+
+    :param settings_file: str or ArchiveMember: Наименование файла настроек (например, 'settings.py') \
+    или элемент zip-архива (см. :func:`env_settings.archives.read_member`)
+    :param exclude_params: tuple[str], optional: Кортеж имен параметров, которые следует исключить из результата
+    :return: tuple[SettingsParam]: Кортеж параметров
+    """
+    result = []
+    if isinstance(settings_file, ArchiveMember):
+        file_content = read_member(settings_file)
+    else:
+        with open(settings_file, mode='r', encoding='utf-8') as py_file:
+            file_content = py_file.read()
+
+    line, position = 1, 0
+    matches = find_matches(config.env_generator_regex, file_content, str(settings_file), config.env_generator_timeout)
+    for match in matches:
+        text = match.group(0)
+        last_n = text.rfind('\n')
+        first_row = text[:last_n] if last_n >= 0 else ''
+        last_row = text[last_n:] if last_n >= 0 else text
+        param_name = last_row[:last_row.find('=') - 1].strip()
+        if exclude_params and param_name in exclude_params:
+            continue
+
+        line += file_content.count('\n', position, match.start() + last_n + 1)
+        position = match.start() + last_n + 1
+        getter, default, required = _parse_declaration(last_row)
+        result.append(SettingsParam(param_name, first_row, str(settings_file), line, getter, default, required))
+
+    return tuple(result)
+
+
+def _format_env_value(param: SettingsParam) -> str:
+    """Формирует строки .env-файла для параметра: комментарий и пустое значение"""
+    return (param.comment + '\n' + param.name + '=' + '\n').lstrip()
 
 
 def _get_settings_values(settings_file, exclude_params: Optional[tuple[str]] = None) -> tuple[str]:
@@ -39,28 +156,64 @@ def _get_settings_values(settings_file, exclude_params: Optional[tuple[str]] = N
     :param exclude_params: tuple[str], optional: Кортеж имен параметров, которые следует исключить из результата
     :return: list[str]: Кортеж строк
     """
-    param_pattern = compile(config.env_generator_pattern, MULTILINE)
+    return tuple(_format_env_value(param) for param in _get_settings_params(settings_file, exclude_params))
 
-    result = []
-    with open(settings_file, mode='r', encoding='utf-8') as py_file:
-        file_content = py_file.read()
 
-        matches = param_pattern.findall(file_content)
+def _find_settings_files(modules_path: str, settings_filename: str = 'settings.py',
+                         sub_modules_path: Optional[str] = None,
+                         include_sub_modules: Optional[tuple[str]] = None, scan_archives: bool = False,
+                         distributions: Optional[Iterable[str]] = None) -> Iterator[Union[str, ArchiveMember]]:
+    """
+    Рекурсивно ищет файлы настроек, учитывая ограничения по поддиректориям
+
+    :param modules_path: str: Корневая директория для поиска
+    :param settings_filename: str, default='settings.py': Имя файла настроек для поиска
+    :param sub_modules_path: str, optional: Специфическая поддиректория для поиска модулей (например, 'modules')
+    :param include_sub_modules: tuple[str], optional: Кортеж имен подмодулей для включения в поиск
+    :param scan_archives: bool, default=False: Искать файлы настроек в zip-архивах и wheel-пакетах \
+    (см. :data:`env_settings.archives.ARCHIVE_SUFFIXES`) без распаковки
+    :param distributions: Iterable[str], optional: Имена установленных дистрибутивов, файлы настроек которых \
+    добавляются после файлов директорий
+    :return: Iterator[str or ArchiveMember]: Пути к файлам настроек или элементы архивов
+    """
+    dirname = Path(modules_path)
+    for root, _, files in walk(dirname, topdown=True):
+        for name in [n for n in files if n == settings_filename or scan_archives and is_archive(n)]:
+            if _is_included_dir(dirname, root, sub_modules_path, include_sub_modules):
+                if name == settings_filename:
+                    yield path.join(path.curdir, root, name)
+                else:
+                    yield from find_archive_settings(path.join(path.curdir, root, name), settings_filename)
+    if distributions:
+        yield from find_distribution_settings(distributions, settings_filename)
+
 
-        for match in matches:
-            last_n = match.rfind('\n')
-            first_row = match[:last_n] if last_n >= 0 else ''
-            last_row = match[last_n:] if last_n >= 0 else match
-            param_name = last_row[:last_row.find('=') - 1].strip()
-            if not exclude_params or param_name not in exclude_params:
-                result.append((first_row + '\n' + param_name + '=' + '\n').lstrip())
+def _is_included_dir(dirname, root, sub_modules_path: Optional[str] = None,
+                     include_sub_modules: Optional[tuple[str]] = None) -> bool:
+    """
+    Проверяет, находится ли директория *root* в разрешенной поддиректории корневой директории *dirname*
 
-    return tuple(result)
+    :param dirname: Корневая директория для поиска
+    :param root: Проверяемая директория
+    :param sub_modules_path: str, optional: Специфическая поддиректория для поиска модулей (например, 'modules')
+    :param include_sub_modules: tuple[str], optional: Кортеж имен подмодулей для включения в поиск
+    :return: bool: True, если директория разрешена
+    """
+    _dirs = [x for x in str(root).split(path.sep) if x not in str(dirname).split(path.sep)]
+    if sub_modules_path and include_sub_modules:
+        if len(_dirs) > 1 and _dirs[0] == sub_modules_path and not _dirs[1] in include_sub_modules:
+            return False
+    elif include_sub_modules:
+        if len(_dirs) > 0 and not _dirs[0] in include_sub_modules:
+            return False
+    return True
 
 
 def generate_env_file(new_env_filename: str, settings_filename: str = 'settings.py', modules_path: str = '.',
                       sub_modules_path: Optional[str] = None, include_sub_modules: Optional[tuple[str]] = None,
-                      exclude_params: Optional[tuple[str]] = None):
+                      exclude_params: Optional[tuple[str]] = None, deduplicate: bool = False,
+                      scan_archives: bool = False, distributions: Optional[Iterable[str]] = None, executor=None,
+                      merge: bool = False, comment_removed: bool = False) -> bool:
     """
     Генерирует .env-файл на основе файлов настроек в указанных директориях.
 
@@ -91,25 +244,468 @@ def generate_env_file(new_env_filename: str, settings_filename: str = 'settings.
     :param include_sub_modules: tuple[str], optional: Кортеж имен подмодулей для включения в поиск
     (например, ('auth', 'payment'))
     :param exclude_params: tuple[str], optional: Кортеж имен параметров для исключения из результата
+    :param deduplicate: bool, default=False: Записывать параметр, объявленный в нескольких файлах настроек, один раз \
+    (используется первое объявление), о конфликтах объявлений сообщать в logger
+    :param scan_archives: bool, default=False: Искать файлы настроек в zip-архивах, wheel-пакетах и zipapp \
+    без распаковки
+    :param distributions: Iterable[str], optional: Имена установленных дистрибутивов для поиска файлов настроек
+    :param executor: SettingsExecutor, optional: Определять параметры выполнением файлов настроек \
+    (см. :class:`env_settings.discovery.SettingsExecutor`) вместо поиска по шаблону
+    :param merge: bool, default=False: Обновлять существующий .env-файл: сохранять заполненные значения, \
+    дописывать новые параметры с комментариями и записывать файл, только если его содержимое изменилось
+    :param comment_removed: bool, default=False: При слиянии закомментировать параметры, отсутствующие \
+    в файлах настроек (кроме *exclude_params*)
+    :return: bool: True, если файл был записан
     """
-    def get_settings(dirname):
-        result_values = []
-        for root, _, files in walk(dirname, topdown=True):
-            for name in [n for n in files if n == settings_filename]:
-                _dirs = [x for x in str(root).split(path.sep) if x not in str(dirname).split(path.sep)]
-                if sub_modules_path and include_sub_modules:
-                    if len(_dirs) > 1 and _dirs[0] == sub_modules_path and not _dirs[1] in include_sub_modules:
-                        continue
-                elif include_sub_modules:
-                    if len(_dirs) > 0 and not _dirs[0] in include_sub_modules:
-                        continue
-                result_values.extend(_get_settings_values(path.join(path.curdir, root, name), exclude_params))
-        return result_values
-
-    settings_values = get_settings(Path(modules_path))
+    if deduplicate or merge:
+        writer = EnvFileWriter(new_env_filename, merge, comment_removed, exclude_params)
+        params = generate_settings_files((), settings_filename, modules_path, sub_modules_path, include_sub_modules,
+                                         exclude_params, deduplicate=deduplicate, scan_archives=scan_archives,
+                                         distributions=distributions, executor=executor)
+        return writer.write(params)
+
+    settings_files = _find_settings_files(modules_path, settings_filename, sub_modules_path, include_sub_modules,
+                                          scan_archives, distributions)
+    if executor is None:
+        settings_values = []
+        for settings_file in settings_files:
+            settings_values.extend(_get_settings_values(settings_file, exclude_params))
+    else:
+        settings_values = [_format_env_value(param)
+                           for param in executor.params(settings_files, modules_path, exclude_params)]
 
     with open(new_env_filename, mode='w', encoding='utf-8') as env_file:
         for index, value in enumerate(settings_values):
             is_last_iteration = (index == len(settings_values) - 1)
             new_line = '\n'
             env_file.write(f"{value}{new_line if not is_last_iteration else ''}")
+    return True
+
+
+# Сравниваемые при поиске конфликтов атрибуты объявлений
+_CONFLICT_FIELDS = ('getter', 'default', 'required')
+
+
+class ParamConflict(NamedTuple):
+    """Конфликт объявлений параметра: различаются значения атрибута *field*"""
+    name: str  # Наименование параметра
+    field: str  # Атрибут объявления (getter, default, required)
+    definitions: tuple[SettingsParam, ...]  # Объявления параметра
+
+    def __str__(self):
+        values = ', '.join(f'{param.source}:{param.line} {getattr(param, self.field)!r}' for param in self.definitions)
+        return f'{self.name}: различается {self.field} ({values})'
+
+
+class ParamIndex:
+    """
+    Индекс параметров по имени
+
+    :example:
+    index = ParamIndex.from_settings(modules_path='src')
+    for conflict in index.conflicts():
+        print(conflict)
+    """
+
+    def __init__(self, params: Iterable[SettingsParam] = ()):
+        """
+        :param params: Iterable[SettingsParam]: Объявления параметров
+        """
+        self._index: dict[str, list[SettingsParam]] = {}
+        self.update(params)
+
+    @classmethod
+    def from_settings(cls, settings_filename: str = 'settings.py', modules_path: str = '.',
+                      sub_modules_path: Optional[str] = None, include_sub_modules: Optional[tuple[str]] = None,
+                      exclude_params: Optional[tuple[str]] = None, scan_archives: bool = False,
+                      distributions: Optional[Iterable[str]] = None) -> 'ParamIndex':
+        """
+        Строит индекс по файлам настроек, параметры поиска соответствуют :func:`generate_env_file`
+
+        :param settings_filename: str, default='settings.py': Имя файла настроек для поиска
+        :param modules_path: str, default='.': Корневая директория для поиска
+        :param sub_modules_path: str, optional: Специфическая поддиректория для поиска модулей (например, 'modules')
+        :param include_sub_modules: tuple[str], optional: Кортеж имен подмодулей для включения в поиск
+        :param exclude_params: tuple[str], optional: Кортеж имен параметров для исключения из результата
+        :param scan_archives: bool, default=False: Искать файлы настроек в zip-архивах без распаковки
+        :param distributions: Iterable[str], optional: Имена установленных дистрибутивов для поиска файлов настроек
+        :return: ParamIndex: Индекс параметров
+        """
+        index = cls()
+        for settings_file in _find_settings_files(modules_path, settings_filename, sub_modules_path,
+                                                  include_sub_modules, scan_archives, distributions):
+            index.update(_get_settings_params(settings_file, exclude_params))
+        return index
+
+    def add(self, param: SettingsParam):
+        """Добавляет объявление параметра"""
+        definitions = self._index.get(param.name)
+        if definitions is None:
+            self._index[param.name] = [param]
+        else:
+            definitions.append(param)
+
+    def update(self, params: Iterable[SettingsParam]):
+        """Добавляет объявления параметров"""
+        for param in params:
+            self.add(param)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def get(self, name: str) -> tuple[SettingsParam, ...]:
+        """
+        Возвращает все объявления параметра в порядке обхода файлов
+
+        :param name: str: Наименование параметра
+        :return: tuple[SettingsParam]: Объявления параметра (пустой кортеж, если параметр не объявлен)
+        """
+        return tuple(self._index.get(name, ()))
+
+    def sources(self, name: str) -> tuple[str, ...]:
+        """
+        Возвращает файлы настроек, в которых объявлен параметр
+
+        :param name: str: Наименование параметра
+        :return: tuple[str]: Файлы настроек без повторов
+        """
+        return tuple(dict.fromkeys(param.source for param in self._index.get(name, ())))
+
+    def params(self) -> tuple[SettingsParam, ...]:
+        """
+        Возвращает по одному (первому) объявлению каждого параметра в порядке обхода файлов
+
+        :return: tuple[SettingsParam]: Объявления параметров без дублей
+        """
+        return tuple(definitions[0] for definitions in self._index.values())
+
+    def duplicates(self) -> dict[str, tuple[SettingsParam, ...]]:
+        """
+        Возвращает параметры, объявленные более одного раза
+
+        :return: dict[str, tuple[SettingsParam]]: Объявления по имени параметра
+        """
+        return {name: tuple(definitions) for name, definitions in self._index.items() if len(definitions) > 1}
+
+    def conflicts(self) -> tuple[ParamConflict, ...]:
+        """
+        Возвращает конфликты объявлений: различные процедуры получения значения (тип),
+        значения по умолчанию или обязательность одного параметра
+
+        :return: tuple[ParamConflict]: Конфликты объявлений
+        """
+        result = []
+        for name, definitions in self._index.items():
+            if len(definitions) < 2:
+                continue
+            for field in _CONFLICT_FIELDS:
+                values = {repr(getattr(param, field)) for param in definitions}
+                if len(values) > 1:
+                    result.append(ParamConflict(name, field, tuple(definitions)))
+        return tuple(result)
+
+
+def _deduplicate_params(params: Iterable[SettingsParam]) -> tuple[SettingsParam, ...]:
+    """
+    Оставляет первое объявление каждого параметра, о конфликтах объявлений сообщает в logger
+
+    :param params: Iterable[SettingsParam]: Объявления параметров
+    :return: tuple[SettingsParam]: Объявления параметров без дублей
+    """
+    index = ParamIndex(params)
+    for conflict in index.conflicts():
+        config.logger.warning(config.messages['warn_conflict'].format(conflict.name, '', str(conflict)))
+    return index.params()
+
+
+class SettingsWriter(ABC):
+    """
+    Базовый писатель файла по параметрам настроек
+
+    Наследники реализуют :meth:`format`, формирующий содержимое файла по набору параметров
+    """
+
+    def __init__(self, filename: str):
+        """
+        :param filename: str: Имя формируемого файла
+        """
+        self.filename = filename
+
+    @abstractmethod
+    def format(self, params: Sequence[SettingsParam]) -> str:
+        """
+        Формирует содержимое файла
+
+        :param params: Sequence[SettingsParam]: Параметры настроек
+        :return: str: Содержимое файла
+        """
+
+    def write(self, params: Sequence[SettingsParam]):
+        """
+        Записывает файл
+
+        :param params: Sequence[SettingsParam]: Параметры настроек
+        """
+        with open(self.filename, mode='w', encoding='utf-8') as file:
+            file.write(self.format(params))
+
+
+# Префикс строк параметров, закомментированных при слиянии .env файла (параметр удален из файлов настроек)
+REMOVED_PREFIX = '# removed: '
+
+_ENV_ASSIGNMENT = compile(r'[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_.-]*)[ \t]*=[ \t]*(.*?)\r?\n?')
+
+
+def _value_end(lines: Sequence[str], index: int, value: str) -> int:
+    """Возвращает индекс последней строки значения в кавычках, начинающегося в строке *index*"""
+    quote, value = value[0], value[1:]
+    while True:
+        position = 0
+        while True:
+            position = value.find(quote, position)
+            if position < 0 or quote == "'" or value[position - 1:position] != '\\':
+                break
+            position += 1
+        if position >= 0 or index + 1 >= len(lines):
+            return index
+        index += 1
+        value = lines[index]
+
+
+def _env_assignments(lines: Sequence[str]) -> Iterator[tuple[str, int, int, bool]]:
+    """
+    Находит присваивания .env файла, в том числе закомментированные с префиксом *REMOVED_PREFIX*
+
+    :param lines: Sequence[str]: Строки .env файла
+    :return: Iterator[tuple[str, int, int, bool]]: Имя параметра, индексы первой и последней строки значения, \
+    признак закомментированного присваивания
+    """
+    removed = [line.startswith(REMOVED_PREFIX) for line in lines]
+    view = [line[len(REMOVED_PREFIX):] if is_removed else line for line, is_removed in zip(lines, removed)]
+    index = 0
+    while index < len(view):
+        match = None if view[index].lstrip().startswith('#') else _ENV_ASSIGNMENT.fullmatch(view[index])
+        if match is None:
+            index += 1
+            continue
+        value = match.group(2)
+        end = _value_end(view, index, value) if value[:1] in ('"', "'") else index
+        yield match.group(1), index, end, removed[index]
+        index = end + 1
+
+
+class EnvFileWriter(SettingsWriter):
+    """
+    Шаблон .env-файла: комментарии и пустые значения параметров
+
+    В режиме слияния (*merge* = *True*) существующий .env файл обновляется: значения и порядок строк сохраняются,
+    новые параметры дописываются в конец файла с комментариями
+    """
+
+    def __init__(self, filename: str, merge: bool = False, comment_removed: bool = False,
+                 keep_params: Optional[tuple[str]] = None):
+        """
+        :param filename: str: Имя формируемого файла
+        :param merge: bool, default=False: Обновлять существующий файл вместо перезаписи
+        :param comment_removed: bool, default=False: При слиянии закомментировать (префикс *REMOVED_PREFIX*) \
+        параметры, отсутствующие в файлах настроек. Параметр, снова появившийся в файлах настроек, \
+        раскомментируется с сохранением значения
+        :param keep_params: tuple[str], optional: Параметры, которые не комментируются при слиянии \
+        (например, исключенные из генерации)
+        """
+        super().__init__(filename)
+        self.merge = merge
+        self.comment_removed = comment_removed
+        self.keep_params = frozenset(keep_params or ())
+
+    def format(self, params: Sequence[SettingsParam]) -> str:
+        return '\n'.join(_format_env_value(param) for param in params)
+
+    def merge_content(self, content: str, params: Sequence[SettingsParam]) -> str:
+        """
+        Формирует содержимое .env файла слиянием существующего содержимого и параметров
+
+        Строки существующего файла индексируются по имени параметра за один проход,
+        добавляемые параметры записываются с переводом строки последней завершенной строки файла
+
+        :param content: str: Содержимое существующего файла
+        :param params: Sequence[SettingsParam]: Параметры настроек
+        :return: str: Содержимое файла
+        """
+        declared = {}
+        for param in params:
+            declared.setdefault(param.name, param)
+        lines = content.splitlines(keepends=True)
+        present = set()
+        for name, start, end, removed in _env_assignments(lines):
+            if name not in declared:
+                if self.comment_removed and not removed and name not in self.keep_params:
+                    lines[start:end + 1] = [REMOVED_PREFIX + line for line in lines[start:end + 1]]
+                continue
+            if removed and name not in present:
+                lines[start:end + 1] = [line[len(REMOVED_PREFIX):] if line.startswith(REMOVED_PREFIX) else line
+                                        for line in lines[start:end + 1]]
+            present.add(name)
+
+        result = ''.join(lines)
+        added = [param for name, param in declared.items() if name not in present]
+        if added:
+            newline = next((line[len(line.rstrip('\r\n')):] for line in reversed(lines)
+                            if line.endswith(('\n', '\r'))), '\n')
+            if result and not result.endswith(('\n', '\r')):
+                result += newline
+            if result.strip():
+                result += newline
+            result += self.format(added).replace('\n', newline)
+        return result
+
+    def write(self, params: Sequence[SettingsParam]) -> bool:
+        """
+        Записывает файл. В режиме слияния файл записывается, только если его содержимое изменилось
+
+        :param params: Sequence[SettingsParam]: Параметры настроек
+        :return: bool: True, если файл был записан
+        """
+        if not self.merge:
+            super().write(params)
+            return True
+        try:
+            with open(self.filename, mode='r', encoding='utf-8', newline='') as file:
+                existing = file.read()
+        except FileNotFoundError:
+            existing = None
+        content = self.format(params) if existing is None else self.merge_content(existing, params)
+        if content == existing:
+            return False
+        with open(self.filename, mode='w', encoding='utf-8', newline='') as file:
+            file.write(content)
+        return True
+
+
+class JsonSchemaWriter(SettingsWriter):
+    """JSON Schema объекта настроек: типы, описания, значения по умолчанию и обязательные параметры"""
+
+    def __init__(self, filename: str, title: Optional[str] = None):
+        """
+        :param filename: str: Имя формируемого файла
+        :param title: str, optional: Заголовок схемы
+        """
+        super().__init__(filename)
+        self.title = title
+
+    def format(self, params: Sequence[SettingsParam]) -> str:
+        properties = {}
+        for param in params:
+            schema = {'type': param.value_type}
+            if param.description:
+                schema['description'] = param.description
+            if param.default is not None:
+                schema['default'] = param.default
+            properties[param.name] = schema
+
+        schema = {'$schema': 'https://json-schema.org/draft/2020-12/schema', 'type': 'object'}
+        if self.title:
+            schema['title'] = self.title
+        schema['properties'] = properties
+        required = [param.name for param in params if param.required]
+        if required:
+            schema['required'] = list(dict.fromkeys(required))
+        return dumps(schema, ensure_ascii=False, indent=2, default=str) + '\n'
+
+
+class ConfigMapWriter(SettingsWriter):
+    """Заготовка Kubernetes ConfigMap: параметры с комментариями и значениями по умолчанию"""
+
+    def __init__(self, filename: str, name: str = 'settings', namespace: Optional[str] = None):
+        """
+        :param filename: str: Имя формируемого файла
+        :param name: str, default='settings': Наименование ConfigMap
+        :param namespace: str, optional: Пространство имен Kubernetes
+        """
+        super().__init__(filename)
+        self.name = name
+        self.namespace = namespace
+
+    def format(self, params: Sequence[SettingsParam]) -> str:
+        rows = ['apiVersion: v1', 'kind: ConfigMap', 'metadata:', f'  name: {self.name}']
+        if self.namespace:
+            rows.append(f'  namespace: {self.namespace}')
+        rows.append('data:')
+        for param in params:
+            rows.extend(f'  # {row}' if row else '  #' for row in param.description.splitlines())
+            value = '' if param.default is None else str(param.default)
+            rows.append(f'  {param.name}: {dumps(value, ensure_ascii=False)}')
+        if not params:
+            rows[-1] = 'data: {}'
+        return '\n'.join(rows) + '\n'
+
+
+class MarkdownWriter(SettingsWriter):
+    """Таблица Markdown с описанием параметров"""
+
+    def format(self, params: Sequence[SettingsParam]) -> str:
+        def cell(value: Any) -> str:
+            return str(value).replace('|', '\\|').replace('\n', '<br>')
+
+        rows = ['| Параметр | Тип | Обязательный | По умолчанию | Описание |', '|---|---|---|---|---|']
+        for param in params:
+            default = '' if param.default is None else f'`{cell(param.default)}`'
+            rows.append(f'| `{param.name}` | {param.value_type} | {"да" if param.required else "нет"} | '
+                        f'{default} | {cell(param.description)} |')
+        return '\n'.join(rows) + '\n'
+
+
+def generate_settings_files(writers: Sequence[SettingsWriter], settings_filename: str = 'settings.py',
+                            modules_path: str = '.', sub_modules_path: Optional[str] = None,
+                            include_sub_modules: Optional[tuple[str]] = None,
+                            exclude_params: Optional[tuple[str]] = None,
+                            deduplicate: bool = False, scan_archives: bool = False,
+                            distributions: Optional[Iterable[str]] = None, executor=None) -> tuple[SettingsParam]:
+    """
+    Формирует несколько файлов по файлам настроек за один обход директорий.
+
+    Директории обходятся и файлы настроек разбираются один раз, полученные параметры передаются
+    всем писателям (например, шаблон .env, JSON Schema, Kubernetes ConfigMap, таблица Markdown)
+
+    :examples:
+    >>> пример вызова\n
+    generate_settings_files(
+                writers=(EnvFileWriter('.env.template'), JsonSchemaWriter('settings.schema.json'),
+                         ConfigMapWriter('configmap.yaml', name='app'), MarkdownWriter('SETTINGS.md')),
+                modules_path='src',
+                exclude_params=('SECRET_KEY',))
+
+    :param writers: Sequence[SettingsWriter]: Писатели формируемых файлов
+    :param settings_filename: str, default='settings.py': Имя файла настроек для поиска
+    :param modules_path: str, default='.': Корневая директория для поиска
+    :param sub_modules_path: str, optional: Специфическая поддиректория для поиска модулей (например, 'modules')
+    :param include_sub_modules: tuple[str], optional: Кортеж имен подмодулей для включения в поиск
+    :param exclude_params: tuple[str], optional: Кортеж имен параметров для исключения из результата
+    :param deduplicate: bool, default=False: Передавать писателям параметр, объявленный в нескольких файлах \
+    настроек, один раз (используется первое объявление), о конфликтах объявлений сообщать в logger
+    :param scan_archives: bool, default=False: Искать файлы настроек в zip-архивах, wheel-пакетах и zipapp \
+    без распаковки
+    :param distributions: Iterable[str], optional: Имена установленных дистрибутивов для поиска файлов настроек
+    :param executor: SettingsExecutor, optional: Определять параметры выполнением файлов настроек \
+    (см. :class:`env_settings.discovery.SettingsExecutor`) вместо поиска по шаблону
+    :return: tuple[SettingsParam]: Найденные параметры
+    """
+    settings_files = _find_settings_files(modules_path, settings_filename, sub_modules_path, include_sub_modules,
+                                          scan_archives, distributions)
+    if executor is None:
+        params = []
+        for settings_file in settings_files:
+            params.extend(_get_settings_params(settings_file, exclude_params))
+    else:
+        params = executor.params(settings_files, modules_path, exclude_params)
+    params = _deduplicate_params(params) if deduplicate else tuple(params)
+
+    for writer in writers:
+        writer.write(params)
+    return params
@@ -0,0 +1,177 @@
+"""
+Подстановка значений переменных окружения в значения вида ${VAR} и ${VAR:-default}
+
+Разбор шаблона значения кешируется, ссылки разрешаются обходом графа зависимостей в глубину
+(в топологическом порядке) с обнаружением циклических ссылок. Результаты подстановки запоминаются
+и используются повторно, пока не изменились исходное значение и значения зависимостей
+"""
+from functools import lru_cache
+from re import compile
+from typing import Callable, Container, Iterable, NamedTuple, Optional, Union
+
+_REFERENCE = compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)(?::-([^}]*))?\}')
+
+
+class InterpolationError(ValueError):
+    """Ошибка подстановки значений (циклическая ссылка)"""
+
+    def __init__(self, name: str, cycle: tuple[str, ...]):
+        super().__init__(name, cycle)
+        self.name = name
+        self.cycle = cycle
+
+    def __str__(self):
+        return f'Циклическая ссылка: {" -> ".join(self.cycle)}'
+
+
+class _Reference(NamedTuple):
+    """Ссылка на переменную в шаблоне значения"""
+    name: str  # Наименование переменной
+    default: str  # Значение, если переменная не задана или пуста
+
+
+class _Template(NamedTuple):
+    """Разобранный шаблон значения"""
+    parts: tuple[Union[str, _Reference], ...]  # Строки и ссылки в порядке следования
+    refs: tuple[str, ...]  # Наименования переменных, на которые ссылается шаблон (без повторов)
+
+
+@lru_cache(maxsize=4096)
+def _parse(value: str) -> _Template:
+    """Разбирает шаблон значения, результат кешируется для каждой строки"""
+    parts, position = [], 0
+    for match in _REFERENCE.finditer(value):
+        if match.start() > position:
+            parts.append(value[position:match.start()])
+        parts.append(_Reference(match.group(1), match.group(2) or ''))
+        position = match.end()
+    if position < len(value):
+        parts.append(value[position:])
+    return _Template(tuple(parts), tuple(dict.fromkeys(part.name for part in parts if isinstance(part, _Reference))))
+
+
+def _render(template: _Template, values: dict[str, Optional[str]]) -> str:
+    return ''.join(part if isinstance(part, str) else values[part.name] or part.default for part in template.parts)
+
+
+class Interpolator:
+    """
+    Подстановка значений переменных в шаблоны ${VAR} и ${VAR:-default}
+
+    Отсутствующая переменная без значения по умолчанию заменяется пустой строкой
+
+    :example:
+    interpolator = Interpolator({'DB_HOST': 'db', 'DB_URL': 'postgres://${DB_HOST}/${DB_NAME:-app}'}.get)
+    interpolator.resolve('DB_URL')  # 'postgres://db/app'
+    """
+
+    def __init__(self, lookup: Callable[[str], Optional[str]], templates: Optional[Container[str]] = None,
+                 previous: Optional[Callable[[str], Optional[str]]] = None):
+        """
+        :param lookup: Callable[[str], str or None]: Функция получения исходного значения переменной по наименованию
+        :param templates: Container[str], optional: Наименования переменных, значения которых являются шаблонами \
+        (по умолчанию все), значения остальных переменных подставляются без изменений
+        :param previous: Callable[[str], str or None], optional: Функция получения предыдущего значения переменной \
+        для ссылки на саму себя (например, PATH=${PATH}:/extra при загрузке .env файла). \
+        По умолчанию ссылка переменной на саму себя - циклическая ссылка
+        """
+        self._lookup = lookup
+        self._templates = templates
+        self._previous = previous
+        # наименование -> (исходное значение, значения зависимостей, результат подстановки)
+        self._memo: dict[str, tuple[Optional[str], tuple, Optional[str]]] = {}
+
+    def _is_template(self, name: str, raw: Optional[str]) -> bool:
+        return bool(raw) and '${' in raw and (self._templates is None or name in self._templates)
+
+    def _evaluate(self, name: str, raw: Optional[str], values: dict[str, Optional[str]]) -> Optional[str]:
+        """Возвращает результат подстановки, запомненный для тех же исходного значения и значений зависимостей"""
+        if not self._is_template(name, raw):
+            return raw
+        template = _parse(raw)
+        if self._previous is not None and name in template.refs:
+            values = {ref: values[ref] for ref in template.refs if ref != name}
+            values[name] = self._previous(name)
+        dependencies = tuple(values[ref] for ref in template.refs)
+        cached = self._memo.get(name)
+        if cached is not None and cached[0] == raw and cached[1] == dependencies:
+            return cached[2]
+        result = _render(template, values)
+        self._memo[name] = (raw, dependencies, result)
+        return result
+
+    def _resolve(self, roots: Iterable[str]) -> dict[str, Optional[str]]:
+        """
+        Разрешает значения переменных *roots* и их зависимостей
+
+        Граф зависимостей обходится в глубину без рекурсии, значение вычисляется после значений всех зависимостей.
+        Ссылка на переменную, обход которой не завершен, означает цикл (кроме ссылки на саму себя,
+        если задана функция получения предыдущего значения)
+
+        :raises InterpolationError: Циклическая ссылка
+        """
+        raws: dict[str, Optional[str]] = {}
+        values: dict[str, Optional[str]] = {}
+        visiting: dict[str, None] = {}
+        for root in roots:
+            stack = [root]
+            while stack:
+                name = stack[-1]
+                if name in values:
+                    stack.pop()
+                    continue
+                if name not in raws:
+                    raws[name] = self._lookup(name)
+                raw = raws[name]
+                refs = _parse(raw).refs if self._is_template(name, raw) else ()
+                if self._previous is not None:
+                    refs = tuple(ref for ref in refs if ref != name)
+                if name not in visiting:
+                    visiting[name] = None
+                    pending = [ref for ref in refs if ref not in values]
+                    for ref in pending:
+                        if ref in visiting:
+                            path = list(visiting)
+                            raise InterpolationError(root, tuple(path[path.index(ref):]) + (ref,))
+                    if pending:
+                        stack.extend(reversed(pending))
+                        continue
+                stack.pop()
+                del visiting[name]
+                values[name] = self._evaluate(name, raw, values)
+        return values
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Возвращает значение переменной *name* с подстановкой значений
+
+        :param name: str: Наименование переменной
+        :return: str or None: Значение или None, если переменная не задана
+        :raises InterpolationError: Циклическая ссылка
+        """
+        return self._resolve((name,))[name]
+
+    def resolve_all(self, names: Iterable[str]) -> dict[str, Optional[str]]:
+        """
+        Возвращает значения переменных *names* с подстановкой значений за один обход графа зависимостей
+
+        :param names: Iterable[str]: Наименования переменных
+        :return: dict[str, str or None]: Значения переменных
+        :raises InterpolationError: Циклическая ссылка
+        """
+        names = tuple(names)
+        values = self._resolve(names)
+        return {name: values[name] for name in names}
+
+    def expand(self, value: Optional[str]) -> Optional[str]:
+        """
+        Подставляет значения переменных в строку *value* (например, значение по умолчанию)
+
+        :param value: str, optional: Шаблон значения
+        :return: str or None: Значение с подстановкой
+        :raises InterpolationError: Циклическая ссылка
+        """
+        if not value or '${' not in value:
+            return value
+        template = _parse(value)
+        return _render(template, self._resolve(template.refs))
@@ -0,0 +1,193 @@
+"""
+Индексы принадлежности значений списку
+
+Для проверок вхождения (списки разрешенных и запрещенных значений) список значений загружается в индекс:
+    - set: хеш-множество, проверка O(1), наибольший расход памяти
+    - sorted: отсортированные значения в одном блоке байт и разреженный список ключей, двоичный поиск O(log n),
+      расход памяти близок к размеру самих значений
+    - bloom: фильтр Блума перед отсортированным индексом, значения, отсутствующие в списке,
+      в большинстве случаев отсекаются без двоичного поиска
+"""
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from math import ceil, log
+from typing import Iterable, Iterator, Optional, Union
+
+from .utils import get_values
+
+# Максимальное количество значений, для которого backend='auto' выбирает хеш-множество
+SET_MAX_SIZE = 1_000_000
+
+MEMBERSHIP_BACKENDS = ('auto', 'set', 'sorted', 'bloom')
+
+_HASH_MASK = (1 << 64) - 1
+
+
+class SetIndex:
+    """Индекс значений на основе хеш-множества"""
+
+    def __init__(self, values: Iterable[str]):
+        """
+        :param values: Iterable[str]: Значения
+        """
+        self._values = frozenset(values)
+
+    def __contains__(self, value) -> bool:
+        return value in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+
+class SortedIndex:
+    """
+    Компактный индекс значений
+
+    Отсортированные значения в кодировке utf-8 хранятся в одном блоке байт, разделенные переводом строки.
+    Каждое BLOCK_SIZE-е значение сохраняется в разреженном списке ключей: поиск выполняется двоичным поиском
+    по разреженному списку (bisect) и поиском значения в блоке байт (bytes.find)
+    """
+    BLOCK_SIZE = 64
+
+    def __init__(self, values: Iterable[str]):
+        """
+        :param values: Iterable[str]: Значения (повторы удаляются, значения не должны содержать перевод строки)
+        """
+        encoded = sorted({value.encode('utf-8') for value in values})
+        if any(b'\n' in value for value in encoded):
+            raise ValueError('Значения индекса не должны содержать перевод строки')
+        self._count = len(encoded)
+        self._keys = encoded[::self.BLOCK_SIZE]
+        self._starts = array('Q', accumulate(
+            (sum(len(value) + 1 for value in encoded[i:i + self.BLOCK_SIZE])
+             for i in range(0, self._count, self.BLOCK_SIZE)), initial=0))
+        self._data = b'\n' + b'\n'.join(encoded) + b'\n' if encoded else b''
+
+    def __contains__(self, value) -> bool:
+        # значение с переводом строки совпало бы с соседними значениями блока
+        if not isinstance(value, str) or '\n' in value:
+            return False
+        key = value.encode('utf-8')
+        block = bisect_right(self._keys, key) - 1
+        if block < 0:
+            return False
+        return self._data.find(b'\n' + key + b'\n', self._starts[block], self._starts[block + 1] + 1) >= 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for value in self._data[1:-1].split(b'\n') if self._count else ():
+            yield str(value, 'utf-8')
+
+
+class BloomIndex:
+    """
+    Фильтр Блума перед индексом значений
+
+    Значение, отсутствующее в фильтре, гарантированно отсутствует в списке. Значения, прошедшие фильтр
+    (доля ложных срабатываний *false_positive_rate*), проверяются по индексу, поэтому результат проверки точный.
+    Позиции битов вычисляются по hash() строки (кешируется в объекте строки), поэтому фильтр действителен
+    только в процессе, в котором он построен
+    """
+
+    def __init__(self, values: Union[Iterable[str], SetIndex, SortedIndex], false_positive_rate: float = 0.01,
+                 hashes: int = 2):
+        """
+        :param values: Iterable[str], SetIndex or SortedIndex: Значения или индекс значений \
+        (значения загружаются в :class:`SortedIndex`)
+        :param false_positive_rate: float, default=0.01: Доля ложных срабатываний фильтра (от 0 до 1)
+        :param hashes: int, default=2: Количество хеш-функций. Меньшее количество (чем оптимальное для размера \
+        фильтра) ускоряет проверку ценой большего размера фильтра: для 0.01 и 2 функций - около 19 бит на значение
+        """
+        if not 0 < false_positive_rate < 1:
+            raise ValueError('false_positive_rate должен быть в интервале (0, 1)')
+        if hashes < 1:
+            raise ValueError('hashes должен быть больше 0')
+        self._index = values if isinstance(values, (SetIndex, SortedIndex)) else SortedIndex(values)
+        count = max(len(self._index), 1)
+        self._size = max(ceil(-hashes * count / log(1 - false_positive_rate ** (1 / hashes))), 64)
+        self._hashes = hashes
+        bits = self._bits = bytearray((self._size + 7) // 8)
+        size, hashes = self._size, self._hashes
+        for value in self._index:
+            first = hash(value) & _HASH_MASK
+            second = (first >> 32) | 1
+            for i in range(hashes):
+                position = (first + i * second) % size
+                bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, value: str) -> bool:
+        """
+        Проверяет значение только по фильтру
+
+        :param value: str: Значение
+        :return: bool: False, если значение отсутствует в списке, True - если значение может присутствовать
+        """
+        bits, size = self._bits, self._size
+        first = hash(value) & _HASH_MASK
+        second = (first >> 32) | 1
+        for i in range(self._hashes):
+            position = (first + i * second) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __contains__(self, value) -> bool:
+        return isinstance(value, str) and self.might_contain(value) and value in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+
+MembershipIndex = Union[SetIndex, SortedIndex, BloomIndex]
+
+
+def membership_index(values: Iterable[str], backend: str = 'auto',
+                     false_positive_rate: float = 0.01) -> MembershipIndex:
+    """
+    Загружает значения в индекс принадлежности
+
+    :param values: Iterable[str]: Значения
+    :param backend: str, default='auto': Тип индекса: set, sorted, bloom или auto - set для списков до \
+    SET_MAX_SIZE значений, иначе bloom
+    :param false_positive_rate: float, default=0.01: Доля ложных срабатываний фильтра Блума (для bloom)
+    :return: MembershipIndex: Индекс значений
+    """
+    if backend not in MEMBERSHIP_BACKENDS:
+        raise ValueError(f'Недопустимый тип индекса: {backend}. Допустимые значения: {MEMBERSHIP_BACKENDS}')
+    if backend == 'auto':
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        backend = 'set' if len(values) <= SET_MAX_SIZE else 'bloom'
+    if backend == 'set':
+        return SetIndex(values)
+    if backend == 'sorted':
+        return SortedIndex(values)
+    return BloomIndex(values, false_positive_rate)
+
+
+def get_values_index(value: str, default_value: Optional[str] = None, separator: str = ',', backend: str = 'auto',
+                     false_positive_rate: float = 0.01) -> MembershipIndex:
+    """
+    Аналог :func:`env_settings.utils.get_values`, возвращающий индекс принадлежности значений
+
+    :example:
+    DENY_LIST = get_values_index(get_str_env_param('DENY_LIST'), backend='sorted')
+    if object_id in DENY_LIST:
+        ...
+
+    :param value: str: Значение (путь к файлу или значения, разделенные *separator*)
+    :param default_value: str, optional: Значение по умолчанию
+    :param separator: str, default=',': Разделитель значений
+    :param backend: str, default='auto': Тип индекса (см. :func:`membership_index`)
+    :param false_positive_rate: float, default=0.01: Доля ложных срабатываний фильтра Блума (для bloom)
+    :return: MembershipIndex: Индекс значений
+    """
+    return membership_index(get_values(value, default_value, separator), backend, false_positive_rate)
@@ -0,0 +1,189 @@
+"""
+Групповое чтение переменных окружения по префиксу
+
+Переменные с заданным префиксом (пространством имен) возвращаются вложенным словарем, ключи которого
+разделены разделителем (например, DB_PRIMARY__HOST, DB_PRIMARY__PORT -> {'HOST': ..., 'PORT': ...}).
+:func:`get_env_namespace` читает значения при каждом вызове так же, как процедуры получения значений
+(окружение арендатора, дополнительные источники, подстановка ${VAR}), :class:`EnvIndex` считывает
+переменные окружения один раз в отсортированный индекс и находит группу двоичным поиском.
+Значения преобразуются по правилам процедур получения значений
+"""
+from bisect import bisect_left
+from enum import Enum
+from fnmatch import fnmatchcase
+from os import environ
+from typing import Any, Callable, Iterable, Mapping, Optional, Union
+
+from .config import config
+from .converters import compile_converter
+from .utils import _clean_value, _environment, _to_bool, _to_converted, _to_float, _to_int, get_str_env_param
+
+Converter = Union[str, type[Enum], Callable[[str], Any]]
+
+
+def _compile_value_converter(converter: Converter) -> Callable[[str, Optional[str]], Any]:
+    """
+    Возвращает функцию преобразования значения параметра по правилам процедур получения значений
+
+    :param converter: str, Enum or Callable: str, int, float, bool, наименование зарегистрированного преобразователя, \
+    класс перечисления или функция преобразования
+    :return: Callable[[str, str or None], Any]: Функция (наименование параметра, значение) -> значение
+    """
+    if converter == 'str':
+        return lambda name, value: value
+    if converter == 'int':
+        return _to_int
+    if converter == 'float':
+        return _to_float
+    if converter == 'bool':
+        return lambda name, value: _to_bool(value)
+    pipeline = compile_converter(converter)
+    return lambda name, value: None if value is None else _to_converted(name, value, pipeline)
+
+
+class EnvIndex:
+    """
+    Индекс переменных окружения для чтения групп переменных по префиксу
+
+    Переменные считываются при создании индекса (и при вызове :meth:`refresh`), поиск группы выполняется
+    двоичным поиском по отсортированным именам без повторных обращений к окружению
+
+    :example:
+    index = EnvIndex()
+    primary = index.namespace('DB_PRIMARY', types={'PORT': 'int'})  # {'HOST': 'db1', 'PORT': 5432}
+    replicas = index.namespace('DB_REPLICA', types={'*__PORT': 'int'})  # {'0': {'HOST': ..., 'PORT': ...}, ...}
+    """
+
+    def __init__(self, env: Optional[Mapping[str, str]] = None):
+        """
+        :param env: Mapping[str, str], optional: Переменные окружения (по умолчанию os.environ)
+        """
+        self._env = environ if env is None else env
+        self._values: dict[str, str] = {}
+        self._names: list[str] = []
+        self.refresh()
+
+    def refresh(self):
+        """Повторно считывает переменные окружения"""
+        self._values = dict(self._env)
+        self._names = sorted(self._values)
+
+    def names(self, prefix: str = '') -> list[str]:
+        """
+        Возвращает отсортированные имена переменных окружения, начинающиеся с *prefix*
+
+        :param prefix: str, default='': Префикс
+        :return: list[str]: Имена переменных
+        """
+        if not prefix:
+            return list(self._names)
+        start = bisect_left(self._names, prefix)
+        stop = bisect_left(self._names, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+        return self._names[start:stop]
+
+    def namespace(self, prefix: str, delimiter: str = '__', types: Optional[Mapping[str, Converter]] = None,
+                  default_type: Converter = 'str', lowercase: bool = False) -> dict[str, Any]:
+        """
+        Возвращает переменные окружения пространства имен *prefix* вложенным словарем
+
+        В пространство имен входят переменные *prefix* + *delimiter* + ключ, ключ разделяется *delimiter*
+        на уровни вложенности. Значения очищаются от пробельных символов (пустые значения - None)
+        и преобразуются по *types*. Если ключ является одновременно значением и группой (A__B и A__B__C),
+        значение сохраняется в группе с пустым ключом
+
+        :param prefix: str: Префикс пространства имен (например, 'DB_PRIMARY')
+        :param delimiter: str, default='__': Разделитель уровней
+        :param types: Mapping[str, Converter], optional: Типы значений по ключам относительно префикса (уровни \
+        разделяются *delimiter*, допускаются шаблоны fnmatch, например '*__PORT'): str, int, float, bool, \
+        наименование зарегистрированного преобразователя, класс перечисления или функция преобразования
+        :param default_type: Converter, default='str': Тип значений, не указанных в *types*
+        :param lowercase: bool, default=False: Переводить ключи в нижний регистр
+        :return: dict[str, Any]: Вложенный словарь значений
+        """
+        return _build_namespace(self.names(prefix + delimiter), len(prefix + delimiter),
+                                lambda name: _clean_value(self._values[name]), delimiter, types, default_type,
+                                lowercase)
+
+
+def _build_namespace(names: Iterable[str], skip: int, read: Callable[[str], Optional[str]], delimiter: str,
+                     types: Optional[Mapping[str, Converter]], default_type: Converter,
+                     lowercase: bool) -> dict[str, Any]:
+    """
+    Формирует вложенный словарь значений переменных пространства имен
+
+    :param names: Iterable[str]: Отсортированные имена переменных пространства имен
+    :param skip: int: Длина префикса пространства имен с разделителем
+    :param read: Callable[[str], str or None]: Функция получения очищенного значения переменной
+    :return: dict[str, Any]: Вложенный словарь значений (см. :meth:`EnvIndex.namespace`)
+    """
+    exact, patterns = {}, []
+    for key, converter in (types or {}).items():
+        if any(char in key for char in '*?['):
+            patterns.append((key, _compile_value_converter(converter)))
+        else:
+            exact[key] = _compile_value_converter(converter)
+    default_converter = _compile_value_converter(default_type)
+
+    result: dict[str, Any] = {}
+    for name in names:
+        key = name[skip:]
+        converter = exact.get(key)
+        if converter is None:
+            converter = next((func for pattern, func in patterns if fnmatchcase(key, pattern)), default_converter)
+        value = converter(name, read(name))
+
+        *parents, leaf = (key.lower() if lowercase else key).split(delimiter)
+        node = result
+        for part in parents:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {} if child is None and part not in node else {'': child}
+            node = child
+        if isinstance(node.get(leaf), dict):
+            node[leaf][''] = value
+        else:
+            node[leaf] = value
+    return result
+
+
+def _environment_names() -> set[str]:
+    """
+    Имена переменных текущего окружения (окружение арендатора или os.environ) и дополнительных источников
+    значений *config.sources*, у которых есть метод keys()
+    """
+    environment = _environment.get()
+    names = set(environ if environment is None else environment)
+    for source in config.sources:
+        keys = getattr(source, 'keys', None)
+        if callable(keys):
+            names.update(keys())
+    return names
+
+
+def get_env_namespace(prefix: str, delimiter: str = '__', types: Optional[Mapping[str, Converter]] = None,
+                      default_type: Converter = 'str', lowercase: bool = False,
+                      refresh: bool = False) -> dict[str, Any]:
+    """
+    Возвращает переменные окружения пространства имен *prefix* вложенным словарем (см. :meth:`EnvIndex.namespace`)
+
+    Имена и значения переменных читаются при каждом вызове так же, как процедурой
+    :func:`env_settings.utils.get_str_env_param`: из окружения арендатора (см. :mod:`env_settings.tenants`)
+    или os.environ, из дополнительных источников *config.sources* (имена - у источников с методом keys())
+    и с подстановкой ${VAR} (если включена *config.interpolate*)
+
+    :example:
+    DB_PRIMARY = get_env_namespace('DB_PRIMARY', types={'PORT': 'int', 'TIMEOUT': 'duration'})
+
+    :param prefix: str: Префикс пространства имен
+    :param delimiter: str, default='__': Разделитель уровней
+    :param types: Mapping[str, Converter], optional: Типы значений по ключам относительно префикса
+    :param default_type: Converter, default='str': Тип значений, не указанных в *types*
+    :param lowercase: bool, default=False: Переводить ключи в нижний регистр
+    :param refresh: bool, default=False: Не используется (значения читаются при каждом вызове), \
+    оставлен для совместимости
+    :return: dict[str, Any]: Вложенный словарь значений
+    """
+    namespace_prefix = prefix + delimiter
+    names = sorted(name for name in _environment_names() if name.startswith(namespace_prefix))
+    return _build_namespace(names, len(namespace_prefix), get_str_env_param, delimiter, types, default_type,
+                            lowercase)
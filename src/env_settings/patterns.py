@@ -0,0 +1,359 @@
+"""
+Безопасное применение шаблона поиска параметров генератора .env файлов
+
+Шаблон проверяется на конструкции с катастрофическим возвратом (вложенные квантификаторы без однозначного
+разделителя повторений, повторение альтернатив с общим началом) и с полиномиальным возвратом (соседние
+неограниченные повторения с общими символами, например .*.*) и компилируется один раз.
+Файл настроек разбирается ограниченными фрагментами по границам объявлений верхнего уровня
+(комментарии и одно объявление), после каждого фрагмента проверяется бюджет времени разбора файла
+"""
+from functools import lru_cache
+from re import DOTALL, MULTILINE, Pattern, compile, error
+from time import monotonic
+from typing import Iterator, Match, Optional
+
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
+# Максимальное количество строк во фрагменте разбора
+CHUNK_MAX_LINES = 100
+
+# Символы, по которым проверяется пересечение наборов символов шаблона
+_PROBE = tuple(chr(code) for code in range(128)) + ('\u00a0', '\u2028', '\u0660', '\u00e9', '\u0416', '\uffff')
+_SPACE = frozenset(char for char in _PROBE if char.isspace())
+_DIGIT = frozenset(char for char in _PROBE if char.isdigit())
+_WORD = frozenset(char for char in _PROBE if char.isalnum() or char == '_')
+_LINEBREAK = frozenset('\n')
+_ALL = frozenset(_PROBE)
+_CATEGORIES = {'SPACE': _SPACE, 'DIGIT': _DIGIT, 'WORD': _WORD, 'LINEBREAK': _LINEBREAK}
+_REPEATS = ('MAX_REPEAT', 'MIN_REPEAT')
+# Однострочные строковые литералы (скобки и символ # внутри них не учитываются)
+_STRING = compile(r"'[^'\\\n]*(?:\\.[^'\\\n]*)*'|\"[^\"\\\n]*(?:\\.[^\"\\\n]*)*\"")
+
+
+class PatternError(ValueError):
+    """Небезопасный или некорректный шаблон, либо превышение времени разбора файла"""
+
+
+def _category(code) -> frozenset:
+    name = str(code).replace('CATEGORY_', '').replace('UNI_', '').replace('LOC_', '')
+    if name.startswith('NOT_'):
+        return _ALL - _CATEGORIES.get(name[4:], frozenset())
+    return _CATEGORIES.get(name, _ALL)
+
+
+def _dotall(value: tuple, dotall: bool) -> bool:
+    """Действие флага DOTALL внутри группы с локальными флагами ((?s:...), (?-s:...))"""
+    add_flags, del_flags = (value[1], value[2]) if len(value) == 4 else (0, 0)
+    return bool(add_flags & DOTALL) or (dotall and not del_flags & DOTALL)
+
+
+def _charset(op: str, value, dotall: bool = False) -> frozenset:
+    """Символы (из проверочного набора), которые может поглотить элемент шаблона (. без DOTALL - кроме \\n)"""
+    if op == 'LITERAL':
+        return frozenset((chr(value),))
+    if op == 'NOT_LITERAL':
+        return _ALL - {chr(value)}
+    if op == 'IN':
+        result, negate = set(), False
+        for item_op, item_value in value:
+            item_op = str(item_op)
+            if item_op == 'NEGATE':
+                negate = True
+            elif item_op == 'LITERAL':
+                result.add(chr(item_value))
+            elif item_op == 'RANGE':
+                result.update(char for char in _PROBE if item_value[0] <= ord(char) <= item_value[1])
+            elif item_op == 'CATEGORY':
+                result.update(_category(item_value))
+            else:
+                result.update(_ALL)
+        return _ALL - result if negate else frozenset(result)
+    if op == 'ANY' and not dotall:
+        return _ALL - _LINEBREAK
+    return _ALL
+
+
+def _consumed(items, dotall: bool = False) -> frozenset:
+    """Все символы, которые может поглотить последовательность элементов шаблона"""
+    result = set()
+    for op, value in items:
+        op = str(op)
+        if op in ('AT', 'ASSERT', 'ASSERT_NOT'):
+            continue
+        if op in _REPEATS or op == 'POSSESSIVE_REPEAT':
+            result.update(_consumed(value[2], dotall))
+        elif op == 'SUBPATTERN':
+            result.update(_consumed(value[-1], _dotall(value, dotall)))
+        elif op == 'ATOMIC_GROUP':
+            result.update(_consumed(value, dotall))
+        elif op == 'BRANCH':
+            for branch in value[1]:
+                result.update(_consumed(branch, dotall))
+        elif op == 'GROUPREF_EXISTS':
+            result.update(_consumed(value[1], dotall))
+            if value[2]:
+                result.update(_consumed(value[2], dotall))
+        elif op in ('LITERAL', 'NOT_LITERAL', 'IN', 'ANY'):
+            result.update(_charset(op, value, dotall))
+        else:
+            result.update(_ALL)
+    return frozenset(result)
+
+
+def _mandatory(items, dotall: bool = False) -> list[frozenset]:
+    """Наборы символов элементов, которые обязательно поглощаются при каждом совпадении последовательности"""
+    result = []
+    for op, value in items:
+        op = str(op)
+        if op in ('LITERAL', 'NOT_LITERAL', 'IN', 'ANY'):
+            result.append(_charset(op, value, dotall))
+        elif op in _REPEATS + ('POSSESSIVE_REPEAT',) and value[0] >= 1:
+            result.extend(_mandatory(value[2], dotall))
+        elif op == 'SUBPATTERN':
+            result.extend(_mandatory(value[-1], _dotall(value, dotall)))
+        elif op == 'ATOMIC_GROUP':
+            result.extend(_mandatory(value, dotall))
+    return result
+
+
+def _first(items, dotall: bool = False) -> frozenset:
+    """Символы, с которых может начинаться совпадение последовательности"""
+    result = set()
+    for op, value in items:
+        op = str(op)
+        if op in ('AT', 'ASSERT', 'ASSERT_NOT'):
+            continue
+        if op in ('LITERAL', 'NOT_LITERAL', 'IN', 'ANY'):
+            return frozenset(result | _charset(op, value, dotall))
+        if op in _REPEATS + ('POSSESSIVE_REPEAT',):
+            result.update(_first(value[2], dotall))
+            if value[0] >= 1:
+                return frozenset(result)
+        elif op == 'SUBPATTERN':
+            result.update(_first(value[-1], _dotall(value, dotall)))
+            if _mandatory(value[-1]):
+                return frozenset(result)
+        elif op == 'BRANCH':
+            for branch in value[1]:
+                result.update(_first(branch, dotall))
+        else:
+            return frozenset(result | _ALL)
+    return frozenset(result)
+
+
+def _last(items, dotall: bool = False) -> frozenset:
+    """Символы, которыми может заканчиваться совпадение последовательности"""
+    result = set()
+    for op, value in reversed(list(items)):
+        op = str(op)
+        if op in ('AT', 'ASSERT', 'ASSERT_NOT'):
+            continue
+        if op in ('LITERAL', 'NOT_LITERAL', 'IN', 'ANY'):
+            return frozenset(result | _charset(op, value, dotall))
+        if op in _REPEATS + ('POSSESSIVE_REPEAT',):
+            result.update(_last(value[2], dotall))
+            if value[0] >= 1:
+                return frozenset(result)
+        elif op == 'SUBPATTERN':
+            result.update(_last(value[-1], _dotall(value, dotall)))
+            if _mandatory(value[-1]):
+                return frozenset(result)
+        elif op == 'BRANCH':
+            for branch in value[1]:
+                result.update(_last(branch, dotall))
+        else:
+            return frozenset(result | _ALL)
+    return frozenset(result)
+
+
+def _sequence(items, dotall: bool = False) -> Iterator[tuple]:
+    """Элементы последовательности с раскрытием групп и действие DOTALL для каждого элемента"""
+    for op, value in items:
+        op = str(op)
+        if op == 'SUBPATTERN':
+            yield from _sequence(value[-1], _dotall(value, dotall))
+        else:
+            yield op, value, dotall
+
+
+def _check_adjacent(items, pattern: str, dotall: bool = False):
+    """
+    Проверяет последовательность на соседние неограниченные повторения с общими символами
+
+    Повторения соседние, если между ними нет элементов, обязательно поглощающих символ. Если первое повторение
+    может закончиться символом, с которого может начаться второе, строка делится между ними множеством
+    способов (k таких повторений - O(n ** k) шагов возврата на строке длины n)
+    """
+    previous = None
+    for op, value, item_dotall in _sequence(items, dotall):
+        if op in ('AT', 'ASSERT', 'ASSERT_NOT'):
+            continue
+        if op in _REPEATS and value[1] == _sre_parse.MAXREPEAT:
+            if previous and previous & _first(value[2], item_dotall):
+                raise PatternError(f'Небезопасный шаблон {pattern!r}: соседние неограниченные повторения '
+                                   f'с общими символами (полиномиальный возврат)')
+            previous = _last(value[2], item_dotall)
+        elif op in ('POSSESSIVE_REPEAT', 'ATOMIC_GROUP') or _mandatory(((op, value),), item_dotall) or (
+                op == 'BRANCH' and all(_mandatory(branch) for branch in value[1])):
+            previous = None
+
+
+def _inner_repeats(items) -> Iterator[tuple]:
+    """Вложенные повторения с неограниченным (или большим) количеством повторов"""
+    for op, value in items:
+        op = str(op)
+        if op in _REPEATS + ('POSSESSIVE_REPEAT',):
+            if value[1] > 1:
+                yield value
+            yield from _inner_repeats(value[2])
+        elif op == 'SUBPATTERN':
+            yield from _inner_repeats(value[-1])
+        elif op == 'ATOMIC_GROUP':
+            yield from _inner_repeats(value)
+        elif op == 'BRANCH':
+            for branch in value[1]:
+                yield from _inner_repeats(branch)
+
+
+def _branches(items, follow: list, dotall: bool = False) -> Iterator[tuple]:
+    """Альтернативы тела повторения (без вложенных повторений), элементы, следующие за ними, и действие DOTALL"""
+    items = list(items)
+    for index, (op, value) in enumerate(items):
+        op = str(op)
+        if op == 'BRANCH':
+            yield value[1], items[index + 1:] + follow, dotall
+        elif op == 'SUBPATTERN':
+            yield from _branches(value[-1], items[index + 1:] + follow, _dotall(value, dotall))
+
+
+def _check_items(items, pattern: str, dotall: bool = False):
+    """Рекурсивно проверяет элементы шаблона на конструкции с катастрофическим и полиномиальным возвратом"""
+    for op, value in items:
+        op = str(op)
+        if op in _REPEATS:
+            body = value[2]
+            if value[1] > 1:
+                inner = list(_inner_repeats(body))
+                if inner:
+                    inner_chars = frozenset().union(*(_consumed(repeat[2], dotall) for repeat in inner))
+                    if not any(not (separator & inner_chars) for separator in _mandatory(body, dotall)):
+                        raise PatternError(f'Небезопасный шаблон {pattern!r}: вложенные квантификаторы без '
+                                           f'однозначного разделителя повторений (катастрофический возврат)')
+                for alternatives, follow, branch_dotall in _branches(body, list(body), dotall):
+                    firsts = [_first(list(branch) + follow, branch_dotall) for branch in alternatives]
+                    for i, first in enumerate(firsts):
+                        if any(first & other for other in firsts[i + 1:]):
+                            raise PatternError(f'Небезопасный шаблон {pattern!r}: повторение альтернатив '
+                                               f'с общим началом (катастрофический возврат)')
+            _check_items(body, pattern, dotall)
+        elif op == 'POSSESSIVE_REPEAT':
+            _check_items(value[2], pattern, dotall)
+        elif op == 'SUBPATTERN':
+            _check_items(value[-1], pattern, _dotall(value, dotall))
+        elif op in ('ATOMIC_GROUP', 'ASSERT', 'ASSERT_NOT'):
+            _check_items(value if op == 'ATOMIC_GROUP' else value[1], pattern, dotall)
+        elif op == 'BRANCH':
+            for branch in value[1]:
+                _check_items(branch, pattern, dotall)
+    _check_adjacent(items, pattern, dotall)
+
+
+def check_pattern(pattern: str):
+    """
+    Проверяет шаблон на конструкции с катастрофическим и полиномиальным возвратом
+
+    Отклоняются:
+        - повторения, содержащие вложенные повторения, если у повторения нет обязательного символа-разделителя,
+          который не может поглотить ни одно вложенное повторение (например, (\\s*#.*\\s*[\\r\\n]+)*)
+        - повторения альтернатив, которые могут начинаться с одного символа (например, (a|aa)*)
+        - соседние неограниченные повторения, между которыми нет обязательного символа, если первое может
+          закончиться символом, с которого может начаться второе (например, .*.* или \\s*.*)
+
+    Символ . без флага DOTALL не поглощает перевод строки (шаблон (?:#.*\n)*X безопасен)
+
+    :param pattern: str: Регулярное выражение
+    :raises PatternError: Шаблон некорректен или небезопасен
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, MULTILINE)
+    except error as e:
+        raise PatternError(f'Некорректный шаблон {pattern!r}: {e}') from None
+    state = getattr(parsed, 'state', None) or parsed.pattern  # Python < 3.11: parsed.pattern
+    _check_items(list(parsed), pattern, bool(state.flags & DOTALL))
+
+
+@lru_cache(maxsize=32)
+def compile_pattern(pattern: str) -> Pattern:
+    """
+    Проверяет (см. :func:`check_pattern`) и компилирует шаблон поиска параметров (флаг MULTILINE)
+
+    Результат кешируется, каждый шаблон проверяется и компилируется один раз
+
+    :param pattern: str: Регулярное выражение
+    :return: Pattern: Скомпилированный шаблон
+    """
+    check_pattern(pattern)
+    return compile(pattern, MULTILINE)
+
+
+def _is_statement_end(line: str, depth: int) -> tuple[bool, int]:
+    """Определяет, завершает ли строка объявление верхнего уровня, и глубину вложенности скобок после нее"""
+    stripped = line.strip()
+    if not stripped or stripped.startswith('#'):
+        return False, depth
+    code = _STRING.sub('', stripped).split('#', 1)[0].rstrip()
+    depth = max(depth + sum(code.count(char) for char in '([{') - sum(code.count(char) for char in ')]}'), 0)
+    return depth == 0 and not code.endswith('\\'), depth
+
+
+def iter_chunks(content: str, max_lines: int = CHUNK_MAX_LINES) -> Iterator[tuple[int, int]]:
+    """
+    Делит содержимое файла на фрагменты: строки комментариев и пустые строки, за которыми следует
+    одно объявление верхнего уровня (с учетом скобок и переноса строки символом \\)
+
+    Фрагмент ограничен *max_lines* строками, более длинные блоки комментариев делятся на несколько фрагментов
+
+    :param content: str: Содержимое файла
+    :param max_lines: int, default=CHUNK_MAX_LINES: Максимальное количество строк во фрагменте
+    :return: Iterator[tuple[int, int]]: Позиции начала и конца фрагментов
+    """
+    start = position = lines = depth = 0
+    length = len(content)
+    while position < length:
+        end = content.find('\n', position)
+        end = length if end < 0 else end + 1
+        is_end, depth = _is_statement_end(content[position:end], depth)
+        position, lines = end, lines + 1
+        if is_end or lines >= max_lines:
+            # Перевод строки относится к следующему фрагменту, как и при поиске по всему содержимому
+            stop = position - 1 if content[position - 1] == '\n' else position
+            yield start, stop
+            start, lines, depth = stop, 0, 0
+    if start < length:
+        yield start, length
+
+
+def find_matches(regex: Pattern, content: str, filename: str = '',
+                 timeout: Optional[float] = None) -> Iterator[Match]:
+    """
+    Находит совпадения шаблона в содержимом файла по фрагментам (см. :func:`iter_chunks`)
+
+    Позиции совпадений соответствуют позициям во всем содержимом. Совпадения, выходящие за границы фрагмента
+    (например, объявление, занимающее несколько объявлений верхнего уровня), не находятся
+
+    :param regex: Pattern: Скомпилированный шаблон
+    :param content: str: Содержимое файла
+    :param filename: str, default='': Имя файла для сообщения об ошибке
+    :param timeout: float, optional: Бюджет времени разбора файла в секундах
+    :return: Iterator[Match]: Совпадения
+    :raises PatternError: Превышен бюджет времени разбора файла
+    """
+    deadline = monotonic() + timeout if timeout else None
+    for start, end in iter_chunks(content):
+        yield from regex.finditer(content, start, end)
+        if deadline is not None and monotonic() > deadline:
+            raise PatternError(f'Превышено время разбора файла {filename} ({timeout} с) шаблоном {regex.pattern!r}. '
+                               f'Упростите шаблон env_generator_pattern или увеличьте env_generator_timeout')
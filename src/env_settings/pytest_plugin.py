@@ -0,0 +1,171 @@
+"""
+Плагин pytest для изоляции переменных окружения и конфигурации модуля
+
+Снимок os.environ и конфигурации сохраняется перед тестом и восстанавливается после него: изменяются
+только переменные, отличающиеся от снимка, конфигурация восстанавливается заменой ссылки на неизменяемый снимок.
+Модули настроек перезагружаются выполнением кешированного байт-кода в пространстве имен модуля
+без повторного поиска, чтения и компиляции файла.
+
+Плагин подключается автоматически после установки пакета (entry point pytest11).
+Фикстуры: env_snapshot, env_params, settings_reloader. Маркер: env_params(**params).
+Параметр ini env_settings_isolation = true включает изоляцию для всех тестов
+"""
+import sys
+from importlib import import_module
+from os import environ, stat
+from types import CodeType, ModuleType
+from typing import Any, Callable, MutableMapping, Optional, Union
+
+import pytest
+
+from .config import config as settings_config
+
+_code_cache: dict[str, tuple[int, CodeType]] = {}
+
+
+def _raw_env(env: MutableMapping[str, str]) -> dict:
+    """Словарь закодированных значений os.environ (сравнивается и копируется без декодирования) или сам словарь"""
+    return getattr(env, '_data', env)
+
+
+class EnvSnapshot:
+    """
+    Снимок переменных окружения и конфигурации модуля
+
+    :example:
+    snapshot = EnvSnapshot()
+    environ['DEBUG'] = '1'
+    configure(error_handling='ignore')
+    snapshot.restore()  # DEBUG и конфигурация восстановлены
+    """
+
+    def __init__(self, env: Optional[MutableMapping[str, str]] = None):
+        """
+        :param env: MutableMapping[str, str], optional: Переменные окружения (по умолчанию os.environ)
+        """
+        self._env = environ if env is None else env
+        self._saved = dict(_raw_env(self._env))
+        self._config = settings_config.snapshot()
+
+    def restore(self):
+        """Восстанавливает переменные окружения (изменяются только отличающиеся переменные) и конфигурацию"""
+        env, saved = self._env, self._saved
+        raw = _raw_env(env)
+        if raw != saved:
+            decode_key = getattr(env, 'decodekey', str)
+            decode_value = getattr(env, 'decodevalue', str)
+            for key in [key for key in raw if key not in saved]:
+                del env[decode_key(key)]
+            for key, value in saved.items():
+                if raw.get(key) != value:
+                    env[decode_key(key)] = decode_value(value)
+        settings_config.restore(self._config)
+
+
+def set_env_params(params: Optional[dict[str, Any]] = None, **kwargs: Any):
+    """
+    Устанавливает несколько переменных окружения
+
+    :param params: dict[str, Any], optional: Значения переменных (приводятся к строке, None - удалить переменную)
+    :param kwargs: Значения переменных
+    """
+    for name, value in {**(params or {}), **kwargs}.items():
+        if value is None:
+            environ.pop(name, None)
+        else:
+            environ[name] = str(value)
+
+
+def _get_module(module: Union[ModuleType, str]) -> ModuleType:
+    return module if isinstance(module, ModuleType) else sys.modules.get(module) or import_module(module)
+
+
+def reload_settings(module: Union[ModuleType, str]) -> ModuleType:
+    """
+    Повторно выполняет модуль настроек в его пространстве имен
+
+    Байт-код модуля кешируется по имени файла и времени изменения, поэтому в отличие от importlib.reload
+    файл не ищется, не читается и не компилируется повторно. Значения, импортированные из модуля
+    в другие модули (from settings import X), не обновляются
+
+    :param module: ModuleType or str: Модуль настроек или его имя (не импортированный модуль импортируется)
+    :return: ModuleType: Модуль настроек
+    """
+    if isinstance(module, str) and module not in sys.modules:
+        return import_module(module)
+    module = _get_module(module)
+    filename = module.__file__
+    mtime = stat(filename).st_mtime_ns
+    cached = _code_cache.get(filename)
+    if cached is None or cached[0] != mtime:
+        with open(filename, 'rb') as file:
+            cached = _code_cache[filename] = (mtime, compile(file.read(), filename, 'exec', dont_inherit=True))
+    exec(cached[1], module.__dict__)
+    return module
+
+
+def pytest_addoption(parser):
+    parser.addini('env_settings_isolation', type='bool', default=False,
+                  help='env_settings: восстанавливать переменные окружения и конфигурацию после каждого теста')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'env_params(params=None, **kwargs): env_settings: переменные окружения '
+                                       'теста, восстанавливаются после теста')
+
+
+@pytest.fixture(autouse=True)
+def _env_settings_isolation(request):
+    """Изоляция тестов с маркером env_params или всех тестов при env_settings_isolation = true"""
+    marker = request.node.get_closest_marker('env_params')
+    if marker is None and not request.config.getini('env_settings_isolation'):
+        yield
+        return
+    snapshot = EnvSnapshot()
+    if marker is not None:
+        set_env_params(*marker.args, **marker.kwargs)
+    yield
+    snapshot.restore()
+
+
+@pytest.fixture
+def env_snapshot():
+    """Снимок переменных окружения и конфигурации, восстанавливается после теста"""
+    snapshot = EnvSnapshot()
+    yield snapshot
+    snapshot.restore()
+
+
+@pytest.fixture
+def env_params(env_snapshot) -> Callable[..., None]:
+    """
+    Функция установки нескольких переменных окружения (см. :func:`set_env_params`),
+    переменные восстанавливаются после теста
+
+    :example:
+    def test_settings(env_params, settings_reloader):
+        env_params(DEBUG=1, TIMEOUT='30s', API_KEY=None)
+        settings = settings_reloader('app.settings')
+    """
+    return set_env_params
+
+
+@pytest.fixture
+def settings_reloader():
+    """
+    Функция перезагрузки модуля настроек (см. :func:`reload_settings`),
+    пространства имен перезагруженных модулей восстанавливаются после теста
+    """
+    saved = {}
+
+    def reload(module: Union[ModuleType, str]) -> ModuleType:
+        if isinstance(module, str) and module not in sys.modules:
+            return import_module(module)
+        module = _get_module(module)
+        saved.setdefault(module.__name__, (module, dict(module.__dict__)))
+        return reload_settings(module)
+
+    yield reload
+    for module, namespace in saved.values():
+        module.__dict__.clear()
+        module.__dict__.update(namespace)
@@ -0,0 +1,276 @@
+"""
+Удаленный источник значений настроек
+
+Значения загружаются одним (или несколькими параллельными) запросами из HTTP сервиса ключ/значение
+по постоянным (keep-alive) соединениям из пула и кешируются на время *ttl*. После истечения *ttl*
+в течение *stale_ttl* возвращаются устаревшие значения, а обновление выполняется в фоновом потоке.
+После ошибки загрузки повторные попытки выполняются не чаще одного раза в *retry_interval*.
+
+Источник подключается к процедурам получения значений через параметр конфигурации *sources*:
+значение переменной окружения имеет приоритет над значением источника
+"""
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPException, HTTPSConnection, RemoteDisconnected
+from json import dumps, loads
+from threading import Condition, Lock, Thread
+from time import monotonic
+from typing import Any, Mapping, Optional, Sequence
+from urllib.parse import urlencode, urlsplit
+
+from .config import config
+
+
+class _ConnectionPool:
+    """Пул постоянных HTTP соединений с одним сервером"""
+
+    def __init__(self, url: str, max_connections: int, timeout: float):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f'Некорректный URL источника: {url}')
+        self._connection_class = HTTPSConnection if parts.scheme == 'https' else HTTPConnection
+        self._host, self._port = parts.hostname, parts.port
+        self._timeout = timeout
+        self._idle: list[HTTPConnection] = []  # Свободные соединения (последнее возвращенное - первым)
+        self._free = max_connections
+        self._available = Condition()
+
+    def _acquire(self) -> tuple[HTTPConnection, bool]:
+        """
+        Возвращает свободное соединение (признак True) или новое соединение, если лимит не исчерпан,
+        иначе ожидает возврата или закрытия соединения другим потоком
+        """
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop(), True
+                if self._free > 0:
+                    self._free -= 1
+                    return self._connection_class(self._host, self._port, timeout=self._timeout), False
+                self._available.wait()
+
+    def _release(self, connection: HTTPConnection):
+        with self._available:
+            self._idle.append(connection)
+            self._available.notify()
+
+    def _discard(self, connection: HTTPConnection):
+        connection.close()
+        with self._available:
+            self._free += 1
+            self._available.notify()
+
+    def request(self, path: str, headers: Mapping[str, str]) -> bytes:
+        """
+        Выполняет GET запрос по соединению из пула
+
+        Соединение возвращается в пул после полного чтения ответа, при ошибке закрывается.
+        Если сервер закрыл простаивавшее соединение, запрос повторяется по новому соединению
+
+        :param path: str: Путь запроса с параметрами
+        :param headers: Mapping[str, str]: Заголовки запроса
+        :return: bytes: Тело ответа
+        """
+        while True:
+            connection, reused = self._acquire()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+                break
+            except (RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self._discard(connection)
+                if not reused:
+                    raise
+            except BaseException:
+                # любая ошибка (в т.ч. KeyboardInterrupt) освобождает место соединения в пуле
+                self._discard(connection)
+                raise
+        if response.will_close:
+            self._discard(connection)
+        else:
+            self._release(connection)
+        if response.status != 200:
+            raise HTTPException(f'HTTP {response.status} {response.reason}')
+        return body
+
+    def close(self):
+        """Закрывает свободные соединения"""
+        with self._available:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._discard(connection)
+
+
+def _to_str(value: Any) -> Optional[str]:
+    """Приводит значение из ответа сервиса к строке (не строковые значения - в JSON)"""
+    if value is None or isinstance(value, str):
+        return value
+    return dumps(value, ensure_ascii=False)
+
+
+class RemoteSource:
+    """
+    Источник значений из HTTP сервиса ключ/значение с кешированием
+
+    Сервис должен возвращать JSON объект {"KEY": "value", ...}: на запрос *url* - все значения,
+    на запрос *url*?keys=KEY1,KEY2 - значения указанных ключей
+
+    :example:
+    remote = RemoteSource('http://config-service/v1/values', keys=('DB_HOST', 'DB_PORT'), ttl=30)
+    configure(sources=(remote,))
+    DB_HOST = get_str_env_param('DB_HOST')  # переменная окружения, иначе значение сервиса
+    """
+
+    def __init__(self, url: str, keys: Optional[Sequence[str]] = None, ttl: float = 60.0,
+                 stale_ttl: Optional[float] = None, timeout: float = 5.0, max_connections: int = 4,
+                 batch_size: int = 100, headers: Optional[Mapping[str, str]] = None, retry_interval: float = 5.0):
+        """
+        :param url: str: URL сервиса (http или https)
+        :param keys: Sequence[str], optional: Загружаемые ключи (по умолчанию все значения сервиса)
+        :param ttl: float, default=60.0: Время актуальности значений в секундах
+        :param stale_ttl: float, optional: Время после *ttl*, в течение которого возвращаются устаревшие значения \
+        с обновлением в фоне (по умолчанию равно *ttl*)
+        :param timeout: float, default=5.0: Тайм-аут соединения в секундах
+        :param max_connections: int, default=4: Максимальное количество соединений (и параллельных запросов)
+        :param batch_size: int, default=100: Количество ключей в одном запросе
+        :param headers: Mapping[str, str], optional: Заголовки запросов (например, авторизация)
+        :param retry_interval: float, default=5.0: Интервал в секундах после ошибки загрузки, в течение которого \
+        значения не загружаются (возвращаются ранее загруженные значения или None)
+        """
+        parts = urlsplit(url)
+        self._url = url
+        self._path = parts.path or '/'
+        self._query = parts.query
+        self._pool = _ConnectionPool(url, max_connections, timeout)
+        self._keys = tuple(dict.fromkeys(keys)) if keys else None
+        self._ttl = ttl
+        self._stale_ttl = ttl if stale_ttl is None else stale_ttl
+        self._max_connections = max_connections
+        self._batch_size = batch_size
+        self._headers = {'Accept': 'application/json', **(headers or {})}
+        self._values: Optional[dict[str, Optional[str]]] = None
+        self._loaded_at = 0.0
+        self._retry_interval = retry_interval
+        self._failed_at: Optional[float] = None
+        self._lock = Lock()
+        self._load_lock = Lock()
+        self._refreshing = False
+
+    def _request_path(self, keys: Optional[Sequence[str]]) -> str:
+        query = '&'.join(part for part in (self._query, urlencode({'keys': ','.join(keys)}) if keys else '') if part)
+        return f'{self._path}?{query}' if query else self._path
+
+    def _fetch(self, keys: Optional[Sequence[str]]) -> dict[str, Optional[str]]:
+        result = loads(self._pool.request(self._request_path(keys), self._headers))
+        if not isinstance(result, dict):
+            raise ValueError('Ответ сервиса должен быть JSON объектом')
+        return {str(key): _to_str(value) for key, value in result.items()}
+
+    def _load(self) -> dict[str, Optional[str]]:
+        """Загружает значения, ключи разбиваются на пакеты, которые запрашиваются параллельно"""
+        if not self._keys:
+            return self._fetch(None)
+        batches = [self._keys[i:i + self._batch_size] for i in range(0, len(self._keys), self._batch_size)]
+        if len(batches) == 1:
+            return self._fetch(batches[0])
+        values = {}
+        with ThreadPoolExecutor(max_workers=min(self._max_connections, len(batches))) as executor:
+            for batch_values in executor.map(self._fetch, batches):
+                values.update(batch_values)
+        return values
+
+    def refresh(self) -> bool:
+        """
+        Загружает значения из сервиса
+
+        При ошибке сохраняются ранее загруженные значения, ошибка записывается в logger,
+        загрузка из :meth:`get` не выполняется в течение *retry_interval*
+
+        :return: bool: True, если значения обновлены
+        """
+        try:
+            values = self._load()
+        except (OSError, HTTPException, ValueError) as e:
+            config.logger.warning(config.messages['warn_remote'].format(self._url, '', str(e)))
+            self._failed_at = monotonic()
+            return False
+        self._values, self._loaded_at, self._failed_at = values, monotonic(), None
+        return True
+
+    def _backoff(self) -> bool:
+        """Признак ожидания после ошибки загрузки (не истек *retry_interval*)"""
+        failed_at = self._failed_at
+        return failed_at is not None and monotonic() - failed_at < self._retry_interval
+
+    def _refresh_in_background(self):
+        """Запускает обновление в фоновом потоке, если оно еще не выполняется"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def target():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        Thread(target=target, name='env_settings-remote-refresh', daemon=True).start()
+
+    def _refresh_blocking(self, loaded_at: float) -> Optional[dict[str, Optional[str]]]:
+        """
+        Синхронно загружает значения, если их не обновил другой поток, ожидавший ту же загрузку,
+        и не истек интервал после ошибки загрузки
+        """
+        with self._load_lock:
+            if self._loaded_at == loaded_at and not self._backoff():
+                self.refresh()
+            return self._values
+
+    def get(self, name: str) -> Optional[str]:
+        """
+        Возвращает значение ключа *name*
+
+        Актуальные значения возвращаются из кеша. Устаревшие значения (не более *stale_ttl* после *ttl*)
+        возвращаются сразу с запуском обновления в фоне, в остальных случаях значения загружаются синхронно
+        (при ошибке загрузки возвращаются ранее загруженные значения). В течение *retry_interval* после ошибки
+        загрузки значения не загружаются, возвращаются ранее загруженные значения
+
+        :param name: str: Ключ
+        :return: str or None: Значение или None, если ключ отсутствует
+        """
+        values = self._current()
+        return values.get(name) if values is not None else None
+
+    def keys(self) -> list[str]:
+        """
+        Возвращает ключи значений сервиса (значения загружаются по правилам :meth:`get`)
+
+        Используется :func:`env_settings.namespace.get_env_namespace` для поиска переменных по префиксу
+
+        :return: list[str]: Ключи
+        """
+        values = self._current()
+        return list(values) if values is not None else []
+
+    def _current(self) -> Optional[dict[str, Optional[str]]]:
+        """Возвращает актуальные значения, при необходимости загружая их синхронно или запуская обновление в фоне"""
+        values, loaded_at = self._values, self._loaded_at
+        age = monotonic() - loaded_at
+        if values is None or age >= self._ttl + self._stale_ttl:
+            if not self._backoff():
+                values = self._refresh_blocking(loaded_at)
+        elif age >= self._ttl and not self._backoff():
+            self._refresh_in_background()
+        return values
+
+    def close(self):
+        """Закрывает соединения пула"""
+        self._pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,158 @@
+"""
+Флаги постепенного включения функциональности (процент ключей и список разрешенных ключей)
+
+Значение флага разбирается один раз в порог корзины: ключ включен, если входит в список разрешенных ключей
+или его корзина меньше порога. Корзина - crc32 ключа с начальным значением по наименованию флага, перемешанный
+32-битной хеш-функцией целых чисел: crc32 аффинен, и без перемешивания корзины ключей одной длины у разных флагов
+отличаются на постоянное значение (XOR), то есть наборы ключей флагов зависимы. Корзина ключа не зависит
+от процесса и запуска, поэтому один и тот же ключ включен во всех процессах, а при увеличении процента
+ранее включенные ключи остаются включенными
+"""
+from typing import Iterable, Optional, Union
+from zlib import crc32
+
+from .config import config
+from .utils import _env_param_error, get_str_env_param
+
+_TRUE_VALUES = frozenset(('true', 'yes', 't', 'y', '1', 'on'))
+_FALSE_VALUES = frozenset(('false', 'no', 'f', 'n', '0', 'off'))
+_BUCKETS = 1 << 32
+_MASK = _BUCKETS - 1
+
+
+def _mix32(value: int) -> int:
+    """
+    Перемешивание 32-битного значения (биекция, хеш-функция целых чисел с множителем 0x45d9f3b)
+
+    Множитель меньше 2 ** 27, поэтому произведение не превышает 2 ** 59 (быстрее финализатора murmur3)
+    """
+    value = ((value ^ (value >> 16)) * 0x45d9f3b) & _MASK
+    value = ((value ^ (value >> 16)) * 0x45d9f3b) & _MASK
+    return value ^ (value >> 16)
+
+
+class RolloutFlag:
+    """
+    Флаг постепенного включения
+
+    :example:
+    FEATURE_X = RolloutFlag.parse('25%,tenant-1', 'FEATURE_X')
+    if FEATURE_X.enabled(user_id):
+        ...
+    """
+    __slots__ = ('name', 'percent', 'allow', '_allow_bytes', '_seed', '_threshold')
+
+    def __init__(self, name: str, percent: float = 0.0, allow: Iterable[str] = ()):
+        """
+        :param name: str: Наименование флага (начальное значение хеша, у разных флагов разные наборы ключей)
+        :param percent: float, default=0.0: Процент включенных ключей (от 0 до 100)
+        :param allow: Iterable[str], default=(): Ключи, для которых флаг включен всегда
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError(f'Процент должен быть в интервале от 0 до 100: {percent}')
+        self.name = name
+        self.percent = percent
+        self.allow = frozenset(allow)
+        self._allow_bytes = frozenset(key.encode('utf-8') for key in self.allow)
+        self._seed = crc32(name.encode('utf-8'))
+        self._threshold = round(percent * _BUCKETS / 100)
+
+    @classmethod
+    def parse(cls, value: Optional[str], name: str) -> 'RolloutFlag':
+        """
+        Разбирает значение флага
+
+        Значение - элементы через запятую: процент (например, 25% или 0.5%) и разрешенные ключи.
+        Логическое значение (1, true, yes, on / 0, false, no, off) включает флаг для всех или ни для одного ключа
+
+        :param value: str, optional: Значение (пустое значение - флаг выключен)
+        :param name: str: Наименование флага
+        :return: RolloutFlag: Флаг
+        :raises ValueError: Некорректный процент или несколько процентов
+        """
+        value = (value or '').strip()
+        if value.lower() in _TRUE_VALUES:
+            return cls(name, 100.0)
+        if not value or value.lower() in _FALSE_VALUES:
+            return cls(name)
+        percent, allow = None, []
+        for item in value.split(','):
+            item = item.strip()
+            if item.endswith('%'):
+                if percent is not None:
+                    raise ValueError('Процент указан несколько раз')
+                percent = float(item[:-1])
+            elif item:
+                allow.append(item)
+        return cls(name, percent or 0.0, allow)
+
+    def bucket(self, key: Union[str, bytes]) -> int:
+        """
+        Возвращает корзину ключа (от 0 до 2 ** 32 - 1)
+
+        :param key: str or bytes: Ключ (например, идентификатор пользователя или арендатора)
+        :return: int: Корзина
+        """
+        return _mix32(crc32(key if isinstance(key, bytes) else key.encode('utf-8'), self._seed))
+
+    def enabled(self, key: Union[str, bytes]) -> bool:
+        """
+        Проверяет, включен ли флаг для ключа
+
+        :param key: str or bytes: Ключ (например, идентификатор пользователя или арендатора)
+        :return: bool: True, если ключ в списке разрешенных или его корзина меньше порога
+        """
+        is_bytes = isinstance(key, bytes)
+        threshold = self._threshold
+        if threshold:
+            if threshold >= _BUCKETS:
+                return True
+            # :func:`_mix32` без вызова функции
+            value = crc32(key if is_bytes else key.encode(), self._seed)
+            value = ((value ^ (value >> 16)) * 0x45d9f3b) & _MASK
+            value = ((value ^ (value >> 16)) * 0x45d9f3b) & _MASK
+            if value ^ (value >> 16) < threshold:
+                return True
+        return key in (self._allow_bytes if is_bytes else self.allow)
+
+    __call__ = enabled
+
+    def __bool__(self):
+        """Флаг включен хотя бы для части ключей"""
+        return self._threshold > 0 or bool(self.allow)
+
+    def __eq__(self, other):
+        if not isinstance(other, RolloutFlag):
+            return NotImplemented
+        return (self.name, self.percent, self.allow) == (other.name, other.percent, other.allow)
+
+    def __hash__(self):
+        return hash((self.name, self.percent, self.allow))
+
+    def __repr__(self):
+        allow = ''.join(f',{key}' for key in sorted(self.allow))
+        return f'RolloutFlag({self.name!r}, {self.percent:g}%{allow})'
+
+
+def get_rollout_env_param(name: str, required: bool = False, default: Optional[str] = None,
+                          **kwargs) -> RolloutFlag:
+    """
+    Получает флаг постепенного включения из переменной окружения *name* (например, FEATURE_X=25%,tenant-1)
+
+    Значение разбирается один раз, проверка ключа (:meth:`RolloutFlag.enabled`) не обращается к окружению.
+    В случае отсутствия значения, берет значение по умолчанию *default*.
+    Если указана обязательность параметра *required* = *True* и отсутствует значение, вызывает обработчик ошибок.
+    В случае некорректного значения, вызывает обработчик ошибок и возвращает выключенный флаг
+
+    :param name: str: Наименование переменной окружения
+    :param required: bool, default=False: Обязательность параметра
+    :param default: str, optional: Значение по умолчанию (например, '10%')
+    :param kwargs: параметры для передачи в :func:`env_settings.utils.get_str_env_param`
+    :return: RolloutFlag: Флаг
+    """
+    result = get_str_env_param(name, required, default, **kwargs)
+    try:
+        return RolloutFlag.parse(result, name)
+    except ValueError as e:
+        _env_param_error(config.messages['err_rollout'].format(name, result, str(e)))
+        return RolloutFlag(name)
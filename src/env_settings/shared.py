@@ -0,0 +1,145 @@
+"""
+Списки значений в разделяемой памяти
+
+Основной процесс один раз загружает список значений (например, результат :func:`env_settings.utils.get_values`)
+в `multiprocessing.shared_memory`, рабочие процессы подключаются к нему по имени и читают значения без копирования
+всего списка, поэтому потребление памяти не растет с количеством процессов.
+
+Формат блока памяти: количество значений (uint64), смещения значений (count + 1 значений uint64,
+порядок байт платформы) и значения в кодировке utf-8 без разделителей
+"""
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+from multiprocessing.shared_memory import SharedMemory
+from struct import Struct
+from typing import Iterable, Optional, Union
+
+_COUNT = Struct('=Q')
+_OFFSET_SIZE = _COUNT.size
+
+
+def _open_shared_memory(name: str) -> SharedMemory:
+    """Подключается к существующему блоку памяти, не регистрируя его для удаления при завершении процесса"""
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return SharedMemory(name=name)
+
+
+class SharedValues(Sequence):
+    """
+    Список строк в разделяемой памяти, доступный только для чтения
+
+    Поддерживает len(), индексацию и срезы, поэтому может передаваться в :func:`env_settings.utils.param_iterator`
+    и :func:`env_settings.utils.endless_param_iterator`.
+    При передаче в другой процесс (pickle) передается только имя блока памяти, процесс подключается к нему заново
+    """
+
+    def __init__(self, shared_memory: SharedMemory, owner: bool = False):
+        """
+        :param shared_memory: SharedMemory: Блок памяти со значениями
+        :param owner: bool, default=False: Процесс создал блок памяти и отвечает за его удаление
+        """
+        self._shared_memory = shared_memory
+        self._owner = owner
+        buffer = shared_memory.buf.toreadonly()
+        count = _COUNT.unpack_from(buffer)[0]
+        data_offset = _COUNT.size + (count + 1) * _OFFSET_SIZE
+        self._count = count
+        self._offsets = buffer[_COUNT.size:data_offset].cast('Q')
+        self._data = buffer[data_offset:]
+        self._buffer = buffer
+
+    @property
+    def name(self) -> str:
+        """Имя блока памяти для подключения из других процессов"""
+        return self._shared_memory.name
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, list[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('Индекс вне диапазона')
+        return str(self._data[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+    def __reduce__(self):
+        return attach_values, (self.name,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        self._release()
+
+    def _release(self) -> bool:
+        """Освобождает представления памяти и отключается от блока памяти, возвращает False при повторном вызове"""
+        if getattr(self, '_buffer', None) is None:
+            return False
+        self._offsets.release()
+        self._data.release()
+        self._buffer.release()
+        self._buffer = None
+        self._count = 0
+        self._shared_memory.close()
+        return True
+
+    def close(self):
+        """
+        Отключается от блока памяти
+
+        Процесс, создавший блок памяти, также удаляет его
+        """
+        if self._release() and self._owner:
+            self._shared_memory.unlink()
+
+
+def share_values(values: Iterable[str], name: Optional[str] = None) -> SharedValues:
+    """
+    Загружает список значений в разделяемую память
+
+    Блок памяти удаляется при вызове :meth:`SharedValues.close` (или выходе из блока with) в создавшем его процессе
+
+    :example:
+    with share_values(get_values(get_str_env_param('PROXY_LIST'))) as proxies:
+        with Pool(8, initializer=init_worker, initargs=(proxies.name,)) as pool:
+            ...
+
+    :param values: Iterable[str]: Значения
+    :param name: str, optional: Имя блока памяти (по умолчанию формируется автоматически)
+    :return: SharedValues: Список значений в разделяемой памяти
+    """
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = list(accumulate((len(value) for value in encoded), initial=0))
+    header_size = _COUNT.size + len(offsets) * _OFFSET_SIZE
+    shared_memory = SharedMemory(name=name, create=True, size=header_size + offsets[-1])
+
+    buffer = shared_memory.buf
+    _COUNT.pack_into(buffer, 0, len(encoded))
+    buffer[_COUNT.size:header_size] = array('Q', offsets).tobytes()
+    buffer[header_size:header_size + offsets[-1]] = b''.join(encoded)
+    del buffer
+    return SharedValues(shared_memory, owner=True)
+
+
+def attach_values(name: str) -> SharedValues:
+    """
+    Подключается к списку значений, загруженному в разделяемую память другим процессом
+
+    :example:
+    def init_worker(name):
+        global PROXIES
+        PROXIES = endless_param_iterator(attach_values(name))
+
+    :param name: str: Имя блока памяти (:attr:`SharedValues.name`)
+    :return: SharedValues: Список значений в разделяемой памяти
+    """
+    return SharedValues(_open_shared_memory(name))
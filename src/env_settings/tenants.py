@@ -0,0 +1,249 @@
+"""
+Изолированные настройки арендаторов (tenants), загружаемые из отдельных .env файлов
+
+Файл арендатора загружается при первом обращении без изменения os.environ, разобранные значения
+и преобразованные процедурами получения значений параметры хранятся в ограниченном LRU-кеше.
+Запись кеша проверяется по времени изменения и размеру файла: измененный файл загружается повторно
+"""
+from collections import ChainMap, OrderedDict
+from contextlib import contextmanager
+from os import environ, path, stat
+from re import compile
+from threading import Lock
+from time import monotonic
+from types import MappingProxyType
+from typing import Any, Callable, Iterator, Mapping, NamedTuple, Optional
+
+from dotenv import dotenv_values
+
+from .config import config
+from .interpolation import InterpolationError, Interpolator
+from .utils import (_env_param_error, _environment, get_bool_env_param, get_converted_env_param,
+                    get_float_env_param, get_int_env_param, get_str_env_param)
+
+# Допустимое имя арендатора (имя подставляется в путь к файлу)
+_TENANT_NAME = compile(r'[A-Za-z0-9_][A-Za-z0-9_.-]*')
+
+_MISSING = object()
+
+
+class TenantSettings:
+    """
+    Настройки одного арендатора
+
+    Значения параметров получаются процедурами получения значений (get_str_env_param и др.), вместо os.environ
+    используются значения файла арендатора. Результаты запоминаются по процедуре и ее аргументам
+
+    :example:
+    settings = store.get('acme')
+    TIMEOUT = settings.get_int('TIMEOUT', default=30)
+    with settings.activate():
+        API_URL = get_uri_env_param('API_URL')
+    """
+
+    def __init__(self, name: str, values: Mapping[str, Optional[str]]):
+        """
+        :param name: str: Имя арендатора
+        :param values: Mapping[str, str or None]: Значения переменных арендатора
+        """
+        self.name = name
+        self.values = values
+        self._cache: dict[tuple, Any] = {}
+
+    @contextmanager
+    def activate(self) -> Iterator['TenantSettings']:
+        """
+        Контекстный менеджер: процедуры получения значений в текущем контексте (поток, задача asyncio)
+        используют значения арендатора вместо os.environ
+        """
+        token = _environment.set(self.values)
+        try:
+            yield self
+        finally:
+            _environment.reset(token)
+
+    def get(self, getter: Callable[..., Any], name: str, *args, **kwargs) -> Any:
+        """
+        Возвращает значение параметра арендатора, полученное процедурой *getter*
+
+        Результат запоминается для процедуры и аргументов (если аргументы хешируемые)
+
+        :param getter: Callable: Процедура получения значения (например, get_int_env_param)
+        :param name: str: Наименование параметра
+        :param args: Позиционные аргументы процедуры
+        :param kwargs: Именованные аргументы процедуры
+        :return: Any: Значение параметра
+        """
+        key = (getter, name, args, tuple(sorted(kwargs.items())))
+        try:
+            result = self._cache.get(key, _MISSING)
+        except TypeError:
+            key, result = None, _MISSING
+        if result is _MISSING:
+            with self.activate():
+                result = getter(name, *args, **kwargs)
+            if key is not None:
+                self._cache[key] = result
+        return result
+
+    def get_str(self, name: str, required: bool = False, default: Optional[str] = None, **kwargs) -> Optional[str]:
+        """Аналог :func:`env_settings.utils.get_str_env_param` для значений арендатора"""
+        return self.get(get_str_env_param, name, required, default, **kwargs)
+
+    def get_int(self, name: str, required: bool = False, default: Optional[int] = None, **kwargs) -> Optional[int]:
+        """Аналог :func:`env_settings.utils.get_int_env_param` для значений арендатора"""
+        return self.get(get_int_env_param, name, required, default, **kwargs)
+
+    def get_float(self, name: str, required: bool = False, default: Optional[float] = None,
+                  **kwargs) -> Optional[float]:
+        """Аналог :func:`env_settings.utils.get_float_env_param` для значений арендатора"""
+        return self.get(get_float_env_param, name, required, default, **kwargs)
+
+    def get_bool(self, name: str, required: bool = False, default: bool = False, **kwargs) -> bool:
+        """Аналог :func:`env_settings.utils.get_bool_env_param` для значений арендатора"""
+        return self.get(get_bool_env_param, name, required, default, **kwargs)
+
+    def get_converted(self, name: str, converter: Any, required: bool = False, default: Any = None,
+                      **kwargs) -> Any:
+        """Аналог :func:`env_settings.utils.get_converted_env_param` для значений арендатора"""
+        return self.get(get_converted_env_param, name, converter, required, default, **kwargs)
+
+
+class _Entry(NamedTuple):
+    """Запись кеша арендатора"""
+    signature: tuple[int, int]  # Время изменения (нс) и размер файла
+    checked: float  # Время последней проверки файла (monotonic)
+    settings: TenantSettings
+
+
+class TenantStore:
+    """
+    Хранилище настроек арендаторов
+
+    Файл арендатора *name* - *directory*/*filename_template*.format(tenant=name). Загруженные настройки
+    хранятся в LRU-кеше не более чем для *max_tenants* арендаторов. Обращение к арендатору не чаще одного раза
+    в *revalidate_interval* секунд проверяет файл (stat) и повторно загружает измененный файл
+
+    :example:
+    store = TenantStore('/etc/gateway/tenants', max_tenants=1000)
+    timeout = store.get(tenant_id).get_int('TIMEOUT', default=30)
+    """
+
+    def __init__(self, directory: str, filename_template: str = '{tenant}.env', max_tenants: int = 128,
+                 revalidate_interval: float = 1.0, inherit_environ: bool = False, interpolate: bool = True,
+                 encoding: str = 'utf-8'):
+        """
+        :param directory: str: Каталог файлов арендаторов
+        :param filename_template: str, default='{tenant}.env': Шаблон имени файла арендатора
+        :param max_tenants: int, default=128: Максимальное количество арендаторов в кеше
+        :param revalidate_interval: float, default=1.0: Интервал проверки изменения файла, сек. \
+        (0 - при каждом обращении)
+        :param inherit_environ: bool, default=False: Брать значения, отсутствующие в файле арендатора, из os.environ
+        :param interpolate: bool, default=True: Подставлять значения ${VAR} и ${VAR:-default} при загрузке файла
+        :param encoding: str, default='utf-8': Кодировка файлов
+        """
+        if max_tenants < 1:
+            raise ValueError('max_tenants должен быть больше 0')
+        self.directory = directory
+        self.filename_template = filename_template
+        self.max_tenants = max_tenants
+        self.revalidate_interval = revalidate_interval
+        self.inherit_environ = inherit_environ
+        self.interpolate = interpolate
+        self.encoding = encoding
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = Lock()
+
+    def filename(self, tenant: str) -> str:
+        """
+        Возвращает имя файла арендатора
+
+        :param tenant: str: Имя арендатора (буквы, цифры, '_', '-', '.', не начинается с '.')
+        :return: str: Имя файла
+        """
+        if not _TENANT_NAME.fullmatch(tenant):
+            raise ValueError(f'Недопустимое имя арендатора: {tenant!r}')
+        return path.join(self.directory, self.filename_template.format(tenant=tenant))
+
+    def _load(self, tenant: str, filename: str) -> TenantSettings:
+        """Загружает значения файла арендатора без изменения os.environ"""
+        values = dotenv_values(filename, interpolate=False, encoding=self.encoding)
+        if self.interpolate:
+            lookup = (lambda name: values[name] if name in values else environ.get(name)) \
+                if self.inherit_environ else values.get
+            interpolator = Interpolator(lookup, templates=set(values),
+                                        previous=environ.get if self.inherit_environ else None)
+            resolved = {}
+            for name, value in values.items():
+                try:
+                    resolved[name] = interpolator.resolve(name)
+                except InterpolationError as e:
+                    _env_param_error(config.messages['err_interpolation'].format(name, value, str(e)))
+                    resolved[name] = value
+            values = resolved
+        return TenantSettings(tenant, ChainMap(values, environ) if self.inherit_environ else MappingProxyType(values))
+
+    def get(self, tenant: str) -> TenantSettings:
+        """
+        Возвращает настройки арендатора, загружая файл при первом обращении или после его изменения
+
+        :param tenant: str: Имя арендатора
+        :return: TenantSettings: Настройки арендатора
+        :raises FileNotFoundError: Отсутствует файл арендатора
+        """
+        now = monotonic()
+        with self._lock:
+            entry = self._entries.get(tenant)
+            if entry is not None:
+                self._entries.move_to_end(tenant)
+                if now - entry.checked < self.revalidate_interval:
+                    return entry.settings
+        filename = self.filename(tenant)
+        try:
+            file_stat = stat(filename)
+        except FileNotFoundError:
+            self.invalidate(tenant)
+            raise
+        signature = (file_stat.st_mtime_ns, file_stat.st_size)
+        if entry is not None and entry.signature == signature:
+            settings = entry.settings
+        else:
+            settings = self._load(tenant, filename)
+        with self._lock:
+            self._entries[tenant] = _Entry(signature, now, settings)
+            self._entries.move_to_end(tenant)
+            while len(self._entries) > self.max_tenants:
+                self._entries.popitem(last=False)
+        return settings
+
+    @contextmanager
+    def tenant(self, tenant: str) -> Iterator[TenantSettings]:
+        """
+        Контекстный менеджер: процедуры получения значений используют значения арендатора *tenant*
+
+        :example:
+        with store.tenant('acme'):
+            TIMEOUT = get_int_env_param('TIMEOUT')
+
+        :param tenant: str: Имя арендатора
+        """
+        with self.get(tenant).activate() as settings:
+            yield settings
+
+    def invalidate(self, tenant: Optional[str] = None):
+        """
+        Удаляет настройки арендатора *tenant* (по умолчанию всех арендаторов) из кеша
+
+        :param tenant: str, optional: Имя арендатора
+        """
+        with self._lock:
+            if tenant is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(tenant, None)
+
+    def __contains__(self, tenant) -> bool:
+        return tenant in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
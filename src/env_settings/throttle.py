@@ -0,0 +1,123 @@
+"""
+Ограничение частоты повторяющихся сообщений обработчика ошибок и логгирования значений
+
+Одинаковое сообщение выводится не чаще одного раза за интервал, количество подавленных повторов
+добавляется к следующему выводу сообщения или выводится :func:`flush_suppressed`.
+Окна сообщений хранятся в словаре ограниченного размера без блокировок: при одновременном обращении
+из нескольких потоков счетчик подавленных повторов приблизительный
+"""
+from time import monotonic
+from typing import Callable, Hashable, Optional
+
+from .config import config
+
+# Максимальное количество различных сообщений, для которых хранятся окна
+MAX_MESSAGES = 4096
+
+
+class MessageThrottle:
+    """
+    Окна вывода сообщений
+
+    :example:
+    throttle = MessageThrottle()
+    suppressed = throttle.check(msg, 60.0, print)
+    if suppressed is not None:
+        print(msg)
+    """
+
+    def __init__(self, max_messages: int = MAX_MESSAGES):
+        """
+        :param max_messages: int, default=MAX_MESSAGES: Максимальное количество окон. При переполнении удаляется \
+        восьмая часть окон, давно не выводившихся сообщений (их счетчики подавленных повторов теряются)
+        """
+        if max_messages < 1:
+            raise ValueError('max_messages должен быть больше 0')
+        self.max_messages = max_messages
+        # сообщение -> [начало окна, количество подавленных повторов, функция вывода]
+        self._windows: dict[Hashable, list] = {}
+
+    def check(self, key: Hashable, interval: float, emit: Optional[Callable[[str], None]] = None,
+              now: Optional[float] = None) -> Optional[int]:
+        """
+        Проверяет, выводить ли сообщение *key*
+
+        :param key: Hashable: Сообщение или ключ сообщения
+        :param interval: float: Интервал, сек.
+        :param emit: Callable[[str], None], optional: Функция вывода сводки подавленных повторов (см. :meth:`drain`)
+        :param now: float, optional: Текущее время (monotonic)
+        :return: int or None: None - сообщение подавлено, иначе количество подавленных повторов с предыдущего вывода
+        """
+        now = monotonic() if now is None else now
+        windows = self._windows
+        window = windows.get(key)
+        if window is not None and now - window[0] < interval:
+            window[1] += 1
+            return None
+        if window is None:
+            if len(windows) >= self.max_messages:
+                self._evict()
+            suppressed = 0
+        else:
+            suppressed = window[1]
+            windows.pop(key, None)
+        windows[key] = [now, 0, emit]
+        return suppressed
+
+    def _evict(self):
+        """Удаляет окна, открытые раньше остальных (словарь упорядочен по началу окна)"""
+        for key in list(self._windows)[:max(self.max_messages // 8, 1)]:
+            self._windows.pop(key, None)
+
+    def drain(self) -> list[tuple[Hashable, int, Optional[Callable[[str], None]]]]:
+        """
+        Возвращает сообщения с подавленными повторами и обнуляет их счетчики
+
+        :return: list[tuple[Hashable, int, Callable or None]]: Сообщение, количество подавленных повторов, \
+        функция вывода
+        """
+        result = []
+        for key, window in list(self._windows.items()):
+            if window[1]:
+                result.append((key, window[1], window[2]))
+                window[1] = 0
+        return result
+
+    def clear(self):
+        """Удаляет все окна"""
+        self._windows.clear()
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+
+# Окна сообщений процедур получения значений
+throttle = MessageThrottle()
+
+
+def emit_throttled(msg: str, emit: Callable[[str], None]):
+    """
+    Выводит сообщение функцией *emit* не чаще одного раза за *config.log_interval* секунд
+
+    Без *config.log_interval* сообщение выводится всегда. К сообщению, выведенному после подавленных повторов,
+    добавляется их количество (сообщение по ключу log_suppressed)
+
+    :param msg: str: Сообщение
+    :param emit: Callable[[str], None]: Функция вывода (например, logger.error или print)
+    """
+    interval = config.log_interval
+    if interval:
+        suppressed = throttle.check(msg, interval, emit)
+        if suppressed is None:
+            return
+        if suppressed:
+            msg = config.messages['log_suppressed'].format(msg, suppressed, interval)
+    emit(msg)
+
+
+def flush_suppressed():
+    """Выводит количество подавленных повторов сообщений, не выведенных повторно (например, перед завершением)"""
+    interval = config.log_interval or 0
+    for msg, suppressed, emit in throttle.drain():
+        if emit is not None:
+            emit(config.messages['log_suppressed'].format(msg, suppressed, interval))
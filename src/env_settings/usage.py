@@ -0,0 +1,137 @@
+"""
+Поиск неиспользуемых и необъявленных параметров окружения
+
+Объявленные параметры определяются по файлам настроек (тем же обходом, что и генератор .env файлов),
+остальной код сканируется параллельно в нескольких процессах в поисках обращений к параметрам
+и прямого чтения переменных окружения (os.getenv, os.environ, get_*_env_param)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from os import path, walk
+from re import MULTILINE, compile
+from typing import NamedTuple, Optional
+
+from .generator import ParamIndex, SettingsParam
+
+# Директории, которые не сканируются по умолчанию
+DEFAULT_EXCLUDE_DIRS = ('.git', '.hg', '.svn', '.tox', '.nox', '.venv', 'venv', '__pycache__', 'node_modules',
+                        'build', 'dist', '.mypy_cache', '.pytest_cache')
+
+_COMMENT_LINE = compile(r'^[ \t]*#.*$', MULTILINE)
+_IDENTIFIER = compile(r'\b[A-Z][A-Z0-9_]*\b')
+_ENV_READ = compile(r'(?:\bgetenv|\benviron\.get|\bget_\w*env_param)\(\s*[\'"]([A-Za-z_][A-Za-z0-9_]*)[\'"]'
+                    r'|\benviron\[\s*[\'"]([A-Za-z_][A-Za-z0-9_]*)[\'"]\s*\]')
+_CHUNK_SIZE = 64
+
+
+class EnvRead(NamedTuple):
+    """Чтение переменной окружения в коде"""
+    name: str  # Наименование переменной окружения
+    source: str  # Файл
+    line: int  # Номер строки
+
+
+class EnvUsageReport(NamedTuple):
+    """Результат поиска неиспользуемых и необъявленных параметров"""
+    unused: tuple[SettingsParam, ...]  # Объявленные параметры, к которым нет обращений
+    undeclared: tuple[EnvRead, ...]  # Чтения переменных окружения, не объявленных в файлах настроек
+
+    def __bool__(self):
+        return bool(self.unused or self.undeclared)
+
+    def format(self) -> str:
+        """Формирует текстовый отчет, по одной строке на найденную проблему"""
+        rows = [f'unused: {param.name} ({param.source}:{param.line})' for param in self.unused]
+        rows.extend(f'undeclared: {read.name} ({read.source}:{read.line})' for read in self.undeclared)
+        return '\n'.join(rows)
+
+
+def _scan_file(task: tuple[str, frozenset]) -> tuple[set[str], list[EnvRead]]:
+    """
+    Сканирует файл: находит идентификаторы в стиле CONSTANT_CASE и чтения переменных окружения
+
+    Строки объявлений параметров (*skip_lines*) и строки комментариев не учитываются при поиске идентификаторов
+
+    :param task: tuple[str, frozenset]: Имя файла и номера строк объявлений параметров в нем
+    :return: tuple[set[str], list[EnvRead]]: Идентификаторы и чтения переменных окружения
+    """
+    filename, skip_lines = task
+    try:
+        with open(filename, mode='r', encoding='utf-8', errors='replace') as file:
+            content = file.read()
+    except OSError:
+        return set(), []
+
+    reads = []
+    line, position = 1, 0
+    for match in _ENV_READ.finditer(content):
+        line += content.count('\n', position, match.start())
+        position = match.start()
+        reads.append(EnvRead(match.group(1) or match.group(2), filename, line))
+
+    if skip_lines:
+        content = '\n'.join('' if number in skip_lines else row
+                            for number, row in enumerate(content.split('\n'), start=1))
+    return set(_IDENTIFIER.findall(_COMMENT_LINE.sub('', content))), reads
+
+
+def _find_code_files(code_path: str, exclude_dirs: tuple[str, ...]) -> list[str]:
+    """Рекурсивно находит файлы Python, пропуская исключенные директории"""
+    result = []
+    for root, dirs, files in walk(code_path, topdown=True):
+        dirs[:] = [name for name in dirs if name not in exclude_dirs]
+        result.extend(path.normpath(path.join(root, name)) for name in files if name.endswith('.py'))
+    return result
+
+
+def find_env_usage(settings_filename: str = 'settings.py', modules_path: str = '.',
+                   sub_modules_path: Optional[str] = None, include_sub_modules: Optional[tuple[str]] = None,
+                   exclude_params: Optional[tuple[str]] = None, code_path: Optional[str] = None,
+                   exclude_dirs: tuple[str, ...] = DEFAULT_EXCLUDE_DIRS,
+                   max_workers: Optional[int] = None) -> EnvUsageReport:
+    """
+    Находит неиспользуемые и необъявленные параметры окружения
+
+    1. Строит индекс параметров по файлам настроек (параметры поиска соответствуют :func:`generate_env_file`)
+    2. Параллельно сканирует файлы Python в *code_path*
+    3. Параметр считается неиспользуемым, если его имя не встречается в коде вне строки объявления
+    4. Чтение считается необъявленным, если имя переменной окружения, переданное в os.getenv, os.environ
+       или get_*_env_param, не объявлено в файлах настроек
+
+    :param settings_filename: str, default='settings.py': Имя файла настроек для поиска
+    :param modules_path: str, default='.': Корневая директория для поиска файлов настроек
+    :param sub_modules_path: str, optional: Специфическая поддиректория для поиска модулей (например, 'modules')
+    :param include_sub_modules: tuple[str], optional: Кортеж имен подмодулей для включения в поиск
+    :param exclude_params: tuple[str], optional: Кортеж имен параметров для исключения из проверки
+    :param code_path: str, optional: Корневая директория сканируемого кода (по умолчанию *modules_path*)
+    :param exclude_dirs: tuple[str], default=DEFAULT_EXCLUDE_DIRS: Имена директорий, которые не сканируются
+    :param max_workers: int, optional: Количество процессов (1 - сканирование в текущем процессе)
+    :return: EnvUsageReport: Неиспользуемые параметры и необъявленные чтения
+    """
+    index = ParamIndex.from_settings(settings_filename, modules_path, sub_modules_path, include_sub_modules,
+                                     exclude_params)
+    declaration_lines: dict[str, set[int]] = {}
+    for name in index:
+        for param in index.get(name):
+            declaration_lines.setdefault(path.abspath(param.source), set()).add(param.line)
+
+    files = _find_code_files(code_path or modules_path, exclude_dirs)
+    tasks = [(name, frozenset(declaration_lines.get(path.abspath(name), ()))) for name in files]
+
+    if max_workers == 1 or len(tasks) <= _CHUNK_SIZE:
+        results = map(_scan_file, tasks)
+        return _build_report(index, results, exclude_params)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return _build_report(index, executor.map(_scan_file, tasks, chunksize=_CHUNK_SIZE), exclude_params)
+
+
+def _build_report(index: ParamIndex, results, exclude_params: Optional[tuple[str]]) -> EnvUsageReport:
+    """Объединяет результаты сканирования файлов в отчет"""
+    used: set[str] = set()
+    undeclared = []
+    for identifiers, reads in results:
+        used.update(identifiers)
+        undeclared.extend(read for read in reads
+                          if read.name not in index and not (exclude_params and read.name in exclude_params))
+
+    unused = tuple(param for name in index if name not in used for param in index.get(name))
+    return EnvUsageReport(unused, tuple(undeclared))
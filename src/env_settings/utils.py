@@ -2,13 +2,24 @@
 Утилиты для работы с настройками
 """
 from array import array
-from os import makedirs, path, getenv
+from collections.abc import Sequence
+from contextvars import ContextVar
+from importlib import import_module
+from io import BufferedReader, TextIOWrapper
+from itertools import islice
+from os import SEEK_END, environ, path, getenv
+from re import compile
 from sys import maxsize
-from typing import Optional, Union, Iterator
+from typing import IO, Any, Callable, Iterable, Mapping, Optional, Union, Iterator
+from zlib import crc32
 
-from dotenv import load_dotenv
+from dotenv import dotenv_values, load_dotenv
 
 from .config import config, ErrorHandling
+from .converters import ConversionError, compile_converter
+from .filesystem import create_directory, is_dir, is_file
+from .interpolation import InterpolationError, Interpolator
+from .throttle import emit_throttled
 
 
 def _env_param_error(msg: str):
@@ -21,17 +32,20 @@ def _env_param_error(msg: str):
         - выводит сообщение в консоль
         - не выполняет ни каких действий
 
+    Запись в logger и вывод в консоль повторяющихся сообщений ограничиваются *config.log_interval*
+    (см. :func:`env_settings.throttle.emit_throttled`)
+
     :param msg: str: Сообщение об ошибке
     """
-    error_handling = ErrorHandling.EXIT if not config.error_handling else config.error_handling
+    error_handling = config.error_handling or ErrorHandling.EXIT
     if error_handling == ErrorHandling.EXIT:
         exit(msg)
     elif error_handling == ErrorHandling.RAISE:
         raise ValueError(msg)
     elif error_handling == ErrorHandling.LOGGING:
-        config.logger.error(msg)
+        emit_throttled(msg, config.logger.error)
     elif error_handling == ErrorHandling.PRINT:
-        print(msg)
+        emit_throttled(msg, print)
 
 
 def _create_directory(name: str, is_filename: bool = False):
@@ -42,13 +56,9 @@ def _create_directory(name: str, is_filename: bool = False):
     :param is_filename: bool, default=False: Если в *name* указано имя файла, установить в True
     """
     if name:
-        absolute_name = path.abspath(name)
-        if is_filename:
-            directory = path.dirname(absolute_name)
-        else:
-            directory = absolute_name
-        if not path.exists(directory):
-            makedirs(directory)
+        directory = path.dirname(name) if is_filename else name
+        if directory:
+            create_directory(directory)
 
 
 def get_obfuscate_value(value: str) -> str:
@@ -116,16 +126,57 @@ def get_value_from_string(delimited_string: str, index: int = 1, separator: str
     return None
 
 
+# Форматы сжатия файлов значений: модуль, расширения файла, сигнатура
+# (сигнатура bz2 - BZh, уровень сжатия 1-9 и маркер первого блока или конца пустого потока)
+_COMPRESSIONS = (('gzip', ('.gz', '.gzip'), compile(rb'\x1f\x8b')),
+                 ('bz2', ('.bz2',), compile(rb'BZh[1-9](?:1AY&SY|\x17rE8P\x90)')),
+                 ('lzma', ('.xz', '.lzma'), compile(rb'\xfd7zXZ\x00')))
+
+
+# Размер блока потокового чтения файла значений (символов) и символы, по которым str.splitlines() делит строки
+_READ_CHUNK_SIZE = 1 << 20
+_LINE_BREAKS = frozenset('\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029')
+
+
+def _open_values_file(filename: str) -> IO[bytes]:
+    """
+    Открывает файл значений для чтения в двоичном режиме
+
+    Файлы, сжатые gzip, bz2 или xz (по расширению или сигнатуре), распаковываются потоково при чтении
+    """
+    with open(filename, mode='rb') as file:
+        head = file.read(10)
+    lower_name = str(filename).lower()
+    for module, suffixes, magic in _COMPRESSIONS:
+        if lower_name.endswith(suffixes) or magic.match(head):
+            return import_module(module).open(filename, mode='rb')
+    return open(filename, mode='rb')
+
+
 def get_values_from_file(filename: str, encoding='utf-8') -> list[str]:
     """
     Загружает данные из файла в виде набора списка строк
 
+    Файлы, сжатые gzip (.gz), bz2 (.bz2) или xz (.xz), определяются по расширению или сигнатуре и распаковываются
+    потоково, строка за строкой, без временного файла и без распакованного содержимого целиком в памяти
+
     :param filename: str: Имя файла
     :param encoding: str, default='utf-8': Кодировка файла
     :return: list[str]: Список из строк файла
     """
-    with open(filename, mode='r', encoding=encoding) as file:
-        return file.read().splitlines()
+    result, tail = [], ''
+    with _open_values_file(filename) as file:
+        text = TextIOWrapper(file, encoding=encoding)
+        while True:
+            chunk = text.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (tail + chunk).splitlines()
+            tail = '' if chunk[-1] in _LINE_BREAKS else lines.pop()
+            result.extend(lines)
+    if tail:
+        result.append(tail)
+    return result
 
 
 def get_values(value: str, default_value: Optional[str] = None, separator: str = ',') -> list[str]:
@@ -145,17 +196,117 @@ def get_values(value: str, default_value: Optional[str] = None, separator: str =
             return list([default_value])
         return list([])
 
-    if path.exists(value) and path.isfile(value):
+    if is_file(value):
         return get_values_from_file(value)
 
     return value.split(separator)
 
 
+_TRUE_VALUES = ('true', 'yes', 't', 'y', '1')
+
+
+def _clean_value(value: Optional[str]) -> Optional[str]:
+    """Удаляет пробельные символы по краям значения, пустое значение заменяет на None"""
+    return None if not value or not value.strip() else value.strip()
+
+
+def _to_int(name: str, value: Optional[str]) -> Optional[int]:
+    """
+    Преобразует значение параметра *name* в *int*, при ошибке вызывает обработчик ошибок
+
+    :param name: str: Наименование параметра
+    :param value: str, optional: Значение
+    :return: int or None: Преобразованное значение
+    """
+    try:
+        return None if not value else int(value)
+    except ValueError as e:
+        _env_param_error(config.messages['err_integer'].format(name, value, str(e)))
+        return None
+
+
+def _to_float(name: str, value: Optional[str]) -> Optional[float]:
+    """
+    Преобразует значение параметра *name* в *float* (допускается запятая), при ошибке вызывает обработчик ошибок
+
+    :param name: str: Наименование параметра
+    :param value: str, optional: Значение
+    :return: float or None: Преобразованное значение
+    """
+    try:
+        return None if not value else float(value.replace(',', '.'))
+    except ValueError as e:
+        _env_param_error(config.messages['err_float'].format(name, value, str(e)))
+        return None
+
+
+def _to_bool(value: Optional[str]) -> bool:
+    """Преобразует значение в *bool*: True для значений yes, true, t, y, 1 (без учета регистра)"""
+    return True if value and value.lower() in _TRUE_VALUES else False
+
+
+def _to_converted(name: str, value: Any, pipeline: Callable[[Any], Any]) -> Any:
+    """
+    Преобразует значение параметра *name* скомпилированным преобразователем, при ошибке вызывает обработчик ошибок
+
+    :param name: str: Наименование параметра
+    :param value: Значение (строковое или значение по умолчанию)
+    :param pipeline: Callable[[Any], Any]: Конвейер преобразования (см. :func:`compile_converter`)
+    :return: Преобразованное значение или None
+    """
+    try:
+        return pipeline(value)
+    except ConversionError as e:
+        _env_param_error(config.messages[e.message_key].format(name, value, e.detail))
+        return None
+
+
+def _get_source_value(name: str) -> Optional[str]:
+    """
+    Получает значение *name* из дополнительных источников значений *config.sources* (первое найденное)
+
+    :param name: str: Наименование параметра
+    :return: str or None: Значение или None, если значение отсутствует во всех источниках
+    """
+    for source in config.sources:
+        value = source.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+# Переменные окружения текущего контекста вместо os.environ (None - os.environ), см. env_settings.tenants
+_environment: ContextVar[Optional[Mapping[str, Optional[str]]]] = ContextVar('_environment', default=None)
+
+
+def _get_raw_value(name: str) -> Optional[str]:
+    """Получает значение *name* из переменной окружения, иначе из дополнительных источников значений"""
+    environment = _environment.get()
+    value = getenv(name) if environment is None else environment.get(name)
+    return _get_source_value(name) if value is None else value
+
+
+# Подстановка значений ${VAR} процедурами получения значений
+_interpolator = Interpolator(_get_raw_value)
+
+
+def _interpolate(name: str, value: str, is_default: bool) -> str:
+    """Подставляет значения переменных в значение параметра *name* или его значение по умолчанию"""
+    try:
+        return _interpolator.expand(value) if is_default else _interpolator.resolve(name)
+    except InterpolationError as e:
+        _env_param_error(config.messages['err_interpolation'].format(name, value, str(e)))
+        return value
+
+
 def get_str_env_param(name: str, required: bool = False, default: Optional[str] = None, **kwargs) -> Optional[str]:
     """
     Получает значение из переменной окружения *name*
 
-    В случае отсутствия значения, берет значение по умолчанию *default*.
+    В случае отсутствия переменной окружения, берет значение из дополнительных источников *config.sources*,
+    в случае отсутствия значения, берет значение по умолчанию *default*.
+    Если включена подстановка значений (*config.interpolate* или *interpolate* = *True*), ссылки ${VAR}
+    и ${VAR:-default} заменяются значениями переменных (см. :class:`env_settings.interpolation.Interpolator`).
     Если указана обязательность параметра *required* = *True* и отсутствует значение, вызывает обработчик ошибок
 
     :param name: str: Наименование переменной окружения
@@ -165,18 +316,24 @@ def get_str_env_param(name: str, required: bool = False, default: Optional[str]
         log_text: str: Текст, который будет записан в logger, если включена опция конфигурации do_value_logging
         do_obfuscate_log_text: bool, default=False: Если True, то в logger, вместо значения, записывается результат \
         get_obfuscate_value()
+        interpolate: bool, optional: Подставлять значения ${VAR} (по умолчанию *config.interpolate*)
     :return: str or None: Значение переменной окружения *name* или None
 
-    Note: Параметры log_text и do_obfuscate_log_text передаются как keyword-аргументы через **kwargs
+    Note: Параметры log_text, do_obfuscate_log_text и interpolate передаются как keyword-аргументы через **kwargs
     """
-    result = getenv(name, default=str(default) if default else None)
+    result = _get_raw_value(name)
+    is_default = result is None
+    if is_default and default:
+        result = str(default)
+    if result and '${' in result and kwargs.get('interpolate', config.interpolate):
+        result = _interpolate(name, result, is_default)
     if config.do_value_logging:
         log_text = kwargs['log_text'] if 'log_text' in kwargs.keys() else result
         if 'do_obfuscate_log_text' in kwargs.keys() and kwargs['do_obfuscate_log_text']:
             log_text = get_obfuscate_value(log_text)
-        config.logger.debug(config.messages['log_value'].format(name, log_text, ''))
+        emit_throttled(config.messages['log_value'].format(name, log_text, ''), config.logger.debug)
 
-    result = None if not result or not result.strip() else result.strip()
+    result = _clean_value(result)
     if required and not result:
         _env_param_error(config.messages['err_required'].format(name, '', ''))
     return result
@@ -196,13 +353,7 @@ def get_int_env_param(name: str, required: bool = False, default: Optional[int]
     :param kwargs: параметры для передачи в :func:`get_str_env_param`
     :return: int or None: Значение переменной окружения *name*
     """
-    result = get_str_env_param(name, required, str(default) if default else None, **kwargs)
-    try:
-        result = None if not result else int(result)
-        return result
-    except ValueError as e:
-        _env_param_error(config.messages['err_integer'].format(name, result, str(e)))
-        return None
+    return _to_int(name, get_str_env_param(name, required, str(default) if default else None, **kwargs))
 
 
 def get_float_env_param(name: str, required: bool = False,
@@ -220,13 +371,7 @@ def get_float_env_param(name: str, required: bool = False,
     :param kwargs: параметры для передачи в :func:`get_str_env_param`
     :return: float or None: Значение переменной окружения *name*
     """
-    result = get_str_env_param(name, required, str(default) if default else None, **kwargs)
-    try:
-        result = None if not result else float(result.replace(',', '.'))
-        return result
-    except ValueError as e:
-        _env_param_error(config.messages['err_float'].format(name, result, str(e)))
-        return None
+    return _to_float(name, get_str_env_param(name, required, str(default) if default else None, **kwargs))
 
 
 def get_bool_env_param(name: str, required: bool = False, default: bool = False, **kwargs) -> bool:
@@ -243,8 +388,48 @@ def get_bool_env_param(name: str, required: bool = False, default: bool = False,
     :param kwargs: параметры для передачи в :func:`get_str_env_param`
     :return: bool: Значение переменной окружения *name*
     """
-    result = get_str_env_param(name, required, str(default) if default else False, **kwargs)
-    return True if result and result.lower() in ('true', 'yes', 't', 'y', '1') else False
+    return _to_bool(get_str_env_param(name, required, str(default) if default else False, **kwargs))
+
+
+def get_converted_env_param(name: str, converter: Union[str, type, Callable[[str], Any]], required: bool = False,
+                            default: Any = None, min_value: Any = None, max_value: Any = None,
+                            choices: Optional[Iterable] = None, pattern: Optional[str] = None, **kwargs) -> Any:
+    """
+    Получает значение из переменной окружения *name*, преобразованное зарегистрированным преобразователем
+
+    Преобразователь и ограничения компилируются один раз (см. :func:`env_settings.converters.compile_converter`).
+    В случае отсутствия значения, берет значение по умолчанию *default* (строковое значение по умолчанию
+    преобразуется, иное проверяется ограничениями min_value, max_value и choices).
+    Если указана обязательность параметра *required* = *True* и отсутствует значение, вызывает обработчик ошибок.
+    В случае невозможности преобразования или нарушения ограничений, вызывает обработчик ошибок
+    с сообщением по ключу преобразователя (err_duration, err_bytes, err_json, err_url, err_choices, err_min,
+    err_max, err_pattern, err_convert)
+
+    :example:
+    TIMEOUT = get_converted_env_param('TIMEOUT', 'duration', default='30s', max_value=300)
+    CACHE_SIZE = get_converted_env_param('CACHE_SIZE', 'bytes', default='512MB')
+    MODE = get_converted_env_param('MODE', 'enum', choices=('fast', 'safe'), default='safe')
+
+    :param name: str: Наименование переменной окружения
+    :param converter: str, Enum or Callable: Наименование преобразователя (str, int, float, duration, bytes, json, \
+    url, enum), класс перечисления или функция преобразования
+    :param required: bool, default=False: Обязательность параметра
+    :param default: optional: Значение по умолчанию
+    :param min_value: optional: Минимальное допустимое значение
+    :param max_value: optional: Максимальное допустимое значение
+    :param choices: Iterable, optional: Допустимые значения (после преобразования)
+    :param pattern: str, optional: Регулярное выражение для проверки исходной строки
+    :param kwargs: параметры для передачи в :func:`get_str_env_param`
+    :return: Преобразованное значение переменной окружения *name* или None
+    """
+    pipeline = compile_converter(converter, min_value, max_value, tuple(choices) if choices else None, pattern)
+    is_str_default = isinstance(default, str)
+    result = get_str_env_param(name, required and default is None, default if is_str_default else None, **kwargs)
+    if result is None:
+        if is_str_default or default is None:
+            return None
+        result = default
+    return _to_converted(name, result, pipeline)
 
 
 def get_file_env_param(name: str, required: bool = False, default: Optional[str] = None, file_mast_exist: bool = True,
@@ -270,7 +455,7 @@ def get_file_env_param(name: str, required: bool = False, default: Optional[str]
     """
     result = get_str_env_param(name, required, default, **kwargs)
     if file_mast_exist:
-        if path.exists(result) and path.isfile(result):
+        if is_file(result):
             return result
         else:
             _env_param_error(config.messages['err_file'].format(name, result, ''))
@@ -306,7 +491,7 @@ def get_filedir_env_param(name: str, required: bool = False, default: Optional[s
     """
     result = get_str_env_param(name, required, default, **kwargs)
     if dir_mast_exist:
-        if path.exists(result) and path.isdir(result):
+        if is_dir(result):
             return result
         else:
             try:
@@ -343,12 +528,209 @@ def param_iterator(param_values: Union[list[str], tuple[str], array]) -> Iterato
         yield param_values[i]
 
 
+PARTITION_STRATEGIES = ('range', 'stride', 'hash')
+
+
+class ValuesPartition(Sequence):
+    """
+    Часть списка значений, принадлежащая рабочему процессу
+
+    Значения не копируются: хранится ссылка на исходный список и индексы значений части
+    """
+
+    def __init__(self, values: Sequence, indexes: Union[range, array]):
+        """
+        :param values: Sequence: Исходный список значений
+        :param indexes: range or array: Индексы значений части в исходном списке
+        """
+        self._values = values
+        self._indexes = indexes
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return ValuesPartition(self._values, self._indexes[index])
+        return self._values[self._indexes[index]]
+
+
+def _jump_hash(key: int, buckets: int) -> int:
+    """
+    Консистентное хеширование (jump consistent hash, Lamping & Veach)
+
+    При изменении количества корзин с n на n + 1 в новую корзину переходит только 1 / (n + 1) ключей
+
+    :param key: int: Ключ
+    :param buckets: int: Количество корзин
+    :return: int: Номер корзины
+    """
+    bucket, jump = -1, 0
+    while jump < buckets:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def _value_worker(value: str, workers: int) -> int:
+    """Номер рабочего процесса для значения при консистентном хешировании"""
+    return _jump_hash(crc32(value.encode('utf-8')), workers)
+
+
+def _check_partition(worker: int, workers: int, strategy: str):
+    if strategy not in PARTITION_STRATEGIES:
+        raise ValueError(f'Неизвестная стратегия разбиения: {strategy}')
+    if not 0 <= worker < workers:
+        raise ValueError(f'Номер рабочего процесса {worker} вне диапазона 0..{workers - 1}')
+
+
+def partition_values(values: Sequence, worker: int, workers: int, strategy: str = 'range') -> ValuesPartition:
+    """
+    Возвращает часть списка значений для рабочего процесса *worker* из *workers*
+
+    Стратегии разбиения:
+        - range - непрерывный диапазон значений (части отличаются по размеру не более чем на одно значение)
+        - stride - каждое *workers*-е значение, начиная с *worker*
+        - hash - консистентное хеширование значения: значение всегда попадает в одну и ту же часть независимо
+          от позиции в списке, при изменении количества процессов перемещается минимум значений
+
+    :example:
+    for object_id in param_iterator(partition_values(OBJECT_IDS, WORKER_INDEX, WORKERS_COUNT)):
+        process(object_id)
+
+    :param values: Sequence: Список значений
+    :param worker: int: Номер рабочего процесса (от 0)
+    :param workers: int: Количество рабочих процессов
+    :param strategy: str, default='range': Стратегия разбиения (range, stride, hash)
+    :return: ValuesPartition: Часть списка значений без копирования значений
+    """
+    _check_partition(worker, workers, strategy)
+    count = len(values)
+    if strategy == 'range':
+        indexes = range(count * worker // workers, count * (worker + 1) // workers)
+    elif strategy == 'stride':
+        indexes = range(worker, count, workers)
+    else:
+        indexes = array('q', (i for i in range(count) if _value_worker(values[i], workers) == worker))
+    return ValuesPartition(values, indexes)
+
+
+def _read_lines(file, stop: Optional[int], encoding: str) -> Iterator[str]:
+    """Читает строки файла, начинающиеся до позиции *stop*, без символов перевода строки"""
+    position = file.tell()
+    while stop is None or position < stop:
+        line = file.readline()
+        if not line:
+            break
+        position += len(line)
+        if line.endswith(b'\n'):
+            line = line[:-2] if line.endswith(b'\r\n') else line[:-1]
+        yield line.decode(encoding)
+
+
+def get_values_partition_from_file(filename: str, worker: int, workers: int, strategy: str = 'range',
+                                   encoding: str = 'utf-8') -> list[str]:
+    """
+    Загружает из файла только строки, принадлежащие рабочему процессу *worker* из *workers*
+
+    Для стратегии range файл делится на диапазоны байт, процесс читает только свой диапазон: строка принадлежит
+    процессу, в диапазон которого попадает ее первый байт.
+    Для стратегий stride и hash файл читается потоково, сохраняются только строки процесса.
+    Сжатые файлы (см. :func:`get_values_from_file`) читаются потоково, для стратегии range строки
+    делятся по количеству, а не по диапазонам байт: первый проход считает строки, второй сохраняет только строки
+    диапазона процесса.
+    Стратегии описаны в :func:`partition_values`
+
+    :param filename: str: Имя файла
+    :param worker: int: Номер рабочего процесса (от 0)
+    :param workers: int: Количество рабочих процессов
+    :param strategy: str, default='range': Стратегия разбиения (range, stride, hash)
+    :param encoding: str, default='utf-8': Кодировка файла
+    :return: list[str]: Строки файла, принадлежащие процессу
+    """
+    _check_partition(worker, workers, strategy)
+    with _open_values_file(filename) as file:
+        if strategy == 'range' and not isinstance(file, BufferedReader):
+            count = sum(1 for _ in iter(file.readline, b''))
+            file.seek(0)
+            return list(islice(_read_lines(file, None, encoding), count * worker // workers,
+                               count * (worker + 1) // workers))
+        if strategy == 'range':
+            size = file.seek(0, SEEK_END)
+            start, stop = size * worker // workers, size * (worker + 1) // workers
+            file.seek(max(start - 1, 0))
+            if start:
+                file.readline()
+            return list(_read_lines(file, stop, encoding))
+
+        lines = _read_lines(file, None, encoding)
+        if strategy == 'stride':
+            return [line for i, line in enumerate(lines) if i % workers == worker]
+        return [line for line in lines if _value_worker(line, workers) == worker]
+
+
+def get_values_partition(value: str, worker: int, workers: int, strategy: str = 'range',
+                         default_value: Optional[str] = None, separator: str = ',') -> Sequence:
+    """
+    Аналог :func:`get_values`, возвращающий только часть значений для рабочего процесса *worker* из *workers*
+
+    Если указан существующий файл, читается только часть файла (см. :func:`get_values_partition_from_file`)
+
+    :example:
+    OBJECT_IDS = get_values_partition(get_str_env_param('OBJECT_IDS'), WORKER_INDEX, WORKERS_COUNT)
+
+    :param value: str: Значение
+    :param worker: int: Номер рабочего процесса (от 0)
+    :param workers: int: Количество рабочих процессов
+    :param strategy: str, default='range': Стратегия разбиения (range, stride, hash)
+    :param default_value: str, optional: Значение по умолчанию
+    :param separator: str, default=',': Разделитель значений
+    :return: Sequence: Часть списка значений
+    """
+    if value and is_file(value):
+        return get_values_partition_from_file(value, worker, workers, strategy)
+    return partition_values(get_values(value, default_value, separator), worker, workers, strategy)
+
+
 def load_env_params(env_filename: Optional[str] = None, **kwargs) -> bool:
     """
-    Загружает .env файл, используя `dotenv.load_dotenv()`
+    Загружает .env файл
+
+    Подстановка значений ${VAR} и ${VAR:-default} (*interpolate* = *True*, по умолчанию) выполняется
+    :class:`env_settings.interpolation.Interpolator`: допускаются ссылки на переменные, объявленные ниже по файлу,
+    ссылка переменной на саму себя (PATH=${PATH}:/extra) разрешается по os.environ, как в `dotenv.load_dotenv()`,
+    каждая переменная разрешается один раз, циклические ссылки передаются обработчику ошибок
+    (значения переменных цикла загружаются без подстановки). Без подстановки используется `dotenv.load_dotenv()`
 
     :param env_filename: str, optional: Имя файла
-    :param kwargs: **, optional: Параметры для передачи в функцию *load_dotenv*
+    :param kwargs: **, optional: Параметры функции *load_dotenv* (stream, verbose, override, interpolate, encoding)
     :return: bool: True, если установлен хотя бы один параметр (переменная среды), иначе False
     """
-    return load_dotenv(env_filename, **kwargs)
+    if not kwargs.get('interpolate', True):
+        return load_dotenv(env_filename, **kwargs)
+    override = kwargs.pop('override', False)
+    kwargs.pop('interpolate', None)
+    values = dotenv_values(env_filename, interpolate=False, **kwargs)
+    if not values:
+        return False
+
+    def lookup(name: str) -> Optional[str]:
+        if name in values and (override or name not in environ):
+            return values[name]
+        return environ.get(name)
+
+    names = [name for name, value in values.items() if value is not None and (override or name not in environ)]
+    interpolator = Interpolator(lookup, templates=set(names), previous=environ.get)
+    try:
+        resolved = interpolator.resolve_all(names)
+    except InterpolationError:
+        resolved = {}
+        for name in names:
+            try:
+                resolved[name] = interpolator.resolve(name)
+            except InterpolationError as e:
+                _env_param_error(config.messages['err_interpolation'].format(name, values[name], str(e)))
+                resolved[name] = values[name]
+    environ.update(resolved)
+    return True
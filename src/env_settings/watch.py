@@ -0,0 +1,327 @@
+"""
+Наблюдение за файлами настроек и инкрементальная генерация .env файла
+
+Модель директорий (параметры каждого файла настроек) хранится в памяти. При изменении файлов повторно
+разбираются только измененные файлы настроек (и архивы, если включен поиск в архивах), после чего .env файл
+перезаписывается. Для отслеживания изменений используется inotify (Linux), в остальных случаях периодический опрос
+"""
+import ctypes
+import ctypes.util
+from concurrent.futures import ThreadPoolExecutor
+from os import O_NONBLOCK, close, path, read, stat, walk
+from pathlib import Path
+from select import select
+from struct import calcsize, unpack_from
+from sys import platform
+from threading import Event
+from time import sleep
+from typing import Iterable, Optional, Union
+
+from .archives import ArchiveMember, find_archive_settings, is_archive
+from .generator import (EnvFileWriter, SettingsParam, _deduplicate_params, _find_settings_files,
+                        _get_settings_params, _is_included_dir)
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_IN_EVENT = 'iIII'
+_IN_EVENT_SIZE = calcsize(_IN_EVENT)
+
+
+def _is_watched(filename: str, settings_filename: str, scan_archives: bool) -> bool:
+    """Проверяет, отслеживаются ли изменения файла: файл настроек или архив (если включен поиск в архивах)"""
+    return filename == settings_filename or scan_archives and is_archive(filename)
+
+
+class _PollingObserver:
+    """Отслеживание изменений файлов настроек периодическим опросом (обход директорий и stat файлов настроек)"""
+
+    def __init__(self, modules_path: str, settings_filename: str, scan_archives: bool = False):
+        self._modules_path = modules_path
+        self._settings_filename = settings_filename
+        self._scan_archives = scan_archives
+        self._mtimes = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        result = {}
+        for root, _, files in walk(Path(self._modules_path), topdown=True):
+            for filename in files:
+                if not _is_watched(filename, self._settings_filename, self._scan_archives):
+                    continue
+                name = path.join(path.curdir, root, filename)
+                try:
+                    file_stat = stat(name)
+                except OSError:
+                    continue
+                result[name] = (file_stat.st_mtime_ns, file_stat.st_size)
+        return result
+
+    def wait(self, timeout: float) -> set[str]:
+        """
+        Ожидает *timeout* секунд и возвращает измененные, созданные и удаленные файлы настроек
+
+        :param timeout: float: Интервал опроса в секундах
+        :return: set[str]: Пути к измененным файлам настроек
+        """
+        sleep(timeout)
+        mtimes = self._scan()
+        changed = {name for name, value in mtimes.items() if self._mtimes.get(name) != value}
+        changed.update(name for name in self._mtimes if name not in mtimes)
+        self._mtimes = mtimes
+        return changed
+
+    def close(self):
+        pass
+
+
+class _InotifyObserver:
+    """
+    Отслеживание изменений файлов настроек через inotify (Linux)
+
+    При удалении или перемещении директории возвращаются файлы настроек всех ее поддиректорий,
+    при переполнении очереди событий дерево директорий обходится повторно и возвращаются все файлы настроек
+    """
+
+    def __init__(self, modules_path: str, settings_filename: str, scan_archives: bool = False):
+        self._modules_path = str(Path(modules_path))
+        self._settings_filename = settings_filename
+        self._scan_archives = scan_archives
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(O_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        self._dirs: dict[int, str] = {}
+        self._files: set[str] = self._add_tree(self._modules_path)
+
+    def _add_tree(self, dirname: str) -> set[str]:
+        """Добавляет наблюдение за директорией и ее поддиректориями, возвращает найденные в них файлы настроек"""
+        found = set()
+        for root, _, files in walk(dirname, topdown=True):
+            wd = self._libc.inotify_add_watch(self._fd, root.encode(), _IN_MASK)
+            if wd >= 0:
+                self._dirs[wd] = root
+            found.update(path.join(path.curdir, root, filename) for filename in files
+                         if _is_watched(filename, self._settings_filename, self._scan_archives))
+        return found
+
+    def _remove_tree(self, dirname: str) -> set[str]:
+        """Прекращает наблюдение за директорией и ее поддиректориями, возвращает известные в них файлы настроек"""
+        prefix = path.join(path.curdir, dirname, '')
+        for wd, root in list(self._dirs.items()):
+            if root == dirname or root.startswith(path.join(dirname, '')):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._dirs[wd]
+        return {name for name in self._files if name.startswith(prefix)}
+
+    def _rescan(self) -> set[str]:
+        """Повторно обходит дерево директорий, возвращает известные ранее и найденные файлы настроек"""
+        for wd, root in list(self._dirs.items()):
+            if not path.isdir(root):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._dirs[wd]
+        return self._files | self._add_tree(self._modules_path)
+
+    def _read_events(self) -> set[str]:
+        changed = set()
+        try:
+            data = read(self._fd, 65536)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = unpack_from(_IN_EVENT, data, offset)
+            name = data[offset + _IN_EVENT_SIZE:offset + _IN_EVENT_SIZE + length].rstrip(b'\0').decode()
+            offset += _IN_EVENT_SIZE + length
+            if mask & _IN_Q_OVERFLOW:
+                changed.update(self._rescan())
+                continue
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            root = self._dirs.get(wd)
+            if root is None or not name:
+                continue
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    changed.update(self._add_tree(path.join(root, name)))
+                elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                    changed.update(self._remove_tree(path.join(root, name)))
+            elif _is_watched(name, self._settings_filename, self._scan_archives):
+                changed.add(path.join(path.curdir, root, name))
+        self._files.update(name for name in changed if path.isfile(name))
+        self._files.difference_update([name for name in changed if not path.isfile(name)])
+        return changed
+
+    def wait(self, timeout: float) -> set[str]:
+        """
+        Ожидает событий файловой системы не более *timeout* секунд и возвращает измененные файлы настроек
+
+        События, поступающие друг за другом (например, при сохранении файла редактором), объединяются
+
+        :param timeout: float: Время ожидания в секундах
+        :return: set[str]: Пути к измененным файлам настроек
+        """
+        changed = set()
+        ready, _, _ = select([self._fd], [], [], timeout)
+        while ready:
+            changed.update(self._read_events())
+            ready, _, _ = select([self._fd], [], [], 0.05)
+        return changed
+
+    def close(self):
+        close(self._fd)
+
+
+def _create_observer(modules_path: str, settings_filename: str, use_inotify: bool = True,
+                     scan_archives: bool = False):
+    """Создает наблюдателя inotify, при его недоступности - наблюдателя с периодическим опросом"""
+    if use_inotify and platform.startswith('linux'):
+        try:
+            return _InotifyObserver(modules_path, settings_filename, scan_archives)
+        except (OSError, AttributeError):
+            pass
+    return _PollingObserver(modules_path, settings_filename, scan_archives)
+
+
+class SettingsWatcher:
+    """
+    Инкрементальная генерация .env файла при изменении файлов настроек
+
+    Хранит в памяти параметры каждого файла настроек. При изменении файла повторно разбирается только он,
+    при изменении архива - файлы настроек этого архива, обход директорий выполняется только при появлении
+    или удалении файлов настроек. Файлы настроек дистрибутивов разбираются при полном построении модели
+    """
+
+    def __init__(self, new_env_filename: str, settings_filename: str = 'settings.py', modules_path: str = '.',
+                 sub_modules_path: Optional[str] = None, include_sub_modules: Optional[tuple[str]] = None,
+                 exclude_params: Optional[tuple[str]] = None, deduplicate: bool = False, merge: bool = False,
+                 comment_removed: bool = False, scan_archives: bool = False,
+                 distributions: Optional[Iterable[str]] = None, executor=None):
+        """
+        :param new_env_filename: str: Имя генерируемого .env-файла (например, '.env.template')
+        :param settings_filename: str, default='settings.py': Имя файла настроек для поиска
+        :param modules_path: str, default='.': Корневая директория для поиска
+        :param sub_modules_path: str, optional: Специфическая поддиректория для поиска модулей (например, 'modules')
+        :param include_sub_modules: tuple[str], optional: Кортеж имен подмодулей для включения в поиск
+        :param exclude_params: tuple[str], optional: Кортеж имен параметров для исключения из результата
+        :param deduplicate: bool, default=False: Записывать параметр, объявленный в нескольких файлах настроек, один раз
+        :param merge: bool, default=False: Обновлять существующий .env файл с сохранением значений \
+        (см. :class:`EnvFileWriter`)
+        :param comment_removed: bool, default=False: В режиме слияния комментировать параметры, \
+        отсутствующие в файлах настроек
+        :param scan_archives: bool, default=False: Искать файлы настроек в zip-архивах, wheel-пакетах и zipapp \
+        без распаковки (изменения архивов отслеживаются)
+        :param distributions: Iterable[str], optional: Имена установленных дистрибутивов для поиска файлов настроек
+        :param executor: SettingsExecutor, optional: Определять параметры выполнением файлов настроек \
+        (см. :class:`env_settings.discovery.SettingsExecutor`)
+        """
+        self._writer = EnvFileWriter(new_env_filename, merge=merge, comment_removed=comment_removed,
+                                     keep_params=exclude_params)
+        self._settings_filename = settings_filename
+        self._modules_path = modules_path
+        self._sub_modules_path = sub_modules_path
+        self._include_sub_modules = include_sub_modules
+        self._exclude_params = exclude_params
+        self._deduplicate = deduplicate
+        self._scan_archives = scan_archives
+        self._distributions = tuple(distributions) if distributions else None
+        self._executor = executor
+        self._params: dict[Union[str, ArchiveMember], tuple[SettingsParam]] = {}
+        self._content: Optional[str] = None
+
+    @property
+    def params(self) -> tuple[SettingsParam]:
+        """Параметры всех файлов настроек в порядке обхода директорий"""
+        params = (param for file_params in self._params.values() for param in file_params)
+        return _deduplicate_params(params) if self._deduplicate else tuple(params)
+
+    def _find_files(self):
+        return _find_settings_files(self._modules_path, self._settings_filename, self._sub_modules_path,
+                                    self._include_sub_modules, self._scan_archives, self._distributions)
+
+    def _parse(self, settings_file) -> tuple[SettingsParam]:
+        if self._executor is not None:
+            return self._executor.settings_params(settings_file, self._modules_path, self._exclude_params)
+        return _get_settings_params(settings_file, self._exclude_params)
+
+    def build(self) -> bool:
+        """
+        Полностью строит модель директорий и записывает .env файл
+
+        :return: bool: True, если .env файл был перезаписан
+        """
+        files = list(self._find_files())
+        if self._executor is not None:
+            with ThreadPoolExecutor(max_workers=self._executor.max_workers) as pool:
+                self._params = dict(zip(files, pool.map(self._parse, files)))
+        else:
+            self._params = {name: self._parse(name) for name in files}
+        return self._write()
+
+    def update(self, changed: set[str]) -> bool:
+        """
+        Обновляет модель по измененным файлам настроек и перезаписывает .env файл при изменении результата
+
+        :param changed: set[str]: Пути к измененным, созданным или удаленным файлам настроек
+        :return: bool: True, если .env файл был перезаписан
+        """
+        reorder = False
+        for name in changed:
+            root = path.normpath(path.dirname(name))
+            included = _is_included_dir(Path(self._modules_path), root, self._sub_modules_path,
+                                        self._include_sub_modules)
+            if self._scan_archives and is_archive(name):
+                for member in [key for key in self._params if isinstance(key, ArchiveMember) and key.archive == name]:
+                    del self._params[member]
+                if included and path.isfile(name):
+                    for member in find_archive_settings(name, self._settings_filename):
+                        self._params[member] = self._parse(member)
+                reorder = True
+            elif included and path.isfile(name):
+                reorder = reorder or name not in self._params
+                self._params[name] = self._parse(name)
+            elif name in self._params:
+                del self._params[name]
+
+        if reorder:
+            self._params = {name: self._params[name] for name in self._find_files() if name in self._params}
+        return self._write()
+
+    def _write(self) -> bool:
+        if self._writer.merge:
+            # файл может редактироваться между изменениями, слияние выполняется с текущим содержимым
+            return self._writer.write(self.params)
+        content = self._writer.format(self.params)
+        if content == self._content:
+            return False
+        with open(self._writer.filename, mode='w', encoding='utf-8') as env_file:
+            env_file.write(content)
+        self._content = content
+        return True
+
+    def run(self, interval: float = 1.0, use_inotify: bool = True, stop: Optional[Event] = None):
+        """
+        Строит модель, записывает .env файл и отслеживает изменения до установки события *stop*
+
+        :param interval: float, default=1.0: Интервал опроса (или ожидания событий inotify) в секундах
+        :param use_inotify: bool, default=True: Использовать inotify, если он доступен
+        :param stop: Event, optional: Событие остановки наблюдения
+        """
+        stop = stop or Event()
+        observer = _create_observer(self._modules_path, self._settings_filename, use_inotify, self._scan_archives)
+        try:
+            self.build()
+            while not stop.is_set():
+                changed = observer.wait(interval)
+                if changed:
+                    self.update(changed)
+        finally:
+            observer.close()
@@ -82,3 +82,11 @@ def test_module_exports():
     assert callable(endless_param_iterator)
     assert callable(param_iterator)
     assert callable(load_env_params)
+
+
+def test_override_config_calls_settings_override(mock_settings_config):
+    """Тест для функции override_config, проверка вызова"""
+    from src.env_settings import override_config
+
+    override_config(error_handling='ignore')
+    mock_settings_config.override.assert_called_once_with(error_handling='ignore')
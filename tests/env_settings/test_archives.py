@@ -0,0 +1,135 @@
+import os
+from importlib.metadata import PackageNotFoundError
+from unittest.mock import MagicMock, patch
+from zipfile import ZIP_BZIP2, ZIP_DEFLATED, ZIP_STORED, BadZipFile, ZipFile
+
+import pytest
+
+from src.env_settings import archives as archives_module
+from src.env_settings.archives import (archive_members, clear_archive_cache, find_archive_settings,
+                                       find_distribution_settings, read_member)
+from src.env_settings.generator import generate_env_file, generate_settings_files
+
+SETTINGS = "# Library host\nLIB_HOST = get_str_env_param('LIB_HOST', default='lib')\n"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    clear_archive_cache()
+    yield
+    clear_archive_cache()
+
+
+def make_archive(filename, members: dict, compression=ZIP_DEFLATED, prefix: bytes = b''):
+    if prefix:
+        filename.write_bytes(prefix)
+    with ZipFile(filename, 'a' if prefix else 'w', compression=compression) as zip_file:
+        for name, content in members.items():
+            zip_file.writestr(name, content)
+    return str(filename)
+
+
+@pytest.mark.parametrize('compression', [ZIP_STORED, ZIP_DEFLATED, ZIP_BZIP2])
+def test_read_member(tmp_path, compression):
+    """Элемент архива читается по индексу без распаковки архива"""
+    content = SETTINGS * 5000
+    archive = make_archive(tmp_path / 'lib.zip', {'lib/settings.py': content, 'lib/other.py': 'x = 1'}, compression)
+    members = {member.name: member for member in archive_members(archive)}
+    assert set(members) == {'lib/settings.py', 'lib/other.py'}
+    assert read_member(members['lib/settings.py']) == content
+    assert str(members['lib/other.py']) == f'{archive}/lib/other.py'
+
+
+def test_read_member_zipapp(tmp_path):
+    """Архив с данными перед zip (zipapp с shebang) читается по скорректированным смещениям"""
+    archive = make_archive(tmp_path / 'app.pyz', {'settings.py': SETTINGS}, prefix=b'#!/usr/bin/env python3\n')
+    assert [read_member(member) for member in find_archive_settings(archive)] == [SETTINGS]
+
+
+@pytest.mark.parametrize('compression', [ZIP_STORED, ZIP_DEFLATED, ZIP_BZIP2])
+def test_read_member_newlines(tmp_path, compression):
+    """Переводы строк CRLF и CR приводятся к LF, как при чтении файла настроек с диска"""
+    archive = make_archive(tmp_path / 'lib.whl', {'lib/settings.py': SETTINGS.replace('\n', '\r\n') + 'A = 1\rB = 2'},
+                           compression)
+    assert [read_member(member) for member in find_archive_settings(archive)] == [SETTINGS + 'A = 1\nB = 2']
+
+
+def test_generate_from_crlf_archive(tmp_path):
+    """Параметры файла настроек с переводами строк CRLF в архиве находятся так же, как на диске"""
+    project = tmp_path / 'project'
+    project.mkdir()
+    content = "DB_HOST = get_str_env_param('DB_HOST')\r\nDB_PORT = get_int_env_param('DB_PORT')\r\n"
+    make_archive(project / 'lib-1.0-py3-none-any.whl', {'lib/settings.py': content})
+    env_file = tmp_path / '.env'
+    generate_env_file(str(env_file), modules_path=str(project), scan_archives=True)
+    assert env_file.read_text() == 'DB_HOST=\n\nDB_PORT=\n'
+
+
+def test_archive_index_cache(tmp_path):
+    """Индекс архива строится один раз и перестраивается при изменении архива"""
+    archive = make_archive(tmp_path / 'lib.whl', {'lib/settings.py': SETTINGS})
+    with patch.object(archives_module, 'ZipFile', wraps=ZipFile) as mock_zip:
+        first = archive_members(archive)
+        assert archive_members(archive) is first
+        assert mock_zip.call_count == 1
+        read_member(first[0])
+        assert mock_zip.call_count == 1
+
+        make_archive(tmp_path / 'lib.whl', {'lib/settings.py': SETTINGS, 'lib/b/settings.py': SETTINGS})
+        os.utime(archive, ns=(1, 1))
+        assert len(archive_members(archive)) == 2
+        assert mock_zip.call_count == 2
+
+
+def test_read_member_changed_archive(tmp_path):
+    """Поврежденный или подмененный элемент обнаруживается по контрольной сумме"""
+    archive = make_archive(tmp_path / 'lib.zip', {'settings.py': SETTINGS}, ZIP_STORED)
+    member = archive_members(archive)[0]
+    data = (tmp_path / 'lib.zip').read_bytes()
+    (tmp_path / 'lib.zip').write_bytes(data.replace(b'LIB_HOST', b'LIB_PORT', 1))
+    with pytest.raises(BadZipFile):
+        read_member(member)
+    (tmp_path / 'broken.zip').write_bytes(b'not a zip')
+    assert archive_members(str(tmp_path / 'broken.zip')) == ()
+
+
+def test_generate_from_archives(tmp_path):
+    """Генератор находит файлы настроек в архивах, только если включено сканирование архивов"""
+    root = tmp_path / 'project'
+    (root / 'vendor').mkdir(parents=True)
+    (root / 'settings.py').write_text("APP_NAME = get_str_env_param('APP_NAME')\n")
+    make_archive(root / 'vendor' / 'lib-1.0-py3-none-any.whl',
+                 {'lib/settings.py': SETTINGS, 'lib/app_settings.py': "OTHER = get_str_env_param('OTHER')\n"})
+    env_file = tmp_path / '.env'
+
+    generate_env_file(str(env_file), modules_path=str(root))
+    assert env_file.read_text() == 'APP_NAME=\n'
+
+    generate_env_file(str(env_file), modules_path=str(root), scan_archives=True)
+    assert env_file.read_text() == 'APP_NAME=\n\n# Library host\nLIB_HOST=\n'
+
+    params = generate_settings_files((), modules_path=str(root), scan_archives=True, deduplicate=True)
+    assert params[1].source.endswith('lib-1.0-py3-none-any.whl/lib/settings.py')
+    assert params[1].line == 2 and params[1].default == 'lib'
+
+
+def test_find_distribution_settings(tmp_path):
+    """Файлы настроек установленного дистрибутива находятся по списку его файлов"""
+    settings_file = tmp_path / 'settings.py'
+    settings_file.write_text(SETTINGS)
+
+    def package_path(name: str, located: str):
+        file = MagicMock()
+        file.name = name
+        file.locate.return_value = located
+        return file
+
+    dist = MagicMock(files=[package_path('settings.py', str(settings_file)), package_path('other.py', 'x'),
+                            package_path('settings.py', str(tmp_path / 'missing.py'))])
+    with patch.object(archives_module, 'distribution', return_value=dist):
+        assert list(find_distribution_settings(['lib'])) == [str(settings_file)]
+        params = generate_settings_files((), modules_path=str(tmp_path / 'empty'), distributions=['lib'])
+    assert [param.name for param in params] == ['LIB_HOST']
+
+    with pytest.raises(PackageNotFoundError):
+        list(find_distribution_settings(['surely-not-installed-distribution']))
@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.env_settings.cli import create_parser, main
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / 'project'
+    (root / 'modules' / 'auth').mkdir(parents=True)
+    (root / 'settings.py').write_text("# Host\nDB_HOST = get_str_env_param('DB_HOST')\n"
+                                      "API_KEY = get_str_env_param('API_KEY')\n")
+    (root / 'modules' / 'auth' / 'settings.py').write_text("AUTH_SECRET = get_str_env_param('AUTH_SECRET')\n")
+    return root
+
+
+def test_generate(project, tmp_path):
+    """Команда generate передает все параметры generate_env_file"""
+    env_file = tmp_path / '.env'
+    assert main(['generate', str(env_file), '--modules-path', str(project), '--sub-modules-path', 'modules',
+                 '--include-sub-modules', 'payment', '--exclude-params', 'API_KEY']) == 0
+
+    content = env_file.read_text()
+    assert 'DB_HOST=' in content
+    assert 'API_KEY=' not in content
+    assert 'AUTH_SECRET=' not in content
+
+
+def test_generate_arguments():
+    """Разбор параметров команды generate"""
+    with patch('src.env_settings.cli.generate_env_file') as mock_generate:
+        main(['generate', '.env', '--settings-filename', 'app_settings.py', '--include-sub-modules', 'a', 'b'])
+    mock_generate.assert_called_once_with('.env', settings_filename='app_settings.py', modules_path='.',
+                                          sub_modules_path=None, include_sub_modules=('a', 'b'),
+                                          exclude_params=None, deduplicate=False, scan_archives=False,
+                                          distributions=None, executor=None, merge=False, comment_removed=False)
+
+    with patch('src.env_settings.cli.generate_env_file') as mock_generate:
+        main(['generate', '.env', '--archives', '--distributions', 'lib-a', 'lib-b'])
+    assert mock_generate.call_args.kwargs['scan_archives'] is True
+    assert mock_generate.call_args.kwargs['distributions'] == ['lib-a', 'lib-b']
+
+    with patch('src.env_settings.cli.generate_env_file') as mock_generate:
+        main(['generate', '.env', '--execute', '--timeout', '2.5', '--workers', '3'])
+    executor = mock_generate.call_args.kwargs['executor']
+    assert (executor.timeout, executor.max_workers) == (2.5, 3)
+
+    with patch('src.env_settings.cli.generate_env_file') as mock_generate:
+        main(['generate', '.env', '--merge', '--comment-removed'])
+    assert mock_generate.call_args.kwargs['merge'] is True
+    assert mock_generate.call_args.kwargs['comment_removed'] is True
+
+
+def test_generate_watch():
+    """Команда generate с параметром --watch запускает наблюдение"""
+    with patch('src.env_settings.cli.SettingsWatcher') as mock_watcher:
+        mock_watcher.return_value.run.side_effect = KeyboardInterrupt
+        assert main(['generate', '.env', '--watch', '--poll', '--interval', '0.5', '--deduplicate']) == 0
+    mock_watcher.assert_called_once_with('.env', settings_filename='settings.py', modules_path='.',
+                                         sub_modules_path=None, include_sub_modules=None, exclude_params=None,
+                                         deduplicate=True, merge=False, comment_removed=False,
+                                         scan_archives=False, distributions=None, executor=None)
+    mock_watcher.return_value.run.assert_called_once_with(interval=0.5, use_inotify=False)
+
+
+def test_generate_watch_merge():
+    """Параметры --merge и --comment-removed передаются наблюдению"""
+    with patch('src.env_settings.cli.SettingsWatcher') as mock_watcher:
+        mock_watcher.return_value.run.side_effect = KeyboardInterrupt
+        assert main(['generate', '.env', '--watch', '--merge', '--comment-removed']) == 0
+    assert mock_watcher.call_args.kwargs['merge'] is True
+    assert mock_watcher.call_args.kwargs['comment_removed'] is True
+
+
+def test_generate_watch_sources():
+    """Параметры --archives, --distributions и --execute передаются наблюдению"""
+    with patch('src.env_settings.cli.SettingsWatcher') as mock_watcher:
+        mock_watcher.return_value.run.side_effect = KeyboardInterrupt
+        assert main(['generate', '.env', '--watch', '--archives', '--distributions', 'lib-a', '--execute',
+                     '--timeout', '2.5']) == 0
+    kwargs = mock_watcher.call_args.kwargs
+    assert (kwargs['scan_archives'], kwargs['distributions']) == (True, ['lib-a'])
+    assert kwargs['executor'].timeout == 2.5
+
+
+def test_command_required():
+    """Команда обязательна"""
+    with pytest.raises(SystemExit):
+        create_parser().parse_args([])
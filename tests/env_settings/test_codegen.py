@@ -0,0 +1,132 @@
+import importlib.util
+import runpy
+from typing import Any, Optional
+
+import pytest
+
+from src.env_settings.cli import main
+from src.env_settings.codegen import SettingsModuleWriter, format_settings_module, generate_settings_module
+from src.env_settings.config import config
+from src.env_settings.generator import _get_settings_params, generate_settings_files
+
+SETTINGS = """from src.env_settings.utils import *
+from src.env_settings.utils import get_values
+
+# Host
+DB_HOST = get_str_env_param('CG_DB_HOST', default='localhost')
+DB_PORT = get_int_env_param('CG_DB_PORT', False, 5432)
+RATIO = get_float_env_param('CG_RATIO', do_obfuscate_log_text=True)
+DEBUG = get_bool_env_param('CG_DEBUG')
+TIMEOUT = get_converted_env_param('CG_TIMEOUT', 'duration', default='30s', max_value=300)
+LIMIT = get_converted_env_param('CG_LIMIT', 'int', default=10)
+MODE = get_converted_env_param('CG_MODE', 'enum', choices=('fast', 'safe'), default='safe')
+IDS = get_values(get_str_env_param('CG_IDS'), 'a')
+"""
+
+
+def _load_module(filename):
+    spec = importlib.util.spec_from_file_location('generated_settings', filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def settings_file(tmp_path):
+    filename = tmp_path / 'settings.py'
+    filename.write_text(SETTINGS)
+    return filename
+
+
+@pytest.fixture
+def generated(settings_file, tmp_path):
+    filename = tmp_path / 'generated.py'
+    generate_settings_files((SettingsModuleWriter(str(filename), package='src.env_settings'),),
+                            modules_path=str(tmp_path))
+    return _load_module(filename)
+
+
+@pytest.mark.parametrize('environ', [
+    {},
+    {'CG_DB_HOST': ' db ', 'CG_DB_PORT': '15', 'CG_RATIO': '1,5', 'CG_DEBUG': 'Yes', 'CG_TIMEOUT': '1m',
+     'CG_LIMIT': '7', 'CG_MODE': 'fast', 'CG_IDS': 'x,y'},
+    {'CG_DB_HOST': '', 'CG_DB_PORT': ' ', 'CG_DEBUG': 'no', 'CG_TIMEOUT': ''},
+])
+def test_generated_matches_runtime(generated, settings_file, monkeypatch, environ):
+    """Сформированная функция загрузки возвращает те же значения, что и процедуры получения значений"""
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+    expected = runpy.run_path(str(settings_file))
+    settings = generated.load_settings()
+    for name in generated.Settings.__slots__:
+        assert getattr(settings, name) == expected[name], name
+
+
+def test_generated_errors(generated):
+    """Ошибки преобразования обрабатываются обработчиком ошибок конфигурации"""
+    with config.override(error_handling='raise'):
+        with pytest.raises(ValueError, match='CG_DB_PORT'):
+            generated.load_settings({'CG_DB_PORT': 'abc'})
+        with pytest.raises(ValueError, match='CG_TIMEOUT'):
+            generated.load_settings({'CG_TIMEOUT': '10m'})
+    with config.override(error_handling='ignore'):
+        settings = generated.load_settings({'CG_DB_PORT': 'abc', 'CG_MODE': 'slow'})
+    assert settings.DB_PORT is None
+    assert settings.MODE is None
+
+
+def test_generated_frozen(generated):
+    """Класс настроек неизменяемый и не содержит __dict__"""
+    settings = generated.load_settings({})
+    with pytest.raises(AttributeError):
+        settings.DB_HOST = 'other'
+    with pytest.raises(AttributeError):
+        del settings.DB_HOST
+    assert not hasattr(settings, '__dict__')
+    assert generated.Settings.__annotations__['DB_PORT'] == Optional[int]
+    assert generated.Settings.__annotations__['TIMEOUT'] == Optional[float]
+    assert generated.Settings.__annotations__['LIMIT'] is Any
+    assert generated._CONVERT_TIMEOUT('2s') == 2
+
+
+def test_format_settings_module_logging(settings_file):
+    source = format_settings_module(_get_settings_params(str(settings_file)))
+    assert "_obfuscate(RATIO)" in source
+    assert "_CONVERT_TIMEOUT = _compile_converter('duration', None, 300, None, None)" in source
+    assert 'from env_settings import get_str_env_param, get_values' in source
+    compile(source, 'generated.py', 'exec')
+
+
+def test_format_settings_module_empty():
+    source = format_settings_module(())
+    namespace = {}
+    exec(compile(source.replace('from env_settings', 'from src.env_settings'), 'generated.py', 'exec'), namespace)
+    assert namespace['Settings'].__slots__ == ()
+    assert namespace['load_settings']({}).__slots__ == ()
+
+
+@pytest.mark.parametrize('declaration', ["A = get_str_env_param(NAME)", "A = get_str_env_param('A', default=x())",
+                                         "A = unknown(get_str_env_param('A'))"])
+def test_format_settings_module_dynamic(tmp_path, declaration):
+    """Объявления, которые невозможно вычислить статически, не поддерживаются"""
+    filename = tmp_path / 'settings.py'
+    filename.write_text(declaration + '\n')
+    with pytest.raises(ValueError, match='settings.py:1'):
+        format_settings_module(_get_settings_params(str(filename)))
+
+
+def test_generate_settings_module(settings_file, tmp_path):
+    filename = tmp_path / 'app_settings.py'
+    generate_settings_module(str(filename), modules_path=str(tmp_path), exclude_params=('IDS',),
+                             class_name='AppSettings', function_name='load')
+    source = filename.read_text()
+    assert 'class AppSettings:' in source
+    assert 'def load(_environ' in source
+    assert 'IDS' not in source
+
+
+def test_cli_codegen(settings_file, tmp_path):
+    filename = tmp_path / 'app_settings.py'
+    assert main(['codegen', str(filename), '--modules-path', str(tmp_path), '--exclude-params', 'DEBUG']) == 0
+    assert 'DB_HOST' in filename.read_text()
+    assert 'DEBUG' not in filename.read_text()
@@ -50,7 +50,9 @@ def test_default_config_values():
     assert 'err_directory' in messages
 
     assert global_config.env_generator_pattern == (
-        r'^(?:\s*(?:#.*)?\s*[\r\n]+)*\s*[A-Z0-9_-]+\s*=\s.*?param.*?\(.*?\).*$')
+        r'^(?:[^\S\r\n]*(?:#[^\r\n]*)?\r?\n)*[^\S\r\n]*[A-Z0-9_-]+[^\S\r\n]*=[^\S\r\n]'
+        r'(?:(?!param)[^\r\n])*param[^(\r\n]*\([^)\r\n]*\)[^\r\n]*$')
+    assert global_config.env_generator_timeout == 10.0
 
 
 def test_configure_messages():
@@ -92,6 +94,17 @@ def test_configure_env_generator_pattern():
     assert global_config.env_generator_pattern == new_pattern
 
 
+def test_configure_sources():
+    """Дополнительные источники значений"""
+    source = {'A': '1'}
+    global_config.configure(sources=[source])
+    assert global_config.sources == (source,)
+    global_config.configure(messages={'log_value': '{}'})
+    assert global_config.sources == (source,)
+    global_config.configure(sources=())
+    assert global_config.sources == ()
+
+
 def test_configure_invalid_messages_type():
     """Проверка обработки неверного типа для messages"""
     with pytest.raises(TypeError, match='messages должен быть словарем'):
@@ -158,3 +171,83 @@ def test_config_singleton_behavior():
     # Изменения в одном экземпляре видны в другом
     config1.configure(error_handling='print')
     assert config2.error_handling == ErrorHandling.PRINT
+
+
+# Тесты для переопределения конфигурации в контексте
+def test_override_config():
+    """Переопределение действует только внутри блока"""
+    global_config.configure(error_handling='print')
+
+    with global_config.override(error_handling='ignore', messages={'err_required': 'Scoped'}):
+        assert global_config.error_handling == ErrorHandling.IGNORE
+        assert global_config.messages['err_required'] == 'Scoped'
+        assert 'err_integer' in global_config.messages
+
+        # configure внутри блока изменяет только текущий контекст
+        global_config.configure(env_generator_pattern='scoped_pattern')
+        assert global_config.env_generator_pattern == 'scoped_pattern'
+
+    assert global_config.error_handling == ErrorHandling.PRINT
+    assert global_config.messages['err_required'].startswith('settings:')
+    assert global_config.env_generator_pattern != 'scoped_pattern'
+
+
+def test_override_config_threads():
+    """Переопределение в одном потоке не влияет на другие потоки"""
+    from threading import Barrier, Thread
+
+    barrier = Barrier(2)
+    results = {}
+
+    def scoped():
+        with global_config.override(error_handling='ignore'):
+            barrier.wait()
+            barrier.wait()
+            results['scoped'] = global_config.error_handling
+
+    def unscoped():
+        barrier.wait()
+        results['unscoped'] = global_config.error_handling
+        barrier.wait()
+
+    threads = [Thread(target=scoped), Thread(target=unscoped)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {'scoped': ErrorHandling.IGNORE, 'unscoped': ErrorHandling.RAISE}
+
+
+def test_override_config_asyncio_tasks():
+    """Переопределение в задаче asyncio не влияет на другие задачи"""
+    import asyncio
+
+    async def task(error_handling):
+        with global_config.override(error_handling=error_handling):
+            await asyncio.sleep(0)
+            return global_config.error_handling
+
+    async def main():
+        return await asyncio.gather(task('print'), task('ignore'), task('exit'))
+
+    assert asyncio.run(main()) == [ErrorHandling.PRINT, ErrorHandling.IGNORE, ErrorHandling.EXIT]
+    assert global_config.error_handling == ErrorHandling.RAISE
+
+
+def test_configure_do_value_logging_and_logger():
+    """Включение и выключение логгирования значений, кеширование логгера"""
+    global_config.configure(do_value_logging=True, logger='test_logger')
+    assert global_config.do_value_logging is True
+    assert global_config.logger is global_config.logger
+    assert global_config.logger.name == 'test_logger'
+
+    with global_config.override(do_value_logging=False):
+        assert global_config.do_value_logging is False
+    assert global_config.do_value_logging is True
+
+
+def test_default_messages_format():
+    """Сообщения по умолчанию форматируются тремя позиционными аргументами"""
+    for key, message in global_config.messages.items():
+        assert message.format('NAME', 'value', 'error'), key
@@ -0,0 +1,171 @@
+from enum import Enum, IntEnum
+from re import compile
+
+import pytest
+
+from src.env_settings.config import ErrorHandling, config as global_config
+from src.env_settings.converters import ConversionError, compile_converter, register_converter, _converters
+from src.env_settings.utils import get_converted_env_param
+
+
+class Mode(Enum):
+    FAST = 'fast'
+    SAFE = 'safe'
+
+
+class Level(IntEnum):
+    OFF = 0
+    ON = 1
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('30', 30.0), ('30s', 30.0), ('1.5h', 5400.0), ('1h30m', 5400.0), ('250ms', 0.25), ('2d', 172800.0),
+    ('1w', 604800.0), ('1m 30s', 90.0), ('.5S', 0.5)
+])
+def test_duration(value, expected):
+    """Преобразование длительности в секунды"""
+    assert compile_converter('duration')(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('value', ['abc', '30x', '1 2', 's', '-5s', '1s2', '1m30', '1h 30', '5 s x'])
+def test_duration_invalid(value):
+    """Недопустимые значения длительности"""
+    with pytest.raises(ConversionError) as e:
+        compile_converter('duration')(value)
+    assert e.value.message_key == 'err_duration'
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('512', 512), ('512B', 512), ('1KB', 1000), ('1k', 1000), ('512MB', 512 * 10 ** 6), ('1KiB', 1024),
+    ('1.5GiB', int(1.5 * 2 ** 30)), ('2 Mi', 2 * 2 ** 20), ('9007199254740993', 2 ** 53 + 1),
+    ('1.000000000000001PB', 10 ** 15 + 1), ('0.1KB', 100)
+])
+def test_bytes(value, expected):
+    """Преобразование размера в байты"""
+    assert compile_converter('bytes')(value) == expected
+
+
+@pytest.mark.parametrize('value', ['MB', '1XB', '1iB', 'ten'])
+def test_bytes_invalid(value):
+    """Недопустимые значения размера"""
+    with pytest.raises(ConversionError) as e:
+        compile_converter('bytes')(value)
+    assert e.value.message_key == 'err_bytes'
+
+
+def test_json_and_url():
+    """Преобразование JSON и проверка URL"""
+    assert compile_converter('json')('{"a": [1, 2]}') == {'a': [1, 2]}
+    with pytest.raises(ConversionError) as e:
+        compile_converter('json')('{a}')
+    assert e.value.message_key == 'err_json'
+
+    assert compile_converter('url')('https://host.local/path') == 'https://host.local/path'
+    with pytest.raises(ConversionError) as e:
+        compile_converter('url')('host.local')
+    assert e.value.message_key == 'err_url'
+
+
+def test_enum():
+    """Преобразование перечислений и набора допустимых значений"""
+    assert compile_converter(Mode)('fast') is Mode.FAST
+    assert compile_converter(Mode)('SAFE') is Mode.SAFE
+    with pytest.raises(ConversionError) as e:
+        compile_converter(Mode)('slow')
+    assert e.value.message_key == 'err_choices'
+    assert e.value.detail == 'fast, safe'
+
+    # элементы с ложным значением (IntEnum OFF = 0)
+    assert compile_converter(Level)('0') is Level.OFF
+    assert compile_converter(Level)('off') is Level.OFF
+
+    assert compile_converter('enum', choices=('a', 'b'))('a') == 'a'
+    with pytest.raises(ValueError, match='choices'):
+        compile_converter('enum')
+
+
+@pytest.mark.parametrize('value, message_key', [
+    ('5', 'err_min'), ('500', 'err_max'), ('1x', 'err_pattern'), ('15', 'err_choices')
+])
+def test_constraints(value, message_key):
+    """Проверка ограничений конвейера"""
+    pipeline = compile_converter('int', min_value=10, max_value=100, choices=(10, 20, 500, 5), pattern=r'\d+')
+    assert pipeline('20') == 20
+    with pytest.raises(ConversionError) as e:
+        pipeline(value)
+    assert e.value.message_key == message_key
+
+
+def test_constraints_type_mismatch():
+    """Ограничения для несравнимого результата вызывают ConversionError"""
+    with pytest.raises(ConversionError) as e:
+        compile_converter('json', min_value=1)('{"a": 1}')
+    assert e.value.message_key == 'err_json'
+    with pytest.raises(ConversionError) as e:
+        compile_converter('json', choices=(1, 2))('[1]')
+    assert e.value.message_key == 'err_choices'
+    assert compile_converter('json', max_value=10)('5') == 5
+
+
+def test_not_str_value():
+    """Значение не строкового типа проверяется только ограничениями"""
+    assert compile_converter('duration', max_value=10, pattern=r'\d+s')(5) == 5
+    with pytest.raises(ConversionError) as e:
+        compile_converter('duration', max_value=10)(60)
+    assert e.value.message_key == 'err_max'
+
+
+def test_compiled_once():
+    """Конвейер компилируется один раз для одинаковых аргументов"""
+    pattern = compile(r'\d+')
+    assert compile_converter('int', pattern=pattern) is compile_converter('int', pattern=pattern)
+    assert compile_converter('duration', max_value=10) is compile_converter('duration', max_value=10)
+    with pytest.raises(ValueError, match='Неизвестный преобразователь'):
+        compile_converter('unknown')
+
+
+def test_register_converter():
+    """Регистрация собственного преобразователя"""
+    register_converter('upper', str.upper)
+    try:
+        assert compile_converter('upper')('abc') == 'ABC'
+    finally:
+        del _converters['upper']
+        compile_converter.cache_clear()
+
+
+class TestGetConvertedEnvParam:
+    """Тесты для get_converted_env_param"""
+
+    @pytest.fixture(autouse=True)
+    def setup_env(self, monkeypatch):
+        monkeypatch.setenv('TIMEOUT', '1m30s')
+        monkeypatch.setenv('SIZE', '1KiB')
+        monkeypatch.setenv('MODE', 'slow')
+
+    def test_values(self):
+        assert get_converted_env_param('TIMEOUT', 'duration') == 90.0
+        assert get_converted_env_param('SIZE', 'bytes', max_value=2048) == 1024
+        assert get_converted_env_param('MISSING', 'duration', default='2s') == 2.0
+        assert get_converted_env_param('MISSING', 'json', default={'a': 1}) == {'a': 1}
+        assert get_converted_env_param('MISSING', 'json', required=True, default={'a': 1}) == {'a': 1}
+        assert get_converted_env_param('MISSING', 'json') is None
+
+    def test_errors(self):
+        global_config.configure(messages={'err_choices': 'Choices error: {}={} ({})',
+                                          'err_max': 'Max error: {}={} ({})'})
+        with pytest.raises(ValueError, match=r'^Choices error: MODE=slow \(fast, safe\)$'):
+            get_converted_env_param('MODE', Mode)
+        with pytest.raises(ValueError, match=r'^Max error: SIZE=1KiB \(100\)$'):
+            get_converted_env_param('SIZE', 'bytes', max_value=100)
+        with pytest.raises(ValueError, match='MISSING'):
+            get_converted_env_param('MISSING', 'bytes', required=True)
+
+        with pytest.raises(ValueError, match=r'^Max error: MISSING=600 \(300\)$'):
+            get_converted_env_param('MISSING', 'duration', default=600, max_value=300)
+        with pytest.raises(ValueError, match=r'^Choices error: MISSING=3 \(1, 2\)$'):
+            get_converted_env_param('MISSING', 'int', default=3, choices=(1, 2))
+
+        global_config.configure(error_handling=ErrorHandling.IGNORE)
+        assert get_converted_env_param('MODE', 'duration') is None
+        assert get_converted_env_param('MISSING', 'duration', default=600, max_value=300) is None
@@ -0,0 +1,107 @@
+import logging
+
+import pytest
+
+from src.env_settings.discovery import SettingsExecutor, _comment
+from src.env_settings.generator import SettingsParam, generate_env_file, generate_settings_files
+
+
+SETTINGS = '''import os
+from env_settings import get_int_env_param, get_str_env_param
+
+print('settings output')
+
+# Database host
+DB_HOST = get_str_env_param('DB_HOST', required=True)
+
+
+def _port(service):
+    return get_int_env_param(f'{service.upper()}_PORT', default=8000)
+
+
+# Ports
+PORTS = [_port(service) for service in ('api', 'admin')]
+DEBUG = os.getenv('DEBUG', '0')
+if False:
+    UNUSED = get_str_env_param('UNUSED')
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / 'project'
+    (root / 'auth').mkdir(parents=True)
+    (root / 'settings.py').write_text(SETTINGS)
+    (root / 'auth' / 'settings.py').write_text("from env_settings import get_str_env_param\n\n"
+                                               "AUTH_SECRET = get_str_env_param('AUTH_SECRET')\n"
+                                               "raise RuntimeError('broken')\n"
+                                               "AFTER = get_str_env_param('AFTER')\n")
+    return root
+
+
+def test_settings_params(project, monkeypatch):
+    """Динамические имена, чтения во вспомогательных функциях и os.getenv; невыполняемые объявления пропускаются"""
+    monkeypatch.setenv('DB_HOST', 'secret-host')
+    settings_file = str(project / 'settings.py')
+    params = SettingsExecutor(timeout=30).settings_params(settings_file)
+    assert params == (
+        SettingsParam('DB_HOST', '# Database host', settings_file, 7, 'get_str_env_param', None, True),
+        SettingsParam('API_PORT', '', settings_file, 11, 'get_int_env_param', 8000, False),
+        SettingsParam('ADMIN_PORT', '', settings_file, 11, 'get_int_env_param', 8000, False),
+        SettingsParam('DEBUG', '', settings_file, 16, 'getenv', '0', False),
+    )
+    assert [param.name for param in SettingsExecutor(timeout=30).settings_params(
+        settings_file, exclude_params=('DEBUG', 'API_PORT'))] == ['DB_HOST', 'ADMIN_PORT']
+
+
+def test_settings_params_sandbox(project):
+    """Файл выполняется с минимальным окружением: переменные процесса недоступны"""
+    (project / 'environ.py').write_text("import os\nif 'PATH' in os.environ and 'HOME' not in os.environ:\n"
+                                        "    VALUE = os.environ['VALUE']\n")
+    params = SettingsExecutor(timeout=30, environ_values={'VALUE': '1'}).settings_params(str(project / 'environ.py'))
+    assert [(param.name, param.getter, param.required) for param in params] == [
+        ('PATH', 'environ', False), ('HOME', 'environ', False), ('VALUE', 'environ', True)]
+
+
+def test_settings_params_error(project, caplog):
+    """При ошибке выполнения сохраняются чтения до ошибки, ошибка записывается в logger"""
+    with caplog.at_level(logging.WARNING):
+        params = SettingsExecutor(timeout=30).settings_params(str(project / 'auth' / 'settings.py'))
+    assert [param.name for param in params] == ['AUTH_SECRET']
+    assert 'RuntimeError: broken' in caplog.text
+
+
+def test_settings_params_timeout(tmp_path, caplog):
+    """Превышение времени выполнения: процесс завершается, параметры определяются по шаблону"""
+    settings_file = tmp_path / 'settings.py'
+    settings_file.write_text("import time\nfrom env_settings import get_str_env_param\n\n"
+                             "# Host\nHOST = get_str_env_param('HOST')\ntime.sleep(60)\n")
+    with caplog.at_level(logging.WARNING):
+        params = SettingsExecutor(timeout=0.5).settings_params(str(settings_file))
+    assert [(param.name, param.description) for param in params] == [('HOST', 'Host')]
+    assert 'превышено время выполнения 0.5 с' in caplog.text
+    assert SettingsExecutor(timeout=0.5, fallback=False).settings_params(str(settings_file)) == ()
+
+
+def test_generate_env_file(project, tmp_path):
+    """Параметры передаются генератору, файлы выполняются параллельно в порядке обхода"""
+    env_file = tmp_path / '.env'
+    generate_env_file(str(env_file), modules_path=str(project), executor=SettingsExecutor(timeout=30, max_workers=2))
+    content = env_file.read_text()
+    assert content.startswith('# Database host\nDB_HOST=\n')
+    for name in ('API_PORT=', 'ADMIN_PORT=', 'DEBUG=', 'AUTH_SECRET='):
+        assert name in content
+    assert 'UNUSED=' not in content
+    assert 'AFTER=' not in content
+
+    params = generate_settings_files((), modules_path=str(project), exclude_params=('DEBUG',),
+                                     executor=SettingsExecutor(timeout=30))
+    assert sorted(param.name for param in params) == ['ADMIN_PORT', 'API_PORT', 'AUTH_SECRET', 'DB_HOST']
+
+
+def test_comment():
+    """Комментарий - строки # непосредственно над строкой объявления"""
+    lines = ['A = 1', '# first', '  # second', 'B = 2']
+    assert _comment(lines, 4) == '# first\n  # second'
+    assert _comment(lines, 1) == ''
+    assert _comment(lines, 0) == ''
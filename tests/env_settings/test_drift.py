@@ -0,0 +1,70 @@
+import pytest
+
+from src.env_settings.cli import main
+from src.env_settings.drift import ENVIRON_SOURCE, DriftReport, EnvDrift, _scan_env_file, find_env_drift
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / 'project'
+    root.mkdir()
+    (root / 'settings.py').write_text("DB_HOST = get_str_env_param('DB_HOST')\n"
+                                      "DB_PORT = get_int_env_param('DB_PORT')\n"
+                                      "API_KEY = get_str_env_param('API_KEY')\n")
+    return root
+
+
+def write_env(directory, name: str, content: str) -> str:
+    filename = directory / name
+    filename.write_text(content)
+    return str(filename)
+
+
+def test_scan_env_file(tmp_path):
+    """Построчное чтение .env файла: комментарии, export, кавычки, многострочные значения"""
+    filename = write_env(tmp_path, '.env', '# comment\n\nexport A=1\nB=\nC = " "\nD="multi\nline"\nE=\'\'\n'
+                                           'F= # comment only\nG="quoted \\" # not comment"\nH\nI=x # c\n')
+    assert _scan_env_file(filename) == (filename, {
+        'A': False, 'B': True, 'C': True, 'D': False, 'E': True, 'F': True, 'G': False, 'H': True, 'I': False})
+    assert _scan_env_file(str(tmp_path / 'missing.env')) == (str(tmp_path / 'missing.env'), None)
+
+
+def test_find_env_drift(project, tmp_path, monkeypatch):
+    """Отсутствующие, лишние и пустые параметры по каждому файлу и os.environ"""
+    complete = write_env(tmp_path, 'complete.env', 'DB_HOST=db\nDB_PORT=5432\nAPI_KEY=key\n')
+    drifted = write_env(tmp_path, 'drifted.env', 'DB_HOST=\nOLD_PARAM=1\nIGNORED=1\n')
+    monkeypatch.setenv('DB_HOST', ' ')
+    monkeypatch.delenv('DB_PORT', raising=False)
+    monkeypatch.setenv('API_KEY', 'key')
+
+    report = find_env_drift([complete, drifted], modules_path=str(project), exclude_params=('IGNORED',),
+                            check_environ=True, max_workers=1)
+    assert report.drifts == (
+        EnvDrift(complete, (), (), ()),
+        EnvDrift(drifted, ('DB_PORT', 'API_KEY'), ('OLD_PARAM',), ('DB_HOST',)),
+        EnvDrift(ENVIRON_SOURCE, ('DB_PORT',), (), ('DB_HOST',)),
+    )
+    assert report
+    assert report.format() == (f'{drifted}: missing DB_PORT, API_KEY; extra OLD_PARAM; empty DB_HOST\n'
+                               f'{ENVIRON_SOURCE}: missing DB_PORT; empty DB_HOST')
+    assert not DriftReport((EnvDrift(complete, (), (), ()),))
+
+
+def test_find_env_drift_parallel(project, tmp_path):
+    """Параллельное чтение файлов дает тот же результат в порядке передачи файлов"""
+    files = [write_env(tmp_path, f'{i}.env', 'DB_HOST=db\nDB_PORT=1\n' + ('API_KEY=1\n' if i % 2 else ''))
+             for i in range(40)]
+    parallel = find_env_drift(files, modules_path=str(project), max_workers=2)
+    assert parallel == find_env_drift(files, modules_path=str(project), max_workers=1)
+    assert [drift.source for drift in parallel.drifts if drift] == files[::2]
+
+
+def test_cli_drift(project, tmp_path, capsys):
+    """Команда drift выводит отчет, код завершения 1 при наличии расхождений"""
+    complete = write_env(tmp_path, 'complete.env', 'DB_HOST=db\nDB_PORT=5432\nAPI_KEY=key\n')
+    assert main(['drift', complete, '--modules-path', str(project)]) == 0
+    assert capsys.readouterr().out == ''
+
+    drifted = write_env(tmp_path, 'drifted.env', 'DB_HOST=db\n')
+    assert main(['drift', complete, drifted, '--modules-path', str(project), '--workers', '1']) == 1
+    assert capsys.readouterr().out == f'{drifted}: missing DB_PORT, API_KEY\n'
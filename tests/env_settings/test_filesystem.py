@@ -0,0 +1,99 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from src.env_settings.filesystem import check_paths, create_directory, is_dir, is_file, path_cache, stat_path
+from src.env_settings.utils import get_file_env_param, get_filedir_env_param
+
+
+def test_stat_path(tmp_path):
+    """Результат stat для существующего и несуществующего пути"""
+    assert stat_path(str(tmp_path)) is not None
+    assert stat_path(str(tmp_path / 'missing')) is None
+    assert stat_path(None) is None
+    assert stat_path('') is None
+
+
+def test_is_file_is_dir(tmp_path):
+    """Проверка типа пути одним вызовом stat"""
+    file_path = tmp_path / 'file.txt'
+    file_path.write_text('content')
+
+    with patch('src.env_settings.filesystem.stat', wraps=os.stat) as mock_stat:
+        assert is_file(str(file_path)) is True
+        assert mock_stat.call_count == 1
+
+    assert is_dir(str(file_path)) is False
+    assert is_dir(str(tmp_path)) is True
+    assert is_file(str(tmp_path)) is False
+    assert is_file(None) is False
+    assert is_dir(str(tmp_path / 'missing')) is False
+
+
+def test_path_cache_memoizes(tmp_path):
+    """Внутри path_cache каждый путь проверяется один раз"""
+    file_path = str(tmp_path / 'file.txt')
+    (tmp_path / 'file.txt').write_text('content')
+
+    with patch('src.env_settings.filesystem.stat', wraps=os.stat) as mock_stat:
+        with path_cache() as cache:
+            with path_cache() as nested_cache:
+                assert nested_cache is cache
+                assert is_file(file_path)
+            assert is_file(file_path)
+            assert not is_dir(file_path)
+        assert mock_stat.call_count == 1
+
+        # Вне кеша путь проверяется заново
+        assert is_file(file_path)
+        assert mock_stat.call_count == 2
+
+
+def test_create_directory(tmp_path):
+    """Создание каталога и сброс кеша после создания"""
+    new_dir = str(tmp_path / 'a' / 'b')
+    with path_cache():
+        assert not is_dir(new_dir)
+        create_directory(new_dir)
+        assert is_dir(new_dir)
+
+    # Повторное создание не является ошибкой
+    create_directory(new_dir)
+    assert is_dir(new_dir)
+
+
+def test_create_directory_concurrently(tmp_path):
+    """Одновременное создание одного каталога из нескольких потоков"""
+    new_dir = str(tmp_path / 'shared' / 'dir')
+    with patch('src.env_settings.filesystem.stat_path', return_value=None):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(create_directory, [new_dir] * 32))
+    assert is_dir(new_dir)
+
+
+def test_check_paths(tmp_path):
+    """Параллельная проверка набора путей с удалением дублей"""
+    (tmp_path / 'file.txt').write_text('content')
+    names = [str(tmp_path / 'file.txt'), str(tmp_path), str(tmp_path / 'file.txt'), str(tmp_path / 'missing'), None]
+
+    with patch('src.env_settings.filesystem.stat', wraps=os.stat) as mock_stat:
+        result = check_paths(names, max_workers=4)
+        assert mock_stat.call_count == 3
+
+    assert list(result.keys()) == [str(tmp_path / 'file.txt'), str(tmp_path), str(tmp_path / 'missing')]
+    assert result[str(tmp_path / 'missing')] is None
+    assert result[str(tmp_path)] is not None
+
+
+def test_check_paths_fills_cache(tmp_path, monkeypatch):
+    """Результаты параллельной проверки используются процедурами get_*_env_param"""
+    (tmp_path / 'file.txt').write_text('content')
+    monkeypatch.setenv('FILE_PARAM', str(tmp_path / 'file.txt'))
+    monkeypatch.setenv('DIR_PARAM', str(tmp_path))
+
+    with patch('src.env_settings.filesystem.stat', wraps=os.stat) as mock_stat:
+        with path_cache():
+            check_paths([str(tmp_path / 'file.txt'), str(tmp_path)])
+            assert get_file_env_param('FILE_PARAM') == str(tmp_path / 'file.txt')
+            assert get_filedir_env_param('DIR_PARAM') == str(tmp_path)
+        assert mock_stat.call_count == 2
@@ -1,3 +1,4 @@
+import json
 import os
 from pathlib import Path
 from unittest.mock import patch, mock_open, call
@@ -5,7 +6,10 @@ from unittest.mock import patch, mock_open, call
 import pytest
 
 from src.env_settings.config import config
-from src.env_settings.generator import _get_settings_values, generate_env_file
+from src.env_settings.generator import (_get_settings_values, generate_env_file, _get_settings_params,
+                                        SettingsParam, EnvFileWriter, JsonSchemaWriter, ConfigMapWriter,
+                                        MarkdownWriter, generate_settings_files, ParamIndex, ParamConflict,
+                                        REMOVED_PREFIX, SettingsWriter)
 
 
 # Фикстура для временной структуры файлов
@@ -195,3 +199,225 @@ def test_generate_env_file_formatting(setup_files, tmp_path):
     assert len(content) == 4
     assert content[2] == 'DB_HOST='
     assert content[3] == ''
+
+
+# Тесты для _get_settings_params
+def test_get_settings_params(setup_files):
+    settings_file = setup_files / 'settings.py'
+    result = _get_settings_params(str(settings_file))
+
+    assert [param.name for param in result] == ['DB_HOST', 'DB_PORT', 'API_KEY']
+    assert [param.line for param in result] == [4, 6, 9]
+    assert result[0] == SettingsParam('DB_HOST', '\n# Database settings\n# Hostname', str(settings_file), 4,
+                                      'get_str_env_param', 'localhost', False)
+    assert result[0].description == 'Database settings\nHostname'
+    assert result[1].getter == 'get_int_env_param'
+    assert result[1].value_type == 'integer'
+    assert result[1].default == 5432
+    assert result[2].default is None
+    assert result[2].value_type == 'string'
+
+
+@pytest.mark.parametrize('declaration, expected', [
+    ("A = get_bool_env_param('A', True, True)", ('get_bool_env_param', True, True)),
+    ("A = get_float_env_param('A', required=True, default=1.5)", ('get_float_env_param', 1.5, True)),
+    ("A = env_settings.get_str_env_param('A', default=DEFAULT)", ('get_str_env_param', None, False)),
+    ("A = get_values(get_str_env_param('A', default='a,b'), separator=' ')[0]", ('get_str_env_param', 'a,b', False)),
+    ("A = get_str_env_param('A', default=(", ('get_str_env_param', None, False)),
+    ("A = get_converted_env_param('A', 'bytes', True, '512MB')", ('get_converted_env_param', '512MB', True)),
+    ("A = get_converted_env_param('A', 'int', default=5)", ('get_converted_env_param', 5, False)),
+])
+def test_get_settings_params_declarations(tmp_path, declaration, expected):
+    settings_file = tmp_path / 'settings.py'
+    settings_file.write_text(declaration + '\n')
+    config.configure(env_generator_pattern=r'^A = .*$')
+    result = _get_settings_params(str(settings_file))
+
+    assert (result[0].getter, result[0].default, result[0].required) == expected
+
+
+# Тесты для писателей
+@pytest.fixture
+def params():
+    return (SettingsParam('DB_HOST', '# Database\n# Hostname', 'settings.py', 2, 'get_str_env_param', 'localhost'),
+            SettingsParam('DB_PORT', '', 'settings.py', 3, 'get_int_env_param', 5432, True),
+            SettingsParam('DEBUG', '# Debug | mode', 'settings.py', 5, 'get_bool_env_param'))
+
+
+def test_settings_writer_abstract():
+    """Базовый писатель нельзя создать без реализации format"""
+    with pytest.raises(TypeError):
+        SettingsWriter('file.txt')
+
+
+def test_env_file_writer(params):
+    assert EnvFileWriter('.env').format(params) == (
+        '# Database\n# Hostname\nDB_HOST=\n\nDB_PORT=\n\n# Debug | mode\nDEBUG=\n')
+
+
+def test_json_schema_writer(params):
+    schema = json.loads(JsonSchemaWriter('schema.json', title='App').format(params))
+
+    assert schema['title'] == 'App'
+    assert schema['required'] == ['DB_PORT']
+    assert schema['properties'] == {
+        'DB_HOST': {'type': 'string', 'description': 'Database\nHostname', 'default': 'localhost'},
+        'DB_PORT': {'type': 'integer', 'default': 5432},
+        'DEBUG': {'type': 'boolean', 'description': 'Debug | mode'}}
+    assert 'required' not in json.loads(JsonSchemaWriter('schema.json').format(()))
+
+
+def test_config_map_writer(params):
+    assert ConfigMapWriter('configmap.yaml', name='app', namespace='prod').format(params) == (
+        'apiVersion: v1\nkind: ConfigMap\nmetadata:\n  name: app\n  namespace: prod\ndata:\n'
+        '  # Database\n  # Hostname\n  DB_HOST: "localhost"\n  DB_PORT: "5432"\n  # Debug | mode\n  DEBUG: ""\n')
+    assert ConfigMapWriter('configmap.yaml').format(()).endswith('data: {}\n')
+
+
+def test_markdown_writer(params):
+    rows = MarkdownWriter('SETTINGS.md').format(params).splitlines()
+
+    assert len(rows) == 5
+    assert rows[2] == '| `DB_HOST` | string | нет | `localhost` | Database<br>Hostname |'
+    assert rows[3] == '| `DB_PORT` | integer | да | `5432` |  |'
+    assert rows[4] == '| `DEBUG` | boolean | нет |  | Debug \\| mode |'
+
+
+# Тесты для generate_settings_files
+def test_generate_settings_files(setup_files, tmp_path):
+    env_file = tmp_path / '.env'
+    schema_file = tmp_path / 'schema.json'
+    config_map_file = tmp_path / 'configmap.yaml'
+    markdown_file = tmp_path / 'SETTINGS.md'
+
+    with patch('src.env_settings.generator.walk', wraps=os.walk) as mock_walk:
+        result = generate_settings_files(
+            (EnvFileWriter(str(env_file)), JsonSchemaWriter(str(schema_file)), ConfigMapWriter(str(config_map_file)),
+             MarkdownWriter(str(markdown_file))),
+            modules_path=str(setup_files), sub_modules_path='modules', include_sub_modules=('auth',),
+            exclude_params=('API_KEY',))
+        mock_walk.assert_called_once()
+
+    assert sorted(param.name for param in result) == ['AUTH_SECRET', 'DB_HOST', 'DB_PORT']
+
+    # Шаблон .env совпадает с результатом generate_env_file
+    expected_env_file = tmp_path / 'expected.env'
+    generate_env_file(new_env_filename=str(expected_env_file), modules_path=str(setup_files),
+                      sub_modules_path='modules', include_sub_modules=('auth',), exclude_params=('API_KEY',))
+    assert env_file.read_text() == expected_env_file.read_text()
+
+    assert set(json.loads(schema_file.read_text())['properties']) == {'AUTH_SECRET', 'DB_HOST', 'DB_PORT'}
+    assert 'DB_PORT: "5432"' in config_map_file.read_text()
+    assert '| `AUTH_SECRET` |' in markdown_file.read_text()
+
+
+# Тесты для ParamIndex
+@pytest.fixture
+def duplicated_files(setup_files):
+    (setup_files / 'modules' / 'auth' / 'settings.py').write_text(
+        "# Auth host\nDB_HOST = get_str_env_param('DB_HOST', default='auth-db')\n"
+        "DB_PORT = get_int_env_param('DB_PORT', default=5432)\n")
+    (setup_files / 'modules' / 'payment' / 'settings.py').write_text(
+        "DB_PORT = get_str_env_param('DB_PORT', True, '5432')\n")
+    return setup_files
+
+
+def test_param_index(duplicated_files):
+    index = ParamIndex.from_settings(modules_path=str(duplicated_files), sub_modules_path='modules',
+                                     include_sub_modules=('auth', 'payment'))
+
+    assert set(index) == {'DB_HOST', 'DB_PORT', 'API_KEY'}
+    assert len(index) == 3
+    assert 'DB_HOST' in index
+    assert 'MISSING' not in index
+    assert index.get('MISSING') == ()
+    assert len(index.get('DB_PORT')) == 3
+    assert len(index.sources('DB_PORT')) == 3
+    assert set(index.duplicates()) == {'DB_HOST', 'DB_PORT'}
+    assert [param.name for param in index.params()] == ['DB_HOST', 'DB_PORT', 'API_KEY']
+    assert index.params()[0].source.endswith(os.path.join('project', 'settings.py'))
+
+    conflicts = {(conflict.name, conflict.field) for conflict in index.conflicts()}
+    assert conflicts == {('DB_HOST', 'default'), ('DB_PORT', 'getter'), ('DB_PORT', 'default'),
+                         ('DB_PORT', 'required')}
+
+
+def test_param_conflict_str():
+    conflict = ParamConflict('A', 'default', (SettingsParam('A', '', 'a.py', 1, default=1),
+                                              SettingsParam('A', '', 'b.py', 2, default='1')))
+    assert str(conflict) == "A: различается default (a.py:1 1, b.py:2 '1')"
+
+
+def test_param_index_scales():
+    params = [SettingsParam(f'PARAM_{i % 20000}', '', f'file_{i}.py', i) for i in range(40000)]
+    index = ParamIndex(params)
+
+    assert len(index) == 20000
+    assert len(index.duplicates()) == 20000
+    assert index.conflicts() == ()
+
+
+def test_generate_env_file_deduplicate(duplicated_files, tmp_path):
+    env_file = tmp_path / '.env'
+    with patch('src.env_settings.generator.config.logger.warning') as mock_warning:
+        generate_env_file(new_env_filename=str(env_file), modules_path=str(duplicated_files),
+                          sub_modules_path='modules', include_sub_modules=('auth', 'payment'), deduplicate=True)
+
+    content = env_file.read_text()
+    assert content.count('DB_HOST=') == 1
+    assert content.count('DB_PORT=') == 1
+    assert '# Hostname' in content
+    assert '# Auth host' not in content
+    assert mock_warning.call_count == 4
+    assert 'DB_PORT' in mock_warning.call_args_list[1][0][0]
+
+    # Без дедупликации параметры записываются для каждого файла
+    generate_env_file(new_env_filename=str(env_file), modules_path=str(duplicated_files),
+                      sub_modules_path='modules', include_sub_modules=('auth', 'payment'))
+    assert env_file.read_text().count('DB_PORT=') == 3
+
+
+# Тесты для слияния .env файла
+def test_env_file_writer_merge(params):
+    """Значения и порядок строк сохраняются, новые параметры дописываются, удаленные комментируются"""
+    content = ('# custom comment\r\nDB_PORT=6432\r\nexport OLD="multi\nline"\nKEPT=1\n'
+               f'{REMOVED_PREFIX}DEBUG=1\n# DB_HOST=commented\n')
+    writer = EnvFileWriter('.env', merge=True, comment_removed=True, keep_params=('KEPT',))
+    assert writer.merge_content(content, params) == (
+        f'# custom comment\r\nDB_PORT=6432\r\n{REMOVED_PREFIX}export OLD="multi\n{REMOVED_PREFIX}line"\n'
+        'KEPT=1\nDEBUG=1\n# DB_HOST=commented\n\n# Database\n# Hostname\nDB_HOST=\n')
+    assert EnvFileWriter('.env', merge=True).merge_content('OLD=1', params[1:2]) == 'OLD=1\n\nDB_PORT=\n'
+    assert EnvFileWriter('.env', merge=True).merge_content('', params[1:2]) == 'DB_PORT=\n'
+
+
+def test_env_file_writer_merge_newline(params):
+    """Новые параметры дописываются с переводом строки существующего файла"""
+    writer = EnvFileWriter('.env', merge=True)
+    merged = writer.merge_content('A=1\r\n', params[:2])
+    assert merged == writer.merge_content('A=1\n', params[:2]).replace('\n', '\r\n')
+    assert '\r\n# Hostname\r\nDB_HOST=\r\n' in merged
+    assert merged.count('\n') == merged.count('\r\n')
+    assert writer.merge_content('A=1\r\nB=2', params[1:2]) == 'A=1\r\nB=2\r\n\r\nDB_PORT=\r\n'
+    assert writer.merge_content('A=1\r', params[1:2]) == 'A=1\r\rDB_PORT=\r'
+
+
+def test_generate_env_file_merge(setup_files, tmp_path):
+    """Слияние: заполненные значения сохраняются, файл записывается только при изменении содержимого"""
+    env_file = tmp_path / '.env'
+    assert generate_env_file(str(env_file), modules_path=str(setup_files), exclude_params=('API_KEY',), merge=True)
+    generated = env_file.read_text()
+    assert 'DB_HOST=\n' in generated
+
+    env_file.write_text(generated.replace('DB_HOST=\n', 'DB_HOST=db.local\n') + 'API_KEY=secret\nOLD_PARAM=1\n')
+    mtime = env_file.stat().st_mtime_ns
+    assert not generate_env_file(str(env_file), modules_path=str(setup_files), exclude_params=('API_KEY',),
+                                 merge=True)
+    assert env_file.stat().st_mtime_ns == mtime
+
+    assert generate_env_file(str(env_file), modules_path=str(setup_files), exclude_params=('API_KEY',),
+                             merge=True, comment_removed=True)
+    content = env_file.read_text()
+    assert 'DB_HOST=db.local\n' in content
+    assert 'API_KEY=secret\n' in content
+    assert f'{REMOVED_PREFIX}OLD_PARAM=1\n' in content
+    assert content.count('DB_HOST=') == 1
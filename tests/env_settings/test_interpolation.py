@@ -0,0 +1,146 @@
+import os
+
+import pytest
+
+from src.env_settings.config import config
+from src.env_settings.interpolation import InterpolationError, Interpolator, _parse
+from src.env_settings.utils import get_int_env_param, get_str_env_param, load_env_params
+
+
+def test_resolve():
+    """Ссылки разрешаются в порядке зависимостей, поддерживаются значения по умолчанию"""
+    env = {
+        'DATABASE_URL': 'postgres://${DB_USER}@${DB_HOST}/${DB_NAME:-app}',
+        'DB_HOST': '${DB_HOST_NAME}:${DB_PORT}',
+        'DB_HOST_NAME': 'db',
+        'DB_PORT': '5432',
+        'DB_USER': 'user',
+        'EMPTY': '${MISSING}',
+    }
+    interpolator = Interpolator(env.get)
+    assert interpolator.resolve('DATABASE_URL') == 'postgres://user@db:5432/app'
+    assert interpolator.resolve('EMPTY') == ''
+    assert interpolator.resolve('MISSING') is None
+    assert interpolator.resolve_all(['DB_HOST', 'DB_PORT']) == {'DB_HOST': 'db:5432', 'DB_PORT': '5432'}
+    assert interpolator.expand('${DB_USER}-${DB_PORT}') == 'user-5432'
+
+
+def test_resolve_memoized():
+    """Каждая переменная запрашивается один раз за обход, результаты запоминаются до изменения значений"""
+    env = {'A': '${C}-${B}', 'B': '${C}!', 'C': 'c'}
+    lookups = []
+
+    def lookup(name):
+        lookups.append(name)
+        return env.get(name)
+
+    interpolator = Interpolator(lookup)
+    assert interpolator.resolve_all(['A', 'B']) == {'A': 'c-c!', 'B': 'c!'}
+    assert sorted(lookups) == ['A', 'B', 'C']
+    memo = interpolator._memo['A']
+    assert interpolator.resolve('A') == 'c-c!'
+    assert interpolator._memo['A'] is memo
+
+    env['C'] = 'changed'
+    assert interpolator.resolve('A') == 'changed-changed!'
+
+
+def test_resolve_cycle():
+    """Циклические ссылки обнаруживаются с указанием цикла"""
+    interpolator = Interpolator({'A': 'x${B}', 'B': '${C}', 'C': '${A}', 'D': '${D}'}.get)
+    with pytest.raises(InterpolationError, match='A -> B -> C -> A'):
+        interpolator.resolve('A')
+    with pytest.raises(InterpolationError, match='D -> D'):
+        interpolator.resolve('D')
+
+
+def test_resolve_previous():
+    """Ссылка на саму себя разрешается по предыдущему значению, если задана функция его получения"""
+    env = {'PATH': '${PATH}:/extra', 'A': '${B}', 'B': '${PATH}', 'C': '${C:-c}'}
+    interpolator = Interpolator(env.get, previous={'PATH': '/bin'}.get)
+    assert interpolator.resolve('PATH') == '/bin:/extra'
+    assert interpolator.resolve('A') == '/bin:/extra'
+    assert interpolator.resolve('C') == 'c'
+    env['A'] = '${B}'
+    env['B'] = '${A}'
+    with pytest.raises(InterpolationError, match='A -> B -> A'):
+        interpolator.resolve('A')
+
+
+def test_templates():
+    """Значения переменных, не являющихся шаблонами, подставляются без изменений"""
+    interpolator = Interpolator({'A': '${B}', 'B': '${C}', 'C': 'c'}.get, templates={'A'})
+    assert interpolator.resolve('A') == '${C}'
+
+
+def test_parse_cached():
+    """Шаблон строки разбирается один раз"""
+    assert _parse('${A}/${B:-b}/${A}') is _parse('${A}/${B:-b}/${A}')
+    assert _parse('${A}/${B:-b}/${A}').refs == ('A', 'B')
+
+
+def test_get_str_env_param_interpolate(monkeypatch):
+    """Подстановка значений процедурами получения значений включается конфигурацией или параметром"""
+    monkeypatch.setenv('ITP_HOST', 'db')
+    monkeypatch.setenv('ITP_PORT', '${ITP_BASE_PORT}')
+    monkeypatch.setenv('ITP_BASE_PORT', '5432')
+    monkeypatch.setenv('ITP_URL', 'postgres://${ITP_HOST}:${ITP_PORT}')
+    assert get_str_env_param('ITP_URL') == 'postgres://${ITP_HOST}:${ITP_PORT}'
+    assert get_str_env_param('ITP_URL', interpolate=True) == 'postgres://db:5432'
+
+    config.configure(interpolate=True)
+    assert get_int_env_param('ITP_PORT') == 5432
+    assert get_str_env_param('ITP_MISSING', default='${ITP_HOST}/app') == 'db/app'
+    monkeypatch.setenv('ITP_HOST', 'db2')
+    assert get_str_env_param('ITP_URL') == 'postgres://db2:5432'
+
+
+def test_get_str_env_param_cycle(monkeypatch):
+    """Циклическая ссылка передается обработчику ошибок"""
+    monkeypatch.setenv('ITP_A', '${ITP_B}')
+    monkeypatch.setenv('ITP_B', '${ITP_A}')
+    config.configure(interpolate=True)
+    with pytest.raises(ValueError, match='ITP_A'):
+        get_str_env_param('ITP_A')
+    config.configure(error_handling='ignore')
+    assert get_str_env_param('ITP_A') == '${ITP_B}'
+
+
+def test_load_env_params_interpolate(tmp_path, monkeypatch):
+    """Ссылки на переменные ниже по файлу и переменные окружения разрешаются при загрузке .env файла"""
+    for name in ('ITP_URL', 'ITP_HOST', 'ITP_NAME', 'ITP_RAW', 'ITP_CYCLE'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv('ITP_USER', 'env_user')
+    monkeypatch.setenv('ITP_LITERAL', '${ITP_HOST}')
+    env_file = tmp_path / '.env'
+    env_file.write_text('ITP_URL=postgres://${ITP_USER}@${ITP_HOST}/${ITP_NAME:-app}/${ITP_LITERAL}\n'
+                        'ITP_HOST=db\nITP_USER=file_user\nITP_RAW=${ITP_HOST}\n', encoding='utf-8')
+
+    assert load_env_params(str(env_file)) is True
+    assert os.environ['ITP_URL'] == 'postgres://env_user@db/app/${ITP_HOST}'
+    assert os.environ['ITP_USER'] == 'env_user'
+
+    assert load_env_params(str(env_file), override=True, interpolate=False) is True
+    assert os.environ['ITP_RAW'] == '${ITP_HOST}'
+
+    monkeypatch.setenv('ITP_HOST', 'other')
+    assert load_env_params(str(env_file), override=True) is True
+    assert os.environ['ITP_URL'] == 'postgres://file_user@db/app/${ITP_HOST}'
+
+    env_file.write_text('ITP_CYCLE=${ITP_NAME}x\nITP_NAME=${ITP_CYCLE}\nITP_HOST=h\n', encoding='utf-8')
+    config.configure(error_handling='ignore')
+    assert load_env_params(str(env_file), override=True) is True
+    assert os.environ['ITP_CYCLE'] == '${ITP_NAME}x'
+    assert os.environ['ITP_HOST'] == 'h'
+    assert load_env_params(str(tmp_path / 'missing.env')) is False
+
+
+def test_load_env_params_self_reference(tmp_path, monkeypatch):
+    """Ссылка переменной на саму себя разрешается по os.environ, как в dotenv.load_dotenv"""
+    monkeypatch.setenv('ITP_PATH', '/bin')
+    monkeypatch.delenv('ITP_NEW', raising=False)
+    env_file = tmp_path / '.env'
+    env_file.write_text('ITP_PATH=${ITP_PATH}:/extra\nITP_NEW=${ITP_NEW}/x\n', encoding='utf-8')
+    assert load_env_params(str(env_file), override=True) is True
+    assert os.environ['ITP_PATH'] == '/bin:/extra'
+    assert os.environ['ITP_NEW'] == '/x'
@@ -0,0 +1,81 @@
+import pytest
+
+from src.env_settings import membership
+from src.env_settings.membership import (BloomIndex, SetIndex, SortedIndex, get_values_index, membership_index)
+
+VALUES = ['id-3', 'id-1', 'значение', '', 'id-2', 'id-1']
+
+
+@pytest.mark.parametrize('backend', ['set', 'sorted', 'bloom'])
+def test_membership_index(backend):
+    """Все типы индексов дают точный результат проверки вхождения"""
+    index = membership_index(VALUES, backend)
+    assert len(index) == 5
+    assert sorted(index) == sorted(set(VALUES))
+    for value in VALUES:
+        assert value in index
+    for value in ('id-4', 'id', 'id-10', 'значение!', None, 1):
+        assert value not in index
+
+
+def test_membership_index_auto(monkeypatch):
+    """Тип индекса выбирается по количеству значений"""
+    assert isinstance(membership_index(iter(VALUES)), SetIndex)
+    monkeypatch.setattr(membership, 'SET_MAX_SIZE', 3)
+    index = membership_index(iter(VALUES))
+    assert isinstance(index, BloomIndex)
+    assert 'id-2' in index
+    with pytest.raises(ValueError, match='Недопустимый тип индекса'):
+        membership_index(VALUES, 'list')
+
+
+def test_sorted_index_empty():
+    """Пустой индекс"""
+    index = SortedIndex([])
+    assert len(index) == 0
+    assert 'a' not in index
+    assert 'a' not in BloomIndex(index)
+
+
+def test_index_newline_query():
+    """Значение с переводом строки не совпадает с соседними значениями блока (в т.ч. после ложного срабатывания)"""
+    index = SortedIndex(['alice', 'bob', 'carol'])
+    for value in ('alice\nbob', 'bob\ncarol', '\nbob', 'alice\n'):
+        assert value not in index
+    bloom = BloomIndex(index)
+    bloom.might_contain = lambda value: True
+    assert 'alice\nbob' not in bloom
+
+
+def test_bloom_index_false_positives():
+    """Доля ложных срабатываний фильтра близка к заданной, значения списка всегда проходят фильтр"""
+    index = BloomIndex((f'value-{i}' for i in range(5000)), false_positive_rate=0.01)
+    assert all(index.might_contain(f'value-{i}') for i in range(5000))
+    false_positives = sum(index.might_contain(f'other-{i}') for i in range(20000))
+    assert false_positives < 20000 * 0.03
+    with pytest.raises(ValueError):
+        BloomIndex(VALUES, false_positive_rate=1)
+    with pytest.raises(ValueError):
+        BloomIndex(VALUES, hashes=0)
+
+
+def test_sorted_index_blocks(monkeypatch):
+    """Значения находятся на границах блоков разреженного списка ключей"""
+    monkeypatch.setattr(SortedIndex, 'BLOCK_SIZE', 3)
+    values = [f'v{i:03}' for i in range(0, 40, 2)]
+    index = SortedIndex(values)
+    assert list(index) == values
+    assert all(value in index for value in values)
+    assert not any(f'v{i:03}' in index for i in range(-1, 41, 2))
+    with pytest.raises(ValueError, match='перевод строки'):
+        SortedIndex(['a\nb'])
+
+
+def test_get_values_index(tmp_path):
+    """Индекс значений строки или файла"""
+    values_file = tmp_path / 'deny.txt'
+    values_file.write_text('a\nb\n', encoding='utf-8')
+    assert 'b' in get_values_index(str(values_file), backend='sorted')
+    assert 'c' in get_values_index('a,c', backend='bloom')
+    assert 'd' in get_values_index(None, default_value='d')
+    assert len(get_values_index('')) == 0
@@ -0,0 +1,109 @@
+from enum import Enum
+
+import pytest
+
+from src.env_settings.config import config
+from src.env_settings.namespace import EnvIndex, get_env_namespace
+from src.env_settings.tenants import TenantStore
+
+ENV = {
+    'DB_PRIMARY__HOST': ' db1 ',
+    'DB_PRIMARY__PORT': '5432',
+    'DB_PRIMARY__DEBUG': 'yes',
+    'DB_PRIMARY__EMPTY': ' ',
+    'DB_PRIMARYX__HOST': 'other',
+    'DB_PRIMARY': 'scalar',
+    'DB_REPLICA__0__HOST': 'db2',
+    'DB_REPLICA__0__PORT': '5433',
+    'DB_REPLICA__1__HOST': 'db3',
+    'DB_REPLICA__1__PORT': '5434',
+    'DB_REPLICA__1': 'weight',
+    'DB_REPLICA__TIMEOUT': '1m',
+    'OTHER': 'x',
+}
+
+
+class Mode(Enum):
+    FAST = 'fast'
+
+
+def test_namespace():
+    """Группа переменных по префиксу, без переменных с похожими префиксами"""
+    index = EnvIndex(ENV)
+    assert index.namespace('DB_PRIMARY') == {'HOST': 'db1', 'PORT': '5432', 'DEBUG': 'yes', 'EMPTY': None}
+    assert index.namespace('MISSING') == {}
+
+
+def test_namespace_types():
+    """Значения преобразуются по правилам процедур получения значений"""
+    index = EnvIndex(ENV)
+    assert index.namespace('DB_PRIMARY', types={'PORT': 'int', 'DEBUG': 'bool', 'EMPTY': 'int'}) == \
+        {'HOST': 'db1', 'PORT': 5432, 'DEBUG': True, 'EMPTY': None}
+    assert index.namespace('DB_PRIMARY', types={'PORT': float}, default_type='bool', lowercase=True) == \
+        {'host': False, 'port': 5432.0, 'debug': True, 'empty': False}
+
+
+def test_namespace_nested():
+    """Ключи разделяются на уровни вложенности, типы задаются шаблонами"""
+    index = EnvIndex(ENV)
+    assert index.namespace('DB_REPLICA', types={'*__PORT': 'int', 'TIMEOUT': 'duration'}) == {
+        '0': {'HOST': 'db2', 'PORT': 5433},
+        '1': {'HOST': 'db3', 'PORT': 5434, '': 'weight'},
+        'TIMEOUT': 60.0,
+    }
+    assert EnvIndex({'APP.A.B': '1', 'APP.C': '2'}).namespace('APP', delimiter='.', lowercase=True) == \
+        {'a': {'b': '1'}, 'c': '2'}
+
+
+def test_namespace_errors():
+    """Ошибки преобразования обрабатываются обработчиком ошибок конфигурации"""
+    index = EnvIndex({'APP__PORT': 'abc', 'APP__MODE': 'slow'})
+    with pytest.raises(ValueError, match='APP__PORT'):
+        index.namespace('APP', types={'PORT': 'int'})
+    with config.override(error_handling='ignore'):
+        assert index.namespace('APP', types={'PORT': 'int', 'MODE': Mode}) == {'PORT': None, 'MODE': None}
+    assert EnvIndex({'APP__MODE': 'FAST'}).namespace('APP', types={'MODE': Mode}) == {'MODE': Mode.FAST}
+
+
+def test_names():
+    index = EnvIndex(ENV)
+    assert index.names('DB_REPLICA__1') == ['DB_REPLICA__1', 'DB_REPLICA__1__HOST', 'DB_REPLICA__1__PORT']
+    assert index.names() == sorted(ENV)
+
+
+def test_refresh():
+    """Индекс не обращается к окружению до вызова refresh"""
+    env = {'APP__A': '1'}
+    index = EnvIndex(env)
+    env['APP__B'] = '2'
+    assert index.namespace('APP') == {'A': '1'}
+    index.refresh()
+    assert index.namespace('APP') == {'A': '1', 'B': '2'}
+
+
+def test_get_env_namespace(monkeypatch):
+    """Значения читаются при каждом вызове, как процедурами получения значений"""
+    monkeypatch.setenv('NS_TEST__PORT', '80')
+    assert get_env_namespace('NS_TEST', types={'PORT': 'int'}) == {'PORT': 80}
+    monkeypatch.setenv('NS_TEST__HOST', 'host')
+    assert get_env_namespace('NS_TEST') == {'PORT': '80', 'HOST': 'host'}
+    monkeypatch.delenv('NS_TEST__PORT')
+    monkeypatch.setenv('NS_TEST__HOST', 'new-host')
+    assert get_env_namespace('NS_TEST') == {'HOST': 'new-host'}
+
+
+def test_get_env_namespace_lookup(monkeypatch, tmp_path):
+    """Окружение арендатора, дополнительные источники значений и подстановка ${VAR}"""
+    class Source(dict):
+        pass
+
+    monkeypatch.setenv('NS_LOOKUP__HOST', 'env-host')
+    monkeypatch.setenv('NS_LOOKUP__URL', 'http://${NS_LOOKUP__HOST}')
+    config.configure(sources=(Source({'NS_LOOKUP__PORT': '81', 'NS_LOOKUP__HOST': 'remote-host'}),),
+                     interpolate=True)
+    assert get_env_namespace('NS_LOOKUP', types={'PORT': 'int'}) == {
+        'HOST': 'env-host', 'PORT': 81, 'URL': 'http://env-host'}
+
+    (tmp_path / 'acme.env').write_text('NS_LOOKUP__HOST=acme-host\n')
+    with TenantStore(str(tmp_path)).tenant('acme'):
+        assert get_env_namespace('NS_LOOKUP') == {'HOST': 'acme-host', 'PORT': '81'}
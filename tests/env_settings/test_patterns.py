@@ -0,0 +1,124 @@
+from itertools import count
+from re import MULTILINE
+from time import perf_counter
+from unittest.mock import patch
+
+import pytest
+
+from src.env_settings.config import config
+from src.env_settings.generator import _get_settings_params
+from src.env_settings.patterns import PatternError, check_pattern, compile_pattern, find_matches, iter_chunks
+
+LEGACY_PATTERN = r'^(?:\s*(?:#.*)?\s*[\r\n]+)*\s*[A-Z0-9_-]+\s*=\s.*?param.*?\(.*?\).*$'
+
+
+@pytest.mark.parametrize('pattern', [
+    config.env_generator_pattern,
+    r'^.*API_KEY.*$',
+    r'^(\d+\.)*\d+$',
+    r'(\w+\s*,\s*)*\w+',
+    r'(a|ab)*c',
+    r'(?:foo|bar)+',
+    r'(?:#.*\n)*X',
+    r'(?s)(?-s:(?:#.*\n)*X)',
+    r'^\s*([A-Z_]+)=.*param.*\(.*\).*$',
+    r'[a-z]*[0-9]*',
+    r'.*(?:a|b).*',
+    r'(?>.*).*',
+])
+def test_check_pattern_safe(pattern):
+    """Шаблоны без катастрофического возврата принимаются"""
+    check_pattern(pattern)
+
+
+@pytest.mark.parametrize('pattern', [
+    LEGACY_PATTERN,
+    r'(a+)+b',
+    r'(\w+\s?)*$',
+    r'(.*a){2,}',
+    r'(a|aa)*',
+    r'(a|a)*',
+    r'(?s)(?:#.*\n)*X',
+    r'(?s:(?:#.*\n)*X)',
+    r'.*.*',
+    r'\s*.*',
+    r'.*?x?.*?',
+    r'(\w+)(\w*)=',
+    r'(',
+])
+def test_check_pattern_unsafe(pattern):
+    """Вложенные квантификаторы и повторения неоднозначных альтернатив отклоняются"""
+    with pytest.raises(PatternError, match='шаблон'):
+        check_pattern(pattern)
+
+
+def test_check_pattern_polynomial():
+    """Соседние неограниченные повторения с общими символами отклоняются: время возврата растет полиномиально"""
+    pattern = r'^\s*([A-Z_]+).*.*.*.*=.*param.*\(.*\).*$'
+    with pytest.raises(PatternError, match='полиномиальный возврат'):
+        check_pattern(pattern)
+
+
+def test_compile_pattern():
+    """Шаблон компилируется один раз с флагом MULTILINE"""
+    regex = compile_pattern(r'^A = .*$')
+    assert regex is compile_pattern(r'^A = .*$')
+    assert regex.flags & MULTILINE
+
+
+def test_configure_pattern():
+    """Шаблон проверяется и компилируется при конфигурировании"""
+    assert config.env_generator_regex.pattern == config.env_generator_pattern
+    config.configure(env_generator_pattern=r'^A = .*$', env_generator_timeout=1.5)
+    assert config.env_generator_regex.pattern == r'^A = .*$'
+    assert config.env_generator_timeout == 1.5
+
+    with pytest.raises(PatternError, match='катастрофический возврат'):
+        config.configure(env_generator_pattern=LEGACY_PATTERN)
+    assert config.env_generator_pattern == r'^A = .*$'
+
+    config.configure(env_generator_timeout=0)
+    assert config.env_generator_timeout is None
+
+
+def test_iter_chunks():
+    """Фрагмент - комментарии и одно объявление верхнего уровня, перевод строки относится к следующему фрагменту"""
+    content = "# c\n\nA = f(\n    1)\nB = 'a(' \\\n    'b'\n# tail"
+    assert [content[start:end] for start, end in iter_chunks(content)] == [
+        "# c\n\nA = f(\n    1)", "\nB = 'a(' \\\n    'b'", '\n# tail']
+    assert [end - start for start, end in iter_chunks('#\n' * 5, max_lines=2)] == [3, 4, 3]
+
+
+def test_find_matches_same_as_whole_content():
+    """Совпадения по фрагментам совпадают с совпадениями по всему содержимому"""
+    content = ("\n\n# Тайм-аут\n# в секундах\nTIMEOUT = get_int_env_param('TIMEOUT', default=30)\n"
+               "DATA = dict(\n    a=1,\n)\n\n    \nDEBUG = get_bool_env_param('DEBUG')\nx = 1\n")
+    regex = config.env_generator_regex
+    expected = [(match.span(), match.group(0)) for match in regex.finditer(content)]
+    assert len(expected) == 2
+    assert [(match.span(), match.group(0)) for match in find_matches(regex, content)] == expected
+
+
+def test_find_matches_timeout():
+    """При превышении бюджета времени разбора файла вызывается исключение с именем файла"""
+    content = "A = get_str_env_param('A')\n" * 3
+    with patch('src.env_settings.patterns.monotonic', side_effect=count(0, 5)):
+        matches = find_matches(config.env_generator_regex, content, 'settings.py', timeout=7)
+        assert next(matches).group(0) == "A = get_str_env_param('A')"
+        with pytest.raises(PatternError, match='settings.py'):
+            list(matches)
+
+
+@pytest.mark.parametrize('content', [
+    '\n' * 20000 + 'x\n',
+    '# comment line\n' * 20000 + 'x = 1\n',
+    '    \n' * 20000,
+    'A = ' + 'param(' * 20000 + '\n',
+])
+def test_pathological_files(tmp_path, content):
+    """Разбор неблагоприятных файлов выполняется за линейное время"""
+    settings_file = tmp_path / 'settings.py'
+    settings_file.write_text(content, encoding='utf-8')
+    start = perf_counter()
+    assert _get_settings_params(str(settings_file)) == ()
+    assert perf_counter() - start < 5
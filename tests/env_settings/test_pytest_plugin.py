@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.env_settings.config import config
+from src.env_settings.pytest_plugin import EnvSnapshot, reload_settings, set_env_params
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_env_snapshot():
+    """Восстанавливаются измененные, добавленные и удаленные переменные и конфигурация"""
+    env = {'A': '1', 'B': '2'}
+    snapshot = EnvSnapshot(env)
+    env.update(A='changed', C='3')
+    del env['B']
+    config.configure(error_handling='ignore')
+    snapshot.restore()
+    assert env == {'A': '1', 'B': '2'}
+    assert str(config.error_handling) == 'raise'
+
+
+def test_set_env_params(monkeypatch):
+    """Значения приводятся к строке, None удаляет переменную"""
+    monkeypatch.setenv('PLUGIN_REMOVED', 'x')
+    monkeypatch.delenv('PLUGIN_INT', raising=False)
+    set_env_params({'PLUGIN_INT': 5}, PLUGIN_REMOVED=None)
+    assert os.environ['PLUGIN_INT'] == '5'
+    assert 'PLUGIN_REMOVED' not in os.environ
+    monkeypatch.delenv('PLUGIN_INT')
+
+
+def test_reload_settings(tmp_path, monkeypatch):
+    """Модуль выполняется повторно в своем пространстве имен, байт-код кешируется до изменения файла"""
+    settings_file = tmp_path / 'plugin_settings.py'
+    settings_file.write_text("import os\nVALUE = os.environ.get('PLUGIN_VALUE')\n", encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv('PLUGIN_VALUE', 'first')
+    module = reload_settings('plugin_settings')
+    assert module.VALUE == 'first'
+
+    monkeypatch.setenv('PLUGIN_VALUE', 'second')
+    assert reload_settings(module) is module
+    assert module.VALUE == 'second'
+
+    settings_file.write_text("VALUE = 'changed'\n", encoding='utf-8')
+    os.utime(settings_file, ns=(1, 1))
+    assert reload_settings(module).VALUE == 'changed'
+    monkeypatch.delitem(sys.modules, 'plugin_settings')
+
+
+def test_plugin(tmp_path):
+    """Фикстуры и маркер плагина изолируют тесты"""
+    (tmp_path / 'plugin_settings.py').write_text(
+        "from src.env_settings import get_int_env_param\nTIMEOUT = get_int_env_param('PLUGIN_TIMEOUT', default=1)\n",
+        encoding='utf-8')
+    (tmp_path / 'test_inner.py').write_text('''
+import os
+
+import pytest
+
+import plugin_settings
+from src.env_settings.config import config
+
+
+def test_params(env_params, settings_reloader):
+    env_params(PLUGIN_TIMEOUT=30, PLUGIN_OTHER='x')
+    config.configure(error_handling='ignore')
+    assert settings_reloader('plugin_settings').TIMEOUT == 30
+
+
+@pytest.mark.env_params(PLUGIN_TIMEOUT='5')
+def test_marker(settings_reloader):
+    assert settings_reloader(plugin_settings).TIMEOUT == 5
+
+
+def test_restored():
+    assert 'PLUGIN_TIMEOUT' not in os.environ and 'PLUGIN_OTHER' not in os.environ
+    assert str(config.error_handling) == 'raise'
+    assert plugin_settings.TIMEOUT == 1
+''', encoding='utf-8')
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join((str(ROOT), str(tmp_path)))}
+    env.pop('PLUGIN_TIMEOUT', None)
+    result = subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'src.env_settings.pytest_plugin',
+                             '-p', 'no:cacheprovider', str(tmp_path / 'test_inner.py')],
+                            cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert '3 passed' in result.stdout
+
+
+@pytest.mark.parametrize('isolation, expected', [('true', '2 passed'), ('false', '1 failed')])
+def test_plugin_isolation_option(tmp_path, isolation, expected):
+    """Параметр ini env_settings_isolation включает изоляцию всех тестов"""
+    (tmp_path / 'pytest.ini').write_text(f'[pytest]\nenv_settings_isolation = {isolation}\n', encoding='utf-8')
+    (tmp_path / 'test_inner.py').write_text('''
+import os
+
+
+def test_set():
+    os.environ['PLUGIN_LEAK'] = '1'
+
+
+def test_leak():
+    assert 'PLUGIN_LEAK' not in os.environ
+''', encoding='utf-8')
+    env = {**os.environ, 'PYTHONPATH': str(ROOT)}
+    result = subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'src.env_settings.pytest_plugin',
+                             '-p', 'no:cacheprovider', 'test_inner.py'],
+                            cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60)
+    assert expected in result.stdout, result.stdout + result.stderr
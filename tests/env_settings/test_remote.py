@@ -0,0 +1,228 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from src.env_settings import remote as remote_module
+from src.env_settings.config import config
+from src.env_settings.remote import RemoteSource
+from src.env_settings.utils import get_int_env_param, get_str_env_param
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.server.status != 200:
+            body = b'error'
+        else:
+            keys = parse_qs(urlsplit(self.path).query).get('keys')
+            values = self.server.values
+            if keys:
+                values = {key: values[key] for key in keys[0].split(',') if key in values}
+            body = json.dumps(values).encode()
+        self.send_response(self.server.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.server.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = self.server.close_connection
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Локальный HTTP сервис ключ/значение"""
+    http_server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    http_server.daemon_threads = True
+    http_server.values = {'DB_HOST': 'remote-host', 'DB_PORT': 5432, 'FLAGS': {'a': True}}
+    http_server.status = 200
+    http_server.requests = []
+    http_server.connections = 0
+    http_server.close_connection = False
+    thread = threading.Thread(target=http_server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Управляемое время для проверки ttl"""
+    now = [1000.0]
+    monkeypatch.setattr(remote_module, 'monotonic', lambda: now[0])
+    return now
+
+
+def _url(server, path='/values'):
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+
+def test_remote_source_cache(server, clock):
+    """Все значения загружаются одним запросом и кешируются на время ttl"""
+    with RemoteSource(_url(server), ttl=10) as source:
+        assert source.get('DB_HOST') == 'remote-host'
+        assert source.get('DB_PORT') == '5432'
+        assert source.get('FLAGS') == '{"a": true}'
+        assert source.get('MISSING') is None
+    assert server.requests == ['/values']
+
+
+def test_remote_source_keys(server, clock):
+    """Ключи значений сервиса загружаются по правилам get"""
+    with RemoteSource(_url(server), ttl=10) as source:
+        assert sorted(source.keys()) == ['DB_HOST', 'DB_PORT', 'FLAGS']
+        assert source.get('DB_HOST') == 'remote-host'
+    assert server.requests == ['/values']
+    server.status = 500
+    assert RemoteSource(_url(server)).keys() == []
+
+
+def test_remote_source_batches(server):
+    """Ключи запрашиваются пакетами по постоянным соединениям из пула"""
+    keys = ['DB_HOST', 'DB_PORT', 'FLAGS', 'OTHER']
+    with RemoteSource(_url(server, '/values?env=prod'), keys=keys, batch_size=2, max_connections=2) as source:
+        assert source.get('DB_HOST') == 'remote-host'
+        assert source.get('FLAGS') == '{"a": true}'
+        for _ in range(5):
+            assert source.refresh()
+    assert sorted(server.requests[:2]) == ['/values?env=prod&keys=DB_HOST%2CDB_PORT',
+                                           '/values?env=prod&keys=FLAGS%2COTHER']
+    assert len(server.requests) == 12
+    assert server.connections <= 2
+
+
+def test_remote_source_stale_while_revalidate(server, clock):
+    """После ttl возвращается устаревшее значение, обновление выполняется в фоне"""
+    source = RemoteSource(_url(server), ttl=10, stale_ttl=20)
+    assert source.get('DB_HOST') == 'remote-host'
+
+    server.values['DB_HOST'] = 'new-host'
+    clock[0] += 5
+    assert source.get('DB_HOST') == 'remote-host'
+    assert len(server.requests) == 1
+
+    clock[0] += 10
+    refreshed = threading.Event()
+    original_refresh = source.refresh
+    source.refresh = lambda: (original_refresh(), refreshed.set())[0]
+    assert source.get('DB_HOST') == 'remote-host'
+    assert refreshed.wait(5)
+    assert source.get('DB_HOST') == 'new-host'
+    assert len(server.requests) == 2
+    source.close()
+
+
+def test_remote_source_expired(server, clock):
+    """После ttl + stale_ttl значения загружаются синхронно"""
+    source = RemoteSource(_url(server), ttl=10, stale_ttl=0)
+    assert source.get('DB_HOST') == 'remote-host'
+    server.values['DB_HOST'] = 'new-host'
+    clock[0] += 10
+    assert source.get('DB_HOST') == 'new-host'
+    source.close()
+
+
+def test_remote_source_errors(server, clock, caplog):
+    """При ошибке загрузки используются ранее загруженные значения, ошибка записывается в logger"""
+    source = RemoteSource(_url(server), ttl=10, stale_ttl=0)
+    assert source.get('DB_HOST') == 'remote-host'
+    server.status = 500
+    clock[0] += 10
+    assert source.get('DB_HOST') == 'remote-host'
+    assert 'HTTP 500' in caplog.text
+
+    assert RemoteSource(_url(server)).get('DB_HOST') is None
+    assert RemoteSource('http://127.0.0.1:9/values', timeout=0.5).get('DB_HOST') is None
+    source.close()
+
+
+def test_remote_source_retry_interval(server, clock):
+    """После ошибки загрузки значения не загружаются в течение retry_interval"""
+    server.status = 500
+    source = RemoteSource(_url(server), ttl=10, stale_ttl=0, retry_interval=30)
+    assert source.get('DB_HOST') is None
+    assert source.get('DB_PORT') is None
+    clock[0] += 29
+    assert source.get('DB_HOST') is None
+    assert len(server.requests) == 1
+
+    server.status = 200
+    clock[0] += 1
+    assert source.get('DB_HOST') == 'remote-host'
+    assert len(server.requests) == 2
+
+    server.status = 500
+    clock[0] += 10
+    for _ in range(3):
+        assert source.get('DB_HOST') == 'remote-host'
+    assert len(server.requests) == 3
+    source.close()
+
+
+def test_connection_pool_unexpected_error(server, monkeypatch):
+    """Место соединения в пуле освобождается при любой ошибке запроса"""
+    pool = remote_module._ConnectionPool(_url(server), 1, 5.0)
+
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patched:
+        patched.setattr(remote_module.HTTPConnection, 'getresponse', interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            pool.request('/values', {})
+    assert json.loads(pool.request('/values', {}))['DB_HOST'] == 'remote-host'
+    pool.close()
+
+
+def test_remote_source_reconnect(server):
+    """Закрытое сервером простаивающее соединение заменяется новым"""
+    server.close_connection = True
+    with RemoteSource(_url(server)) as source:
+        for _ in range(3):
+            assert source.refresh()
+    assert server.connections == 3
+
+
+def test_connection_pool_closing_server(server):
+    """Соединения, закрытые сервером (Connection: close), освобождают место в пуле для ожидающих потоков"""
+    server.close_connection = True
+    pool = remote_module._ConnectionPool(_url(server), 1, 5.0)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.request('/values', {}))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert len(results) == 4
+    assert server.connections == 4
+    pool.close()
+
+
+def test_remote_source_invalid_url():
+    with pytest.raises(ValueError):
+        RemoteSource('ftp://host/values')
+
+
+def test_getters_sources(server, monkeypatch):
+    """Процедуры получения значений используют источник, если переменная окружения не задана"""
+    monkeypatch.setenv('DB_HOST', 'env-host')
+    monkeypatch.delenv('DB_PORT', raising=False)
+    monkeypatch.delenv('MISSING', raising=False)
+    with RemoteSource(_url(server)) as source:
+        config.configure(sources=(source,))
+        assert get_str_env_param('DB_HOST') == 'env-host'
+        assert get_int_env_param('DB_PORT') == 5432
+        assert get_str_env_param('MISSING', default='default') == 'default'
@@ -0,0 +1,93 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.env_settings.config import config
+from src.env_settings.rollout import RolloutFlag, get_rollout_env_param
+
+
+@pytest.mark.parametrize('value, percent, allow', [
+    ('25%', 25.0, frozenset()),
+    (' 0.5% , tenant-1,tenant-2 ', 0.5, frozenset({'tenant-1', 'tenant-2'})),
+    ('tenant-1', 0.0, frozenset({'tenant-1'})),
+    ('true', 100.0, frozenset()),
+    ('Yes', 100.0, frozenset()),
+    ('0', 0.0, frozenset()),
+    ('', 0.0, frozenset()),
+    (None, 0.0, frozenset()),
+])
+def test_parse(value, percent, allow):
+    """Разбор процента, разрешенных ключей и логических значений"""
+    flag = RolloutFlag.parse(value, 'FEATURE')
+    assert (flag.percent, flag.allow) == (percent, allow)
+
+
+@pytest.mark.parametrize('value', ['abc%', '101%', '-1%', '10%,20%'])
+def test_parse_invalid(value):
+    with pytest.raises(ValueError):
+        RolloutFlag.parse(value, 'FEATURE')
+
+
+def test_enabled_distribution():
+    """Доля включенных ключей соответствует проценту, разрешенные ключи включены всегда"""
+    keys = [f'user-{i}' for i in range(20000)]
+    flag = RolloutFlag('FEATURE', 25, allow=('vip',))
+    share = sum(map(flag.enabled, keys)) / len(keys)
+    assert 0.23 < share < 0.27
+    assert flag.enabled('vip') and flag('vip')
+    assert flag.enabled(b'user-1') == flag.enabled('user-1')
+    assert not any(map(RolloutFlag('FEATURE', 0).enabled, keys))
+    assert all(map(RolloutFlag('FEATURE', 100).enabled, keys))
+
+
+def test_enabled_allow_bytes():
+    """Разрешенные ключи проверяются и для ключей bytes"""
+    flag = RolloutFlag.parse('0%,tenant-1,тенант', 'F')
+    assert flag.enabled('tenant-1') and flag.enabled(b'tenant-1')
+    assert flag.enabled('тенант'.encode()) and flag('тенант')
+    assert not flag.enabled(b'tenant-2')
+
+
+def test_enabled_stable():
+    """Корзина зависит только от наименования флага и ключа, увеличение процента сохраняет включенные ключи"""
+    keys = [f'user-{i}' for i in range(5000)]
+    small = {key for key in keys if RolloutFlag('FEATURE', 10).enabled(key)}
+    large = {key for key in keys if RolloutFlag('FEATURE', 50).enabled(key)}
+    assert small < large
+    other = {key for key in keys if RolloutFlag('OTHER_FEATURE', 10).enabled(key)}
+    assert other != small
+    # crc32 и перемешивание стабильны между процессами и версиями Python
+    assert RolloutFlag('FEATURE', 10).bucket('user-1') == 2973486179
+
+
+def test_enabled_independent():
+    """Наборы ключей разных флагов независимы: два флага по 10% пересекаются примерно на 1% ключей"""
+    keys = [f'user-{i:06d}' for i in range(100000)]
+    cohorts = {name: {key for key in keys if RolloutFlag(name, 10).enabled(key)}
+               for name in ('NEW_UI', 'FLAG_1', 'FLAG_2', 'NEW_CHECKOUT')}
+    names = sorted(cohorts)
+    for i, name in enumerate(names):
+        for other in names[i + 1:]:
+            assert 700 < len(cohorts[name] & cohorts[other]) < 1300, (name, other)
+
+
+def test_flag_bool_eq_repr():
+    assert not RolloutFlag('F')
+    assert RolloutFlag('F', allow=('a',))
+    assert RolloutFlag('F', 0.1)
+    assert RolloutFlag.parse('25%,b,a', 'F') == RolloutFlag('F', 25, ('a', 'b'))
+    assert repr(RolloutFlag('F', 25, ('b', 'a'))) == "RolloutFlag('F', 25%,a,b)"
+
+
+def test_get_rollout_env_param():
+    """Получение флага из переменной окружения, ошибки передаются обработчику ошибок"""
+    with patch.dict('os.environ', {'FEATURE_X': '25%,tenant-1', 'FEATURE_BAD': 'x%'}):
+        flag = get_rollout_env_param('FEATURE_X')
+        assert flag == RolloutFlag('FEATURE_X', 25, ('tenant-1',))
+        assert get_rollout_env_param('FEATURE_MISSING', default='100%').enabled('any')
+        assert not get_rollout_env_param('FEATURE_MISSING')
+
+        with pytest.raises(ValueError, match='FEATURE_BAD=x%'):
+            get_rollout_env_param('FEATURE_BAD')
+        config.configure(error_handling='ignore')
+        assert get_rollout_env_param('FEATURE_BAD') == RolloutFlag('FEATURE_BAD')
@@ -0,0 +1,83 @@
+import pickle
+from multiprocessing import get_context
+
+import pytest
+
+from src.env_settings.shared import attach_values, share_values
+from src.env_settings.utils import endless_param_iterator, param_iterator
+
+
+def _read_values(values):
+    return list(values)
+
+
+def _read_by_name(name):
+    with attach_values(name) as values:
+        return values[-1]
+
+
+def test_share_values():
+    """Значения доступны по индексу и срезу, в том числе пустые и не ASCII"""
+    with share_values(['first', '', 'значение', 'last']) as values:
+        assert len(values) == 4
+        assert values[0] == 'first'
+        assert values[1] == ''
+        assert values[2] == 'значение'
+        assert values[-1] == 'last'
+        assert values[1:3] == ['', 'значение']
+        assert 'last' in values
+        with pytest.raises(IndexError):
+            values[4]
+
+
+def test_share_values_empty():
+    with share_values([]) as values:
+        assert len(values) == 0
+        assert list(param_iterator(values)) == []
+
+
+def test_share_values_iterators():
+    """Список в разделяемой памяти работает с итераторами значений"""
+    with share_values(['a', 'b']) as values:
+        assert list(param_iterator(values)) == ['a', 'b']
+        iterator = endless_param_iterator(values)
+        assert [next(iterator) for _ in range(3)] == ['a', 'b', 'a']
+
+
+def test_share_values_read_only():
+    with share_values(['a']) as values:
+        with pytest.raises(TypeError):
+            values._data[0] = 0
+
+
+def test_attach_values():
+    """Подключение по имени не удаляет блок памяти при закрытии"""
+    with share_values(['a', 'b']) as values:
+        attached = attach_values(values.name)
+        assert list(attached) == ['a', 'b']
+        attached.close()
+        with attach_values(values.name) as attached:
+            assert list(attached) == ['a', 'b']
+
+    with pytest.raises(FileNotFoundError):
+        attach_values(values.name)
+
+
+def test_share_values_pickle():
+    """При передаче в другой процесс передается только имя блока памяти"""
+    with share_values(['a' * 1000] * 100) as values:
+        data = pickle.dumps(values)
+        assert len(data) < 200
+        restored = pickle.loads(data)
+        assert restored[99] == 'a' * 1000
+        restored.close()
+
+
+@pytest.mark.parametrize('method', ['fork', 'spawn'])
+def test_share_values_workers(method):
+    """Рабочие процессы читают значения из разделяемой памяти"""
+    values_list = [f'value_{i}' for i in range(1000)]
+    with share_values(values_list) as values:
+        with get_context(method).Pool(2) as pool:
+            assert pool.map(_read_values, [values, values]) == [values_list, values_list]
+            assert pool.apply(_read_by_name, (values.name,)) == 'value_999'
@@ -0,0 +1,130 @@
+import os
+from os import environ
+
+import pytest
+
+from src.env_settings.config import config
+from src.env_settings.tenants import TenantStore
+from src.env_settings.utils import get_int_env_param, get_str_env_param
+
+
+def write_tenant(directory, name: str, content: str, mtime_ns: int = None):
+    filename = directory / f'{name}.env'
+    filename.write_text(content, encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(filename, ns=(mtime_ns, mtime_ns))
+    return filename
+
+
+def test_tenant_values_isolated(tmp_path, monkeypatch):
+    """Значения арендаторов не попадают в os.environ и не смешиваются между арендаторами"""
+    monkeypatch.setenv('TIMEOUT', '99')
+    write_tenant(tmp_path, 'acme', 'TIMEOUT=10\nHOST=acme.local\nDEBUG=yes\n')
+    write_tenant(tmp_path, 'globex', 'TIMEOUT=20\n')
+    store = TenantStore(str(tmp_path))
+
+    acme, globex = store.get('acme'), store.get('globex')
+    assert acme.get_int('TIMEOUT') == 10
+    assert acme.get_str('HOST') == 'acme.local'
+    assert acme.get_bool('DEBUG') is True
+    assert acme.get_converted('TIMEOUT', 'duration') == 10.0
+    assert globex.get_int('TIMEOUT') == 20
+    assert globex.get_str('HOST', default='default.local') == 'default.local'
+    assert environ['TIMEOUT'] == '99' and 'HOST' not in environ
+    assert get_int_env_param('TIMEOUT') == 99
+
+
+def test_tenant_context(tmp_path):
+    """Процедуры получения значений используют значения арендатора внутри контекста"""
+    write_tenant(tmp_path, 'acme', 'API_URL=http://acme\n')
+    store = TenantStore(str(tmp_path))
+    with store.tenant('acme') as settings:
+        assert settings.name == 'acme'
+        assert get_str_env_param('API_URL') == 'http://acme'
+    assert get_str_env_param('API_URL') is None
+
+
+def test_tenant_inherit_environ_and_interpolation(tmp_path, monkeypatch):
+    """Подстановка значений при загрузке файла, значения os.environ - только при inherit_environ"""
+    monkeypatch.setenv('DOMAIN', 'example.com')
+    write_tenant(tmp_path, 'acme', 'URL=https://${NAME}.${DOMAIN:-local}\nNAME=acme\n')
+    assert TenantStore(str(tmp_path)).get('acme').get_str('URL') == 'https://acme.local'
+    settings = TenantStore(str(tmp_path), inherit_environ=True).get('acme')
+    assert settings.get_str('URL') == 'https://acme.example.com'
+    assert settings.get_str('DOMAIN') == 'example.com'
+
+    # ссылка на саму себя разрешается по os.environ
+    write_tenant(tmp_path, 'self', 'DOMAIN=api.${DOMAIN}\n')
+    assert TenantStore(str(tmp_path), inherit_environ=True).get('self').get_str('DOMAIN') == 'api.example.com'
+
+
+def test_tenant_interpolation_cycle(tmp_path):
+    """Циклическая ссылка передается обработчику ошибок, значения загружаются без подстановки"""
+    config.configure(error_handling='ignore')
+    write_tenant(tmp_path, 'acme', 'A=${B}\nB=${A}\nC=1\n')
+    settings = TenantStore(str(tmp_path)).get('acme')
+    assert settings.get_str('A') == '${B}'
+    assert settings.get_int('C') == 1
+
+
+def test_tenant_typed_cache(tmp_path):
+    """Преобразованные значения запоминаются по процедуре и аргументам"""
+    write_tenant(tmp_path, 'acme', 'PORT=8080\n')
+    settings = TenantStore(str(tmp_path)).get('acme')
+    calls = []
+
+    def getter(name, *args, **kwargs):
+        calls.append(name)
+        return get_int_env_param(name, *args, **kwargs)
+
+    assert settings.get(getter, 'PORT') == 8080
+    assert settings.get(getter, 'PORT') == 8080
+    assert settings.get(getter, 'PORT', choices=[8080]) == 8080
+    assert settings.get(getter, 'PORT', choices=[8080]) == 8080
+    assert calls == ['PORT', 'PORT', 'PORT']
+
+
+def test_tenant_revalidation(tmp_path):
+    """Измененный файл загружается повторно, неизмененный - нет"""
+    filename = write_tenant(tmp_path, 'acme', 'PORT=1\n', mtime_ns=1_000_000_000)
+    store = TenantStore(str(tmp_path), revalidate_interval=0)
+    first = store.get('acme')
+    assert store.get('acme') is first
+
+    write_tenant(tmp_path, 'acme', 'PORT=2\n', mtime_ns=2_000_000_000)
+    assert store.get('acme').get_int('PORT') == 2
+
+    cached = TenantStore(str(tmp_path), revalidate_interval=3600)
+    assert cached.get('acme').get_int('PORT') == 2
+    write_tenant(tmp_path, 'acme', 'PORT=3\n', mtime_ns=3_000_000_000)
+    assert cached.get('acme').get_int('PORT') == 2
+
+    filename.unlink()
+    with pytest.raises(FileNotFoundError):
+        store.get('acme')
+    assert 'acme' not in store
+
+
+def test_tenant_lru_eviction(tmp_path):
+    """Кеш ограничен max_tenants, вытесняется давно не использованный арендатор"""
+    for name in ('a', 'b', 'c'):
+        write_tenant(tmp_path, name, f'NAME={name}\n')
+    store = TenantStore(str(tmp_path), max_tenants=2)
+    store.get('a')
+    store.get('b')
+    store.get('a')
+    store.get('c')
+    assert len(store) == 2 and 'a' in store and 'c' in store and 'b' not in store
+    store.invalidate('a')
+    assert 'a' not in store
+    store.invalidate()
+    assert len(store) == 0
+
+
+@pytest.mark.parametrize('tenant', ['../secret', '.hidden', '', 'a/b'])
+def test_tenant_name_validation(tmp_path, tenant):
+    """Имя арендатора не может содержать путь"""
+    with pytest.raises(ValueError):
+        TenantStore(str(tmp_path)).get(tenant)
+    with pytest.raises(ValueError):
+        TenantStore(str(tmp_path), max_tenants=0)
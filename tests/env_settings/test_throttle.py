@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.env_settings import throttle as throttle_module
+from src.env_settings.config import config
+from src.env_settings.throttle import MessageThrottle, emit_throttled, flush_suppressed
+from src.env_settings.utils import get_int_env_param, get_str_env_param
+
+
+@pytest.fixture(autouse=True)
+def clear_throttle():
+    throttle_module.throttle.clear()
+    yield
+    throttle_module.throttle.clear()
+
+
+def test_message_throttle_window():
+    """Сообщение выводится один раз за интервал, подавленные повторы считаются"""
+    throttle = MessageThrottle()
+    assert throttle.check('msg', 10, now=0) == 0
+    assert throttle.check('msg', 10, now=1) is None
+    assert throttle.check('msg', 10, now=9) is None
+    assert throttle.check('other', 10, now=9) == 0
+    assert throttle.check('msg', 10, now=10) == 2
+    assert throttle.check('msg', 10, now=11) is None
+    assert throttle.drain() == [('msg', 1, None)]
+    assert throttle.drain() == []
+
+
+def test_message_throttle_bounded():
+    """Количество окон ограничено, вытесняются окна, открытые раньше остальных"""
+    throttle = MessageThrottle(max_messages=16)
+    for i in range(100):
+        throttle.check(i, 10, now=i)
+    assert len(throttle) <= 16
+    assert throttle.check(99, 10, now=100) is None
+    assert throttle.check(0, 10, now=100) == 0
+    with pytest.raises(ValueError):
+        MessageThrottle(max_messages=0)
+
+
+def test_emit_throttled_disabled():
+    """Без log_interval сообщения выводятся всегда"""
+    emit = MagicMock()
+    for _ in range(3):
+        emit_throttled('msg', emit)
+    assert emit.call_count == 3
+    assert len(throttle_module.throttle) == 0
+
+
+def test_emit_throttled_summary():
+    """После интервала сообщение выводится с количеством подавленных повторов"""
+    config.configure(log_interval=60)
+    emit = MagicMock()
+    with patch.object(throttle_module, 'monotonic', side_effect=[0, 1, 2, 61, 62]):
+        for _ in range(5):
+            emit_throttled('msg', emit)
+    assert [call.args[0] for call in emit.call_args_list] == [
+        'msg', 'msg (повторов подавлено: 2 за 60 с)']
+
+    flush_suppressed()
+    assert emit.call_args.args[0] == 'msg (повторов подавлено: 1 за 60 с)'
+    config.configure(log_interval=0)
+    assert config.log_interval is None
+
+
+def test_error_handling_throttled(capsys):
+    """Ошибки обработчика print и logging и логгирование значений ограничиваются log_interval"""
+    config.configure(error_handling='print', log_interval=60)
+    with patch.dict('os.environ', {'PORT': 'abc', 'TIMEOUT': 'x', 'HOST': 'db'}):
+        for _ in range(100):
+            get_int_env_param('PORT')
+        assert len(capsys.readouterr().out.splitlines()) == 1
+
+        config.configure(error_handling='logging', do_value_logging=True)
+        with patch.object(config.logger, 'error') as error, patch.object(config.logger, 'debug') as debug:
+            for _ in range(100):
+                get_int_env_param('TIMEOUT')
+                get_str_env_param('HOST')
+        assert error.call_count == 1
+        assert debug.call_count == 2  # значения TIMEOUT и HOST
@@ -0,0 +1,115 @@
+import pytest
+
+from src.env_settings.config import ErrorHandling, config as global_config
+from src.env_settings.uri import (ConnectUri, get_connect_uris, get_multi_host_connect_uri, get_uri_env_param,
+                                  parse_connect_uri)
+from src.env_settings.utils import endless_param_iterator, get_values
+
+
+@pytest.mark.parametrize('uri, expected', [
+    ('redis://address.local/5', ConnectUri('redis', (('address.local', None),), resource='5')),
+    ('postgres://user:p%40ss@db:5432/app?sslmode=require',
+     ConnectUri('postgres', (('db', 5432),), 'user', 'p@ss', 'app', 'sslmode=require')),
+    ('mongodb://user@h1:27017,h2:27018/db', ConnectUri('mongodb', (('h1', 27017), ('h2', 27018)), 'user', None, 'db')),
+    ('http://[::1]:8080', ConnectUri('http', (('::1', 8080),))),
+    ('amqp://guest:@rabbit#fragment', ConnectUri('amqp', (('rabbit', None),), 'guest', '')),
+])
+def test_parse_connect_uri(uri, expected):
+    """Разбор URI подключения"""
+    assert parse_connect_uri(uri) == expected
+
+
+@pytest.mark.parametrize('uri', ['address.local/5', '://host', 'redis://', 'redis://host:port', 'http://[::1/',
+                                 'http://[::1]x', 'mongodb://h1,,h2/db'])
+def test_parse_connect_uri_invalid(uri):
+    """Некорректные URI подключения"""
+    with pytest.raises(ValueError):
+        parse_connect_uri(uri)
+
+
+def test_parse_connect_uri_cached():
+    """Повторный разбор той же строки возвращает тот же объект"""
+    uri = 'mongodb://h1:1,h2:2/db'
+    assert parse_connect_uri(uri) is parse_connect_uri(uri)
+    assert parse_connect_uri(uri).host_uris is parse_connect_uri(uri).host_uris
+
+
+def test_connect_uri_properties():
+    """Свойства разобранного URI"""
+    connect_uri = parse_connect_uri('mongodb://user:pass@h1:1,[::1]:2/db?replicaSet=rs0')
+    assert connect_uri.host == 'h1'
+    assert connect_uri.port == 1
+    assert connect_uri.uri == 'mongodb://user:pass@h1:1,[::1]:2/db?replicaSet=rs0'
+    assert connect_uri.host_uris == ('mongodb://user:pass@h1:1/db?replicaSet=rs0',
+                                     'mongodb://user:pass@[::1]:2/db?replicaSet=rs0')
+
+    iterator = endless_param_iterator(connect_uri.host_uris)
+    assert [next(iterator) for _ in range(3)] == [connect_uri.host_uris[0], connect_uri.host_uris[1],
+                                                  connect_uri.host_uris[0]]
+
+
+def test_connect_uri_credentials_quoted():
+    """Имя пользователя и пароль с зарезервированными символами кодируются при формировании URI"""
+    connect_uri = parse_connect_uri('postgresql://u%40x:p%2Fx%3Fy@h:5432/db')
+    assert connect_uri.password == 'p/x?y'
+    assert connect_uri.uri == 'postgresql://u%40x:p%2Fx%3Fy@h:5432/db'
+    assert parse_connect_uri(connect_uri.uri) == connect_uri
+    assert connect_uri.host_uris == (connect_uri.uri,)
+
+
+def test_get_connect_uris():
+    """Формирование URI для каждого адреса"""
+    assert get_connect_uris('redis', ['h1', 'h2'], ['6379', '6380'], resource='0') == (
+        'redis://h1:6379/0', 'redis://h2:6380/0')
+    assert get_connect_uris('redis', ['h1', 'h2', ''], ['6379'], resource='0') == (
+        'redis://h1:6379/0', 'redis://h2:6379/0')
+    assert get_connect_uris('redis', ['h1'], 6379, 'user', 'pass', '1') == ('redis://user:pass@h1:6379/1',)
+    assert get_connect_uris('redis', [], resource='0') == ()
+    assert get_connect_uris('postgresql', ['::1', '[::2]'], 5432) == (
+        'postgresql://[::1]:5432/', 'postgresql://[::2]:5432/')
+
+    assert get_connect_uris('redis', ['h1', 'h2'], get_values(''), resource='0') == ('redis://h1/0', 'redis://h2/0')
+
+    with pytest.raises(ValueError, match='Количество портов'):
+        get_connect_uris('redis', ['h1', 'h2', 'h3'], ['1', '2'])
+
+
+def test_get_connect_uris_credentials_quoted():
+    """Имя пользователя и пароль кодируются при формировании URI по спискам адресов"""
+    uris = get_connect_uris('redis', ['h1'], 6379, user='u@x', password='p/x?y')
+    assert uris == ('redis://u%40x:p%2Fx%3Fy@h1:6379/',)
+    assert parse_connect_uri(uris[0])[2:4] == ('u@x', 'p/x?y')
+    uri = get_multi_host_connect_uri('mongodb', ['h1', 'h2'], [], 'u@x', 'p:w', 'db')
+    assert uri == 'mongodb://u%40x:p%3Aw@h1,h2/db'
+    assert parse_connect_uri(uri).hosts == (('h1', None), ('h2', None))
+
+
+def test_get_multi_host_connect_uri():
+    """Формирование одного URI со всеми адресами"""
+    assert get_multi_host_connect_uri('mongodb', ['h1', 'h2'], [1, 2], 'user', 'pass', 'db') == (
+        'mongodb://user:pass@h1:1,h2:2/db')
+    assert get_multi_host_connect_uri('mongodb', ['h1', '::1'], None, resource='db') == 'mongodb://h1,[::1]/db'
+    assert get_multi_host_connect_uri('mongodb', [], resource='db') == ''
+
+
+def test_get_uri_env_param(monkeypatch):
+    """Получение разобранного URI из переменной окружения"""
+    monkeypatch.setenv('DB_URI', 'postgres://user@db:5432/app')
+    monkeypatch.setenv('BAD_URI', 'db:5432/app')
+
+    assert get_uri_env_param('DB_URI').port == 5432
+    assert get_uri_env_param('MISSING') is None
+    assert get_uri_env_param('MISSING', default='redis://cache/0').host == 'cache'
+
+    global_config.configure(messages={'err_uri': 'URI error: {0} ({2})'})
+    with pytest.raises(ValueError, match='^URI error: BAD_URI'):
+        get_uri_env_param('BAD_URI')
+
+    global_config.configure(error_handling=ErrorHandling.IGNORE)
+    assert get_uri_env_param('BAD_URI') is None
+
+
+def test_connect_uris_without_resource():
+    """Формирование URI без ресурса"""
+    assert get_connect_uris('redis', ['h1']) == ('redis://h1/',)
+    assert get_multi_host_connect_uri('redis', ['h1', 'h2']) == 'redis://h1,h2/'
@@ -0,0 +1,84 @@
+import pytest
+
+from src.env_settings.cli import main
+from src.env_settings.usage import EnvRead, EnvUsageReport, _scan_file, find_env_usage
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / 'project'
+    (root / 'modules' / 'auth').mkdir(parents=True)
+    (root / 'venv').mkdir()
+    (root / 'settings.py').write_text("# DB_HOST, API_KEY\nDB_HOST = get_str_env_param('DB_HOST')\n"
+                                      "API_KEY = get_str_env_param('API_KEY')\n")
+    (root / 'modules' / 'auth' / 'settings.py').write_text("AUTH_SECRET = get_str_env_param('AUTH_SECRET')\n")
+    (root / 'main.py').write_text("import os\n\n# API_KEY\nconnect(settings.DB_HOST)\n"
+                                  "DEBUG = os.getenv('DEBUG')\n")
+    (root / 'modules' / 'auth' / 'views.py').write_text("check(AUTH_SECRET)\n")
+    (root / 'venv' / 'lib.py').write_text("os.environ['VENV_ONLY']\nAPI_KEY\n")
+    return root
+
+
+def test_find_env_usage(project):
+    """Неиспользуемые параметры и необъявленные чтения, комментарии и строки объявлений не учитываются"""
+    report = find_env_usage(modules_path=str(project), max_workers=1)
+
+    assert [param.name for param in report.unused] == ['API_KEY']
+    assert report.unused[0].line == 3
+    assert [(read.name, read.line) for read in report.undeclared] == [('DEBUG', 5)]
+    assert report.undeclared[0].source.endswith('main.py')
+    assert report
+
+
+def test_find_env_usage_exclude(project):
+    """Исключенные параметры и директории не проверяются"""
+    report = find_env_usage(modules_path=str(project), exclude_params=('API_KEY', 'DEBUG'), exclude_dirs=())
+    assert report.unused == ()
+    assert [read.name for read in report.undeclared] == ['VENV_ONLY']
+
+
+def test_find_env_usage_sub_modules(project):
+    """Параметры не включенных подмодулей не проверяются, но их код сканируется"""
+    report = find_env_usage(modules_path=str(project), sub_modules_path='modules', include_sub_modules=('other',),
+                            exclude_params=('DEBUG',))
+    assert [param.name for param in report.unused] == ['API_KEY']
+    assert [read.name for read in report.undeclared] == ['AUTH_SECRET']
+
+
+def test_find_env_usage_parallel(project):
+    """Результат сканирования в нескольких процессах совпадает с результатом в текущем процессе"""
+    package = project / 'package'
+    package.mkdir()
+    for number in range(100):
+        (package / f'module_{number}.py').write_text(f"VALUE = os.environ.get('VALUE_{number}')\n")
+    (package / 'module_100.py').write_text('print(API_KEY)\n')
+
+    parallel = find_env_usage(modules_path=str(project), max_workers=2)
+    inline = find_env_usage(modules_path=str(project), max_workers=1)
+    assert parallel == inline
+    assert parallel.unused == ()
+    assert len(parallel.undeclared) == 101
+
+
+def test_scan_file(tmp_path):
+    """Поиск чтений переменных окружения с номерами строк"""
+    filename = tmp_path / 'code.py'
+    filename.write_text("A = os.getenv('A')\n\nB = os.environ[ \"B\" ]\nC = get_int_env_param('C', default=1)\n"
+                        "os.environ.get('D')\n")
+    identifiers, reads = _scan_file((str(filename), frozenset({4})))
+    assert [(read.name, read.line) for read in reads] == [('A', 1), ('B', 3), ('C', 4), ('D', 5)]
+    assert identifiers == {'A', 'B', 'D'}
+    assert _scan_file((str(tmp_path / 'missing.py'), frozenset())) == (set(), [])
+
+
+def test_report_format():
+    report = EnvUsageReport((), (EnvRead('DEBUG', 'main.py', 5),))
+    assert report.format() == 'undeclared: DEBUG (main.py:5)'
+    assert not EnvUsageReport((), ())
+
+
+def test_cli_usage(project, capsys):
+    """Команда usage возвращает 1, если найдены проблемы"""
+    assert main(['usage', '--modules-path', str(project), '--workers', '1']) == 1
+    assert 'unused: API_KEY' in capsys.readouterr().out
+    assert main(['usage', '--modules-path', str(project), '--exclude-params', 'API_KEY', 'DEBUG']) == 0
@@ -1,3 +1,6 @@
+import bz2
+import gzip
+import lzma
 import os
 from pathlib import Path
 from unittest.mock import patch
@@ -5,10 +8,12 @@ from unittest.mock import patch
 import pytest
 
 from src.env_settings.config import ErrorHandling, config as global_config
+from src.env_settings import utils as utils_module
 from src.env_settings.utils import (_env_param_error, _create_directory, get_str_env_param, get_int_env_param,
                                     get_float_env_param, get_bool_env_param, get_file_env_param, get_filedir_env_param,
                                     get_value_from_string, get_values_from_file, get_values, endless_param_iterator,
-                                    param_iterator, load_env_params, get_obfuscate_value, get_connect_uri)
+                                    param_iterator, load_env_params, get_obfuscate_value, get_connect_uri,
+                                    partition_values, get_values_partition, get_values_partition_from_file)
 
 
 # Фикстура для временной директории
@@ -217,6 +222,36 @@ def test_get_values_from_file(tmp_env):
     assert values == ['line1', 'line2', 'line3']
 
 
+@pytest.mark.parametrize('compress, filename', [
+    (gzip.compress, 'values.txt.gz'), (bz2.compress, 'values.txt.bz2'), (lzma.compress, 'values.txt.xz'),
+    (gzip.compress, 'values.dat'), (lzma.compress, 'values'),
+])
+def test_get_values_from_compressed_file(tmp_env, monkeypatch, compress, filename):
+    """Сжатые файлы определяются по расширению или сигнатуре и распаковываются потоково"""
+    monkeypatch.setattr(utils_module, '_READ_CHUNK_SIZE', 4)
+    test_file = tmp_env / filename
+    test_file.write_bytes(compress('значение1\r\nvalue2\n\nvalue4\rvalue5'.encode('utf-8')))
+    expected = ['значение1', 'value2', '', 'value4', 'value5']
+    assert get_values_from_file(str(test_file)) == expected
+    assert get_values(str(test_file)) == expected
+
+    test_file.write_bytes(compress(b'a\nb\nc\nd\ne'))
+    assert get_values_partition_from_file(str(test_file), 1, 2) == ['c', 'd', 'e']
+    assert get_values_partition_from_file(str(test_file), 0, 2, 'stride') == ['a', 'c', 'e']
+    assert get_values_partition_from_file(str(test_file), 0, 2) == ['a', 'b']
+    assert [get_values_partition_from_file(str(test_file), worker, 3) for worker in range(3)] == [
+        ['a'], ['b', 'c'], ['d', 'e']]
+
+
+def test_get_values_from_file_bzh_text(tmp_env):
+    """Текстовый файл, начинающийся с BZh, не считается сжатым bz2"""
+    test_file = tmp_env / 'values.txt'
+    test_file.write_text('BZh9 value\nBZh\n')
+    assert get_values(str(test_file)) == ['BZh9 value', 'BZh']
+    test_file.write_bytes(bz2.compress(b''))
+    assert get_values_from_file(str(test_file)) == []
+
+
 def test_get_values(tmp_env):
     """Получение значений из разных источников"""
     # Из строки
@@ -252,6 +287,76 @@ def test_param_iterator():
     assert results == ['a', 'b', 'c']
 
 
+# Тесты для разбиения значений между рабочими процессами
+@pytest.mark.parametrize('strategy', ['range', 'stride', 'hash'])
+def test_partition_values(strategy):
+    """Части всех процессов не пересекаются и покрывают все значения"""
+    values = [f'id_{i}' for i in range(101)]
+    parts = [partition_values(values, worker, 4, strategy) for worker in range(4)]
+    assert sorted(value for part in parts for value in part) == sorted(values)
+    assert all(part for part in parts)
+
+
+def test_partition_values_range():
+    values = list(range(10))
+    assert [list(partition_values(values, worker, 3)) for worker in range(3)] == [[0, 1, 2], [3, 4, 5], [6, 7, 8, 9]]
+    assert list(partition_values(values, 1, 3, 'stride')) == [1, 4, 7]
+    assert list(param_iterator(partition_values(values, 0, 3)[1:])) == [1, 2]
+
+
+def test_partition_values_hash():
+    """Значение попадает в одну и ту же часть независимо от позиции, при добавлении процесса перемещается часть"""
+    values = [f'id_{i}' for i in range(1000)]
+    owner = {value: worker for worker in range(4) for value in partition_values(values, worker, 4, 'hash')}
+    reversed_owner = {value: worker for worker in range(4)
+                      for value in partition_values(values[::-1], worker, 4, 'hash')}
+    assert owner == reversed_owner
+
+    moved = [value for worker in range(5) for value in partition_values(values, worker, 5, 'hash')
+             if owner.get(value) != worker]
+    assert moved == list(partition_values(values, 4, 5, 'hash'))
+    assert len(moved) < 300
+
+
+def test_partition_values_errors():
+    with pytest.raises(ValueError):
+        partition_values([1], 2, 2)
+    with pytest.raises(ValueError):
+        partition_values([1], 0, 2, 'random')
+
+
+@pytest.mark.parametrize('strategy', ['range', 'stride', 'hash'])
+@pytest.mark.parametrize('workers', [1, 3, 7, 40])
+def test_get_values_partition_from_file(tmp_env, strategy, workers):
+    """Строки файла распределяются между процессами без потерь и повторов, в том числе при переводах строк CRLF"""
+    lines = [f'value_{i}' * (i % 5) for i in range(30)]
+    test_file = tmp_env / 'values.txt'
+    test_file.write_bytes(('\r\n'.join(lines) + '\n').encode())
+
+    parts = [get_values_partition_from_file(str(test_file), worker, workers, strategy) for worker in range(workers)]
+    result = [line for part in parts for line in part]
+    assert sorted(result) == sorted(lines)
+    if strategy == 'range':
+        assert result == lines
+
+
+def test_get_values_partition_from_file_seek(tmp_env):
+    """Для стратегии range читается только диапазон байт процесса (строки другой части не декодируются)"""
+    test_file = tmp_env / 'values.txt'
+    test_file.write_bytes(b'\xff\xfe\n' * 10 + b'ok\n' * 10)
+    assert get_values_partition_from_file(str(test_file), 1, 2) == ['ok'] * 10
+    with pytest.raises(UnicodeDecodeError):
+        get_values_partition_from_file(str(test_file), 0, 2)
+
+
+def test_get_values_partition(tmp_env):
+    test_file = tmp_env / 'file.txt'
+    test_file.write_text('a\nb\nc\nd')
+    assert get_values_partition(str(test_file), 1, 2) == ['c', 'd']
+    assert list(get_values_partition('a,b,c,d', 0, 2, 'stride')) == ['a', 'c']
+    assert list(get_values_partition(None, 1, 2, default_value='x')) == ['x']
+
+
 # Тесты для load_env_params
 def test_load_env_params(monkeypatch, tmp_env):
     """Тестирование реального поведения загрузки .env файла"""
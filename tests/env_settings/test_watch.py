@@ -0,0 +1,230 @@
+import os
+import shutil
+import struct
+import sys
+from threading import Event, Thread
+from time import sleep, monotonic
+from unittest.mock import MagicMock, patch
+from zipfile import ZipFile
+
+import pytest
+
+from src.env_settings import watch as watch_module
+from src.env_settings.generator import _get_settings_params, generate_env_file
+from src.env_settings.watch import SettingsWatcher, _InotifyObserver, _PollingObserver, _create_observer
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / 'project'
+    (root / 'modules' / 'auth').mkdir(parents=True)
+    (root / 'modules' / 'payment').mkdir(parents=True)
+    (root / 'settings.py').write_text("# Host\nDB_HOST = get_str_env_param('DB_HOST')\n")
+    (root / 'modules' / 'auth' / 'settings.py').write_text("AUTH_SECRET = get_str_env_param('AUTH_SECRET')\n")
+    (root / 'modules' / 'payment' / 'settings.py').write_text("PAYMENT_KEY = get_str_env_param('PAYMENT_KEY')\n")
+    return root
+
+
+def _expected(tmp_path, project, **kwargs):
+    expected_file = tmp_path / 'expected.env'
+    generate_env_file(str(expected_file), modules_path=str(project), **kwargs)
+    return expected_file.read_text()
+
+
+def test_build(project, tmp_path):
+    """Полное построение модели совпадает с generate_env_file"""
+    env_file = tmp_path / '.env'
+    watcher = SettingsWatcher(str(env_file), modules_path=str(project), sub_modules_path='modules',
+                              include_sub_modules=('auth',))
+    assert watcher.build() is True
+    assert env_file.read_text() == _expected(tmp_path, project, sub_modules_path='modules',
+                                             include_sub_modules=('auth',))
+    assert [param.name for param in watcher.params] == ['DB_HOST', 'AUTH_SECRET']
+
+    # Без изменений файл не перезаписывается
+    assert watcher.build() is False
+
+
+def test_update_parses_only_changed_files(project, tmp_path):
+    """Повторно разбираются только измененные файлы настроек"""
+    env_file = tmp_path / '.env'
+    watcher = SettingsWatcher(str(env_file), modules_path=str(project))
+    watcher.build()
+
+    auth_settings = project / 'modules' / 'auth' / 'settings.py'
+    auth_settings.write_text("AUTH_TOKEN = get_str_env_param('AUTH_TOKEN')\n")
+    with patch('src.env_settings.watch._get_settings_params', wraps=_get_settings_params) as mock_parse:
+        assert watcher.update({str(auth_settings)}) is True
+        mock_parse.assert_called_once_with(str(auth_settings), None)
+
+    assert 'AUTH_TOKEN=' in env_file.read_text()
+    assert 'AUTH_SECRET=' not in env_file.read_text()
+    assert env_file.read_text() == _expected(tmp_path, project)
+
+
+def test_merge(project, tmp_path):
+    """В режиме слияния заполненные значения сохраняются, удаленные параметры комментируются"""
+    env_file = tmp_path / '.env'
+    env_file.write_bytes(b'DB_HOST=db.local\r\nOLD=1\r\n')
+    watcher = SettingsWatcher(str(env_file), modules_path=str(project), merge=True, comment_removed=True)
+    assert watcher.build() is True
+    content = env_file.read_bytes()
+    assert content.startswith(b'DB_HOST=db.local\r\n# removed: OLD=1\r\n')
+    assert b'AUTH_SECRET=\r\n' in content
+    assert watcher.build() is False
+
+    auth_settings = project / 'modules' / 'auth' / 'settings.py'
+    auth_settings.write_text("AUTH_TOKEN = get_str_env_param('AUTH_TOKEN')\n")
+    assert watcher.update({str(auth_settings)}) is True
+    content = env_file.read_bytes()
+    assert b'# removed: AUTH_SECRET=\r\n' in content
+    assert b'AUTH_TOKEN=\r\n' in content
+    assert content.startswith(b'DB_HOST=db.local\r\n')
+
+
+def test_archives_and_executor(project, tmp_path):
+    """Файлы настроек архивов обновляются при изменении архива, параметры определяются исполнителем"""
+    archive = project / 'modules' / 'plugins.zip'
+    with ZipFile(archive, 'w') as zip_file:
+        zip_file.writestr('plugin/settings.py', "PLUGIN_KEY = get_str_env_param('PLUGIN_KEY')\n")
+    env_file = tmp_path / '.env'
+    watcher = SettingsWatcher(str(env_file), modules_path=str(project), scan_archives=True)
+    watcher.build()
+    assert env_file.read_text() == _expected(tmp_path, project, scan_archives=True)
+    assert 'PLUGIN_KEY=' in env_file.read_text()
+
+    with ZipFile(archive, 'w') as zip_file:
+        zip_file.writestr('plugin/settings.py', "PLUGIN_URL = get_str_env_param('PLUGIN_URL')\n")
+    assert watcher.update({os.path.join(os.curdir, str(archive))}) is True
+    assert env_file.read_text() == _expected(tmp_path, project, scan_archives=True)
+    assert 'PLUGIN_KEY=' not in env_file.read_text()
+
+    executor = MagicMock(max_workers=2)
+    executor.settings_params.side_effect = lambda name, modules_path, exclude: _get_settings_params(name, exclude)
+    watcher = SettingsWatcher(str(env_file), modules_path=str(project), executor=executor)
+    watcher.build()
+    assert executor.settings_params.call_count == 3
+    assert env_file.read_text() == _expected(tmp_path, project)
+
+
+def test_update_created_and_deleted_files(project, tmp_path):
+    """Добавление и удаление файлов настроек, игнорирование исключенных модулей"""
+    env_file = tmp_path / '.env'
+    watcher = SettingsWatcher(str(env_file), modules_path=str(project), sub_modules_path='modules',
+                              include_sub_modules=('auth', 'billing'))
+    watcher.build()
+
+    (project / 'modules' / 'billing').mkdir()
+    billing_settings = project / 'modules' / 'billing' / 'settings.py'
+    billing_settings.write_text("BILLING_KEY = get_str_env_param('BILLING_KEY')\n")
+    payment_settings = project / 'modules' / 'payment' / 'settings.py'
+    payment_settings.write_text("PAYMENT_TOKEN = get_str_env_param('PAYMENT_TOKEN')\n")
+    assert watcher.update({str(billing_settings), str(payment_settings)}) is True
+    assert env_file.read_text() == _expected(tmp_path, project, sub_modules_path='modules',
+                                             include_sub_modules=('auth', 'billing'))
+    assert 'PAYMENT_TOKEN=' not in env_file.read_text()
+
+    billing_settings.unlink()
+    assert watcher.update({str(billing_settings)}) is True
+    assert 'BILLING_KEY=' not in env_file.read_text()
+
+
+def test_polling_observer(project):
+    """Опрос находит измененные, созданные и удаленные файлы настроек"""
+    observer = _PollingObserver(str(project), 'settings.py')
+    assert observer.wait(0) == set()
+
+    root_settings = project / 'settings.py'
+    root_settings.write_text("# Changed\nDB_HOST = get_str_env_param('DB_HOST')\n")
+    (project / 'modules' / 'auth' / 'settings.py').unlink()
+    (project / 'modules' / 'new').mkdir()
+    (project / 'modules' / 'new' / 'settings.py').write_text('')
+
+    changed = {name.replace('\\', '/').split('project/')[-1] for name in observer.wait(0)}
+    assert changed == {'settings.py', 'modules/auth/settings.py', 'modules/new/settings.py'}
+    observer.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify доступен только в Linux')
+def test_inotify_observer(project):
+    """inotify сообщает об изменении файлов настроек, в том числе в новых директориях"""
+    observer = _InotifyObserver(str(project), 'settings.py')
+    try:
+        assert observer.wait(0) == set()
+
+        (project / 'settings.py').write_text("DB_PORT = get_int_env_param('DB_PORT')\n")
+        (project / 'other.py').write_text('')
+        changed = observer.wait(1)
+        assert {name.split('project')[-1] for name in changed} == {'/settings.py'}
+
+        (project / 'modules' / 'new').mkdir()
+        changed = observer.wait(1)
+        (project / 'modules' / 'new' / 'settings.py').write_text('')
+        changed |= observer.wait(1)
+        assert {name.split('project')[-1] for name in changed} == {'/modules/new/settings.py'}
+    finally:
+        observer.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify доступен только в Linux')
+def test_inotify_observer_removed_dirs(project, tmp_path):
+    """Файлы настроек перемещенной или удаленной директории сообщаются как измененные"""
+    observer = _InotifyObserver(str(project), 'settings.py')
+    try:
+        (project / 'modules' / 'auth').rename(tmp_path / 'auth')
+        changed = observer.wait(1)
+        assert {name.split('project')[-1] for name in changed} == {'/modules/auth/settings.py'}
+
+        shutil.rmtree(project / 'modules')
+        changed = observer.wait(1)
+        assert {name.split('project')[-1] for name in changed} == {'/modules/payment/settings.py'}
+
+        # перемещенная директория больше не отслеживается
+        (tmp_path / 'auth' / 'settings.py').write_text('')
+        assert observer.wait(0.2) == set()
+    finally:
+        observer.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify доступен только в Linux')
+def test_inotify_observer_overflow(project):
+    """При переполнении очереди событий возвращаются все файлы настроек"""
+    observer = _InotifyObserver(str(project), 'settings.py')
+    try:
+        (project / 'modules' / 'auth' / 'settings.py').unlink()
+        overflow = struct.pack(watch_module._IN_EVENT, -1, watch_module._IN_Q_OVERFLOW, 0, 0)
+        with patch('src.env_settings.watch.read', return_value=overflow):
+            changed = observer._read_events()
+        assert {name.split('project')[-1] for name in changed} == {
+            '/settings.py', '/modules/auth/settings.py', '/modules/payment/settings.py'}
+    finally:
+        observer.close()
+
+
+def test_create_observer_fallback(project):
+    """При недоступности inotify используется опрос"""
+    assert isinstance(_create_observer(str(project), 'settings.py', use_inotify=False), _PollingObserver)
+    with patch('src.env_settings.watch._InotifyObserver', side_effect=OSError):
+        assert isinstance(_create_observer(str(project), 'settings.py'), _PollingObserver)
+
+
+@pytest.mark.parametrize('use_inotify', [True, False])
+def test_run(project, tmp_path, use_inotify):
+    """Наблюдение перегенерирует .env файл после изменения файла настроек"""
+    env_file = tmp_path / '.env'
+    stop = Event()
+    watcher = SettingsWatcher(str(env_file), modules_path=str(project))
+    thread = Thread(target=watcher.run, kwargs={'interval': 0.05, 'use_inotify': use_inotify, 'stop': stop})
+    thread.start()
+    try:
+        deadline = monotonic() + 5
+        while not env_file.exists() and monotonic() < deadline:
+            sleep(0.01)
+        sleep(0.1)
+        (project / 'settings.py').write_text("DB_NAME = get_str_env_param('DB_NAME')\n")
+        while 'DB_NAME=' not in env_file.read_text() and monotonic() < deadline:
+            sleep(0.01)
+        assert 'DB_NAME=' in env_file.read_text()
+    finally:
+        stop.set()
+        thread.join()